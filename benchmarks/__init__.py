@@ -0,0 +1 @@
+"""Benchmarks of the ingest and query hot paths, run with ``python -m benchmarks.<name>``."""
@@ -0,0 +1,78 @@
+"""Compare the per-cell and bulk paths of ``AppleHealthService.add_data_records``.
+
+Run with ``python -m benchmarks.apple_health_ingest [MINUTES] [COLUMNS]``. Each path writes a
+synthetic day of minute data into its own file-backed SQLite database, then ingests the same
+frame again to time the all-duplicates case.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, func, select
+
+from fitness_tracker.database.models import AppleHealthDataRecord
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.apple_health import AppleHealthService
+
+DEFAULT_MINUTES = 1_440
+DEFAULT_COLUMNS = 20
+
+
+def make_frame(minutes: int = DEFAULT_MINUTES, columns: int = DEFAULT_COLUMNS) -> pd.DataFrame:
+    """Build a Health Auto Export style frame of minute data, with some gaps."""
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2025-01-01", periods=minutes, freq="min", name="Date")
+    frame = pd.DataFrame(
+        {f"Metric {i} (unit{i})": rng.random(minutes) for i in range(columns)}, index=index
+    )
+    frame.iloc[::7, 3] = np.nan
+    return frame
+
+
+def run(folder: Path, frame: pd.DataFrame, bulk: bool) -> tuple[float, float, int]:
+    """Ingest ``frame`` twice into a fresh database.
+
+    Returns:
+        tuple[float, float, int]: The seconds taken by the first and second ingest, and the
+        number of stored records.
+    """
+    engine = create_engine(f"sqlite:///{folder / f'bulk_{bulk}.db'}")
+    Base.metadata.create_all(engine)
+    service = AppleHealthService(engine, archive_root=folder / "archive")
+
+    start = time.perf_counter()
+    service.add_data_records(frame, bulk=bulk)
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    service.add_data_records(frame, bulk=bulk)
+    second = time.perf_counter() - start
+
+    with engine.connect() as connection:
+        rows = connection.execute(
+            select(func.count()).select_from(AppleHealthDataRecord.__table__)
+        ).scalar()
+    engine.dispose()
+    return first, second, rows
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print one line per path."""
+    minutes = int(argv[0]) if argv else DEFAULT_MINUTES
+    columns = int(argv[1]) if len(argv) > 1 else DEFAULT_COLUMNS
+    frame = make_frame(minutes, columns)
+    with tempfile.TemporaryDirectory() as folder:
+        for bulk in (False, True):
+            first, second, rows = run(Path(folder), frame, bulk)
+            print(  # noqa: T201
+                f"{'bulk' if bulk else 'per-cell':<9} {rows} records: "
+                f"{first:.2f}s ({rows / first:,.0f} rows/s), re-ingest {second:.2f}s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,100 @@
+"""Compare loading a data type as ORM objects with ``AppleHealthService.get_series``.
+
+Run with ``python -m benchmarks.apple_health_series [RECORDS]``. The records are minute-level
+values of one data type in a file-backed SQLite database. Each path is timed on its own, then
+run again under tracemalloc for its peak memory, since tracing slows it down.
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, select
+
+from fitness_tracker.database.models import AppleHealthDataRecord, AppleHealthDataType
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.apple_health import AppleHealthService
+
+DEFAULT_RECORDS = 525_600  # a year of minutes
+DATA_TYPE = "Body Fat Percentage"
+
+
+def seed(service: AppleHealthService, records: int) -> None:
+    """Store ``records`` minute-level values of ``DATA_TYPE``."""
+    start = datetime(2024, 1, 1)
+    with service.get_session() as session:
+        data_type = AppleHealthDataType(name=DATA_TYPE, unit="%")
+        session.add(data_type)
+        session.flush()
+        session.execute(
+            AppleHealthDataRecord.insert_ignore_statement(),
+            [
+                {
+                    "data_type_id": data_type.id,
+                    "timestamp": start + timedelta(minutes=i),
+                    "value": 20 + (i % 100) / 100,
+                }
+                for i in range(records)
+            ],
+        )
+        session.commit()
+
+
+def load_orm(service: AppleHealthService) -> list[dict[str, Any]]:
+    """Load the records the way get_body_fat_percentage did before get_series."""
+    stmnt = (
+        select(AppleHealthDataRecord)
+        .join(AppleHealthDataType, AppleHealthDataRecord.data_type_id == AppleHealthDataType.id)
+        .where(AppleHealthDataType.name == DATA_TYPE)
+    )
+    with service.get_session() as session:
+        return [
+            {"timestamp": record.timestamp, "value": record.value}
+            for record in session.execute(stmnt).scalars().all()
+        ]
+
+
+def measure(func: Callable[[], Any]) -> tuple[float, float, int]:
+    """Return the seconds, peak MiB and length of a call of ``func``."""
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20, len(result)
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print one line per path."""
+    records = int(argv[0]) if argv else DEFAULT_RECORDS
+    with tempfile.TemporaryDirectory() as folder:
+        engine = create_engine(f"sqlite:///{Path(folder) / 'series.db'}")
+        Base.metadata.create_all(engine)
+        service = AppleHealthService(engine, archive_root=Path(folder) / "archive")
+        seed(service, records)
+
+        paths: dict[str, Callable[[], Any]] = {
+            "ORM objects + dicts": lambda: load_orm(service),
+            "get_series": lambda: service.get_series(DATA_TYPE),
+            "get_body_fat_percentage": lambda: service.get_body_fat_percentage(
+                datetime(1970, 1, 1, tzinfo=timezone.utc)
+            ),
+        }
+        for name, func in paths.items():
+            seconds, peak, rows = measure(func)
+            print(f"{name:<24} {rows} rows: {seconds:.2f}s, {peak:.0f} MiB peak")  # noqa: T201
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
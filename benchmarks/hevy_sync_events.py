@@ -0,0 +1,191 @@
+"""Compare committing every Hevy event with committing batches of events in ``sync_events``.
+
+Run with ``python -m benchmarks.hevy_sync_events [EVENTS]``. Each event updates a workout of
+5 exercises of 5 sets that is linked to a TrueCoach workout, so every step of
+``HevyToFitnessTrackerSyncronizer.update_workout`` runs. The events are applied to a
+file-backed SQLite database, once with a commit per event and once with the default batch.
+The workout items are matched by exercise, so the stand-in for the LLM has nothing left to
+link and nothing goes over the network.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import create_engine, event, func, select
+
+from fitness_tracker.apis.hevy_app.types import ExerciseTemplate, UpdatedWorkout, Workout
+from fitness_tracker.database import Database
+from fitness_tracker.database.models import (
+    Exercise,
+    Sets,
+    TrueCoachExercise,
+    TrueCoachWorkout,
+    TrueCoachWorkoutItem,
+)
+from fitness_tracker.database.models import Workout as TrackerWorkout
+from fitness_tracker.database.models import WorkoutItem
+from fitness_tracker.llm.prompt_models import WorkoutItemLinkList
+from fitness_tracker.sync.hevy_tracker.sync import (
+    DEFAULT_BATCH_SIZE,
+    HevyToFitnessTrackerSyncronizer,
+)
+
+DEFAULT_EVENTS = 200
+EXERCISES = 5
+SETS = 5
+
+
+class FakeLLM:
+    """Stands in for ``FitnessLLM``, linking nothing."""
+
+    def link_workout_items(self, **kwargs: Any) -> WorkoutItemLinkList:
+        """Return no links, the items were already matched by exercise."""
+        return WorkoutItemLinkList(links=[])
+
+
+def template(i: int) -> ExerciseTemplate:
+    """Build the ``i``-th exercise template."""
+    return ExerciseTemplate(
+        id=f"T{i}",
+        title=f"Exercise {i}",
+        type="weight_reps",
+        primary_muscle_group="chest",
+        secondary_muscle_groups=[],
+        equipment="barbell",
+        is_custom=False,
+    )
+
+
+def make_events(count: int) -> list[UpdatedWorkout]:
+    """Build ``count`` update events, the title of each naming its TrueCoach workout."""
+    return [
+        UpdatedWorkout(
+            type="updated",
+            workout=Workout(
+                id=f"w{w}",
+                title=f"Push {w}",
+                description="",
+                start_time="2025-01-01T10:00:00Z",
+                end_time="2025-01-01T11:00:00Z",
+                updated_at="2025-01-01T11:00:00Z",
+                created_at="2025-01-01T11:00:00Z",
+                exercises=[
+                    {
+                        "index": i,
+                        "title": f"Exercise {i}",
+                        "notes": "",
+                        "exercise_template_id": f"T{i}",
+                        "sets": [
+                            {"index": k, "type": "normal", "weight_kg": 60, "reps": 5}
+                            for k in range(SETS)
+                        ],
+                    }
+                    for i in range(EXERCISES)
+                ],
+            ),
+        )
+        for w in range(1, count + 1)
+    ]
+
+
+def make_database(path: Path, count: int) -> Database:
+    """Create a database at ``path`` holding the TrueCoach side of ``count`` workouts."""
+    database = Database(create_engine(f"sqlite:///{path}"))
+    database.init_db()
+    day = datetime(2025, 1, 1)
+    with database.hevy_app.get_session() as session:
+        database.hevy_app.upsert_exercises(session, [template(i) for i in range(EXERCISES)])
+        for i in range(EXERCISES):
+            session.add(TrueCoachExercise(id=i, name=f"Exercise {i}", description="", url=""))
+            session.add(
+                Exercise(id=i + 1, name=f"Exercise {i}", true_coach_id=i, hevy_app_id=f"T{i}")
+            )
+        for w in range(1, count + 1):
+            session.add(
+                TrueCoachWorkout(
+                    id=w,
+                    title="Push",
+                    due=day,
+                    short_description="",
+                    state="completed",
+                    rest_day=False,
+                    created_at=day,
+                    updated_at=day,
+                )
+            )
+            session.add(TrackerWorkout(id=w, title="Push", description="", true_coach_id=w))
+            for i in range(EXERCISES):
+                item = w * EXERCISES + i
+                session.add(
+                    TrueCoachWorkoutItem(
+                        id=item,
+                        workout_id=w,
+                        name=f"Exercise {i}",
+                        info="",
+                        state="completed",
+                        position=i + 1,
+                        is_circuit=False,
+                        exercise_id=i,
+                    )
+                )
+                session.add(
+                    WorkoutItem(
+                        id=item, workout_id=w, position=i + 1, exercise_id=i + 1, true_coach_id=item
+                    )
+                )
+        session.commit()
+    return database
+
+
+def run(database: Database, events: list[UpdatedWorkout], batch_size: int) -> tuple[float, int]:
+    """Apply the events and return the seconds taken and the number of commits."""
+    commits = 0
+
+    def count(connection: Any) -> None:
+        nonlocal commits
+        commits += 1
+
+    syncronizer = HevyToFitnessTrackerSyncronizer(
+        database=database, source=None, llm=FakeLLM()  # type: ignore[arg-type]
+    )
+    event.listen(database.engine, "commit", count)
+    start = time.perf_counter()
+    syncronizer.sync_events(events, batch_size=batch_size)  # type: ignore[arg-type]
+    seconds = time.perf_counter() - start
+    event.remove(database.engine, "commit", count)
+    return seconds, commits
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print one line per batch size."""
+    count = int(argv[0]) if argv else DEFAULT_EVENTS
+    # The services build API clients, which need keys even though they are never called
+    os.environ.setdefault("HEVY_API_KEY", "benchmark")
+    os.environ.setdefault("HEVY_WEB_API_KEY", "benchmark")
+
+    events = make_events(count)
+    with tempfile.TemporaryDirectory() as folder:
+        for batch_size in (1, DEFAULT_BATCH_SIZE):
+            database = make_database(Path(folder) / f"batch_{batch_size}.db", count)
+            seconds, commits = run(database, events, batch_size)
+            print(  # noqa: T201
+                f"batch of {batch_size:<3} {count} events: {seconds:.2f}s "
+                f"({count / seconds:,.0f} events/s, {commits} commits)"
+            )
+
+            with database.tracker.get_session() as session:
+                sets = session.scalar(select(func.count()).select_from(Sets))
+            if sets != count * EXERCISES * SETS:
+                message = f"Expected {count * EXERCISES * SETS} sets, found {sets}"
+                raise RuntimeError(message)
+            database.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,168 @@
+"""Compare the per-row and bulk paths of storing Hevy workouts.
+
+Run with ``python -m benchmarks.hevy_upsert [WORKOUTS]``. Each workout has 5 exercises of
+5 sets, written into a file-backed SQLite database. The per-row path merges each workout
+and goes through ``add_workout_item``, as ``add_workout`` did before
+``HevyAppService.upsert_workouts``; it is slow, so it runs on a tenth of the workouts. The
+bulk path stores every workout, then stores them again with new weights to time updates.
+The exercise templates come from a stand-in for the API, so nothing goes over the network.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from dateutil.parser import parse
+from sqlalchemy import create_engine, func, select
+
+from fitness_tracker.apis.hevy_app.types import ExerciseTemplate, Workout
+from fitness_tracker.database.models import HevyAppSets, HevyAppWorkout
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.hevy_app import HevyAppService
+
+DEFAULT_WORKOUTS = 5_000
+TEMPLATES = 50
+EXERCISES = 5
+SETS = 5
+# The set weight the second bulk run writes
+UPDATED_WEIGHT = 51
+
+
+def template(i: int) -> ExerciseTemplate:
+    """Build the ``i``-th exercise template."""
+    return ExerciseTemplate(
+        id=f"T{i}",
+        title=f"Exercise {i}",
+        type="weight_reps",
+        primary_muscle_group="chest",
+        secondary_muscle_groups=["triceps"],
+        equipment="barbell",
+        is_custom=False,
+    )
+
+
+class FakeExercises:
+    """Serves a fixed exercise catalog in place of ``HevyAppExercises``."""
+
+    def get_all(self, per_page: int, max_workers: int) -> list[ExerciseTemplate]:
+        """Return the whole catalog."""
+        return [template(i) for i in range(TEMPLATES)]
+
+    def get_template(self, template_id: str) -> None:
+        """Find no template, every template is in the catalog."""
+
+
+class FakeApi:
+    """Stands in for ``HevyAppClient``."""
+
+    exercises = FakeExercises()
+
+
+def make_workouts(count: int, revision: int = 0) -> list[Workout]:
+    """Build ``count`` workouts, with weights that change with ``revision``."""
+    return [
+        Workout(
+            id=f"w{w}",
+            title=f"Workout {w}",
+            description="",
+            start_time="2024-01-01T10:00:00Z",
+            end_time="2024-01-01T11:00:00Z",
+            updated_at="2024-01-01T11:00:00Z",
+            created_at="2024-01-01T11:00:00Z",
+            exercises=[
+                {
+                    "index": i,
+                    "title": f"Exercise {(w + i) % TEMPLATES}",
+                    "notes": "",
+                    "exercise_template_id": f"T{(w + i) % TEMPLATES}",
+                    "superset_id": None,
+                    "sets": [
+                        {
+                            "index": k,
+                            "type": "normal",
+                            "weight_kg": 50 + revision,
+                            "reps": 5,
+                            "rpe": None,
+                        }
+                        for k in range(SETS)
+                    ],
+                }
+                for i in range(EXERCISES)
+            ],
+        )
+        for w in range(count)
+    ]
+
+
+def make_service(path: Path) -> HevyAppService:
+    """Create a service on a fresh database at ``path``, with the fake API."""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    service = HevyAppService(engine)
+    service.api = FakeApi()  # type: ignore[assignment]
+    return service
+
+
+def run_per_row(service: HevyAppService, workouts: list[Workout]) -> float:
+    """Store the workouts one row at a time and return the seconds taken."""
+    start = time.perf_counter()
+    with service.get_session() as session:
+        service.resolve_exercises(session, [f"T{i}" for i in range(TEMPLATES)])
+        for workout in workouts:
+            session.merge(
+                HevyAppWorkout(
+                    id=workout.id,
+                    title=workout.title,
+                    description=workout.description,
+                    start_time=parse(workout.start_time),
+                    end_time=parse(workout.end_time),
+                    updated_at=parse(workout.updated_at),
+                    created_at=parse(workout.created_at),
+                )
+            )
+            for exercise in workout.exercises:
+                service.add_workout_item(session=session, workout_id=workout.id, exercise=exercise)
+        session.commit()
+    return time.perf_counter() - start
+
+
+def run_bulk(service: HevyAppService, workouts: list[Workout]) -> float:
+    """Store the workouts with ``upsert_workouts`` and return the seconds taken."""
+    start = time.perf_counter()
+    with service.get_session() as session:
+        service.upsert_workouts(session, workouts)
+        session.commit()
+    return time.perf_counter() - start
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmark and print one line per path."""
+    count = int(argv[0]) if argv else DEFAULT_WORKOUTS
+    # The service builds an API client, which needs keys even though it is never called
+    os.environ.setdefault("HEVY_API_KEY", "benchmark")
+    os.environ.setdefault("HEVY_WEB_API_KEY", "benchmark")
+
+    with tempfile.TemporaryDirectory() as folder:
+        per_row = max(count // 10, 1)
+        seconds = run_per_row(make_service(Path(folder) / "per_row.db"), make_workouts(per_row))
+        print(f"per-row      {per_row} workouts: {per_row / seconds:,.0f} workouts/s")  # noqa: T201
+
+        service = make_service(Path(folder) / "bulk.db")
+        seconds = run_bulk(service, make_workouts(count))
+        print(f"bulk insert  {count} workouts: {count / seconds:,.0f} workouts/s")  # noqa: T201
+        seconds = run_bulk(service, make_workouts(count, revision=1))
+        print(f"bulk update  {count} workouts: {count / seconds:,.0f} workouts/s")  # noqa: T201
+
+        with service.get_session() as session:
+            weight = session.scalar(select(func.min(HevyAppSets.weight_kg)))
+        if weight != UPDATED_WEIGHT:
+            message = "The bulk update did not reach the sets"
+            raise RuntimeError(message)
+        service.engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,4 +1,4 @@
-from fitness_tracker.apis.true_coach import TrueCoachClient
+from fitness_tracker.apis.true_coach import AsyncTrueCoachClient, TrueCoachClient
 from fitness_tracker.apis.hevy_app import HevyAppClient
 
-__all__ = ['TrueCoachClient', 'HevyAppClient']
\ No newline at end of file
+__all__ = ['AsyncTrueCoachClient', 'TrueCoachClient', 'HevyAppClient']
\ No newline at end of file
@@ -1,2 +1,372 @@
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from typing import Any, NamedTuple, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+import logs
+
+logger = logs.get_logger(__name__)
+
+R = TypeVar("R")
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Failures to get a response at all, which are retried like a 503. Anything else a request
+# raises is a bug or a final outcome, so it goes straight to the caller.
+TRANSPORT_ERRORS = (requests.ConnectionError, requests.Timeout, httpx.TransportError)
+
+# How long a waiting request sleeps before checking again for a free concurrency slot
+POLL_INTERVAL = 0.01
+
+
 class BaseClient:
-    pass
+    """Base class for the API clients.
+
+    Clients can be used as context managers, which closes them on exit.
+    """
+
+    def close(self) -> None:
+        """Release any resources held by the client."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
+
+
+class RateLimit(NamedTuple):
+    """The request budget of one API host.
+
+    Attributes:
+        rate (float): Requests per second the token bucket refills at
+        burst (int): The bucket size, i.e. how many requests may go out back to back
+        max_concurrency (int): The ceiling for requests in flight at once
+        min_concurrency (int): The floor the concurrency backs off to
+        latency_target (float): Responses slower than this, in seconds, count as congestion
+    """
+
+    rate: float = 10.0
+    burst: int = 10
+    max_concurrency: int = 8
+    min_concurrency: int = 1
+    latency_target: float = 5.0
+
+
+class SchedulerStats(NamedTuple):
+    """A snapshot of one host's scheduler."""
+
+    host: str
+    queued: int
+    in_flight: int
+    concurrency: int
+    requests: int
+    throttled: int
+    errors: int
+    retries: int
+
+
+def retry_after(response: Any) -> Optional[float]:
+    """Return the delay a ``Retry-After`` header asks for, in seconds, if any.
+
+    Works with both ``requests`` and ``httpx`` responses, and with both the delta-seconds
+    and the HTTP-date forms of the header.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class HostScheduler:
+    """Token bucket and AIMD concurrency limit for a single API host.
+
+    Every request takes a token from the bucket and a concurrency slot. The concurrency limit
+    grows by one slot per window of successful responses and halves, at most once per
+    window, on a 429, a 5xx, a connection error or a response slower than the latency
+    target. A ``Retry-After`` pauses the whole host until it has passed.
+    """
+
+    def __init__(self, host: str, limit: RateLimit) -> None:
+        self.host = host
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._tokens = float(limit.burst)
+        self._refilled_at = time.monotonic()
+        self._concurrency = float(limit.max_concurrency)
+        self._decreased_at = 0.0
+        self._paused_until = 0.0
+        self._in_flight = 0
+        self._queued = 0
+        self._requests = 0
+        self._throttled = 0
+        self._errors = 0
+        self._retries = 0
+
+    def _reserve(self) -> float:
+        """Take a token and a slot, or return how long to wait before trying again."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self._in_flight >= int(self._concurrency):
+                return POLL_INTERVAL
+
+            self._tokens = min(
+                float(self.limit.burst),
+                self._tokens + (now - self._refilled_at) * self.limit.rate,
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.limit.rate
+
+            self._tokens -= 1
+            self._in_flight += 1
+            self._requests += 1
+            return 0.0
+
+    def acquire(self) -> None:
+        """Block until the request may be sent."""
+        with self._lock:
+            self._queued += 1
+        try:
+            while (delay := self._reserve()) > 0:
+                time.sleep(delay)
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+    async def acquire_async(self) -> None:
+        """Wait, without blocking the event loop, until the request may be sent."""
+        with self._lock:
+            self._queued += 1
+        try:
+            while (delay := self._reserve()) > 0:
+                await asyncio.sleep(delay)
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+    def release(
+        self, status: Optional[int], latency: float, pause: Optional[float] = None
+    ) -> None:
+        """Return the slot and adjust the concurrency limit to the outcome.
+
+        Args:
+            status (Optional[int]): The response status, None if the request failed to send
+            latency (float): How long the request took, in seconds
+            pause (Optional[float]): The ``Retry-After`` delay the response asked for
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._in_flight -= 1
+            if status == 429:
+                self._throttled += 1
+            elif status is None or status >= 500:
+                self._errors += 1
+            if pause:
+                self._paused_until = max(self._paused_until, now + pause)
+
+            congested = status is None or status in RETRY_STATUSES
+            if congested or latency > self.limit.latency_target:
+                # Halve at most once per window, so a burst of failures from requests that
+                # were already in flight does not collapse the limit to the floor
+                if now - self._decreased_at >= max(latency, 1.0):
+                    self._concurrency = max(
+                        float(self.limit.min_concurrency), self._concurrency / 2
+                    )
+                    self._decreased_at = now
+                    logger.debug(
+                        "%s congested (status=%s, %.2fs), concurrency down to %d",
+                        self.host,
+                        status,
+                        latency,
+                        int(self._concurrency),
+                    )
+            else:
+                self._concurrency = min(
+                    float(self.limit.max_concurrency),
+                    self._concurrency + 1 / self._concurrency,
+                )
+
+    def record_retry(self) -> None:
+        """Count a retried request."""
+        with self._lock:
+            self._retries += 1
+
+    def stats(self) -> SchedulerStats:
+        """Return a snapshot of the queue depth, the limit and the counters."""
+        with self._lock:
+            return SchedulerStats(
+                host=self.host,
+                queued=self._queued,
+                in_flight=self._in_flight,
+                concurrency=int(self._concurrency),
+                requests=self._requests,
+                throttled=self._throttled,
+                errors=self._errors,
+                retries=self._retries,
+            )
+
+
+class RequestScheduler:
+    """Rate-limit-aware scheduling of API requests, with one ``HostScheduler`` per host.
+
+    Requests are sent through ``send`` or ``send_async``, which wait for the host's budget,
+    record the outcome and retry idempotent requests on 429s, 5xx responses and
+    ``TRANSPORT_ERRORS`` with jittered exponential backoff, or after the ``Retry-After``
+    delay when the response gives one. Other requests are never retried, since they may
+    have been applied.
+    """
+
+    def __init__(
+        self,
+        default: RateLimit = RateLimit(),
+        limits: Optional[dict[str, RateLimit]] = None,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        """Initiate the scheduler.
+
+        Args:
+            default (RateLimit): The budget of hosts without their own entry in ``limits``
+            limits (Optional[dict[str, RateLimit]]): Budgets by host name
+            max_retries (int): How many times an idempotent request is retried
+            backoff (float): The base of the exponential backoff, in seconds
+            max_backoff (float): The cap of the exponential backoff, in seconds
+        """
+        self.default = default
+        self.limits = dict(limits or {})
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._hosts: dict[str, HostScheduler] = {}
+        self._lock = threading.Lock()
+
+    def host(self, url: str) -> HostScheduler:
+        """Return the scheduler of the host ``url`` points at."""
+        host = urlsplit(url).hostname or url
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = HostScheduler(host, self.limits.get(host, self.default))
+            return self._hosts[host]
+
+    def configure(self, host: str, limit: RateLimit) -> None:
+        """Set the budget of ``host``, resetting its scheduler."""
+        with self._lock:
+            self.limits[host] = limit
+            self._hosts.pop(host, None)
+
+    def stats(self) -> list[SchedulerStats]:
+        """Return a snapshot of every host seen so far."""
+        with self._lock:
+            hosts = list(self._hosts.values())
+        return [host.stats() for host in hosts]
+
+    def _retry_delay(self, method: str, attempt: int, response: Any) -> Optional[float]:
+        """Return how long to wait before retrying, or None if the outcome is final."""
+        if method.upper() not in IDEMPOTENT_METHODS or attempt >= self.max_retries:
+            return None
+        if response is not None and response.status_code not in RETRY_STATUSES:
+            return None
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        if response is not None:
+            delay = max(delay, retry_after(response) or 0.0)
+        return delay
+
+    def send(self, method: str, url: str, request: Callable[[], R]) -> R:
+        """Send a request once the host's budget allows it, retrying where safe.
+
+        Args:
+            method (str): The HTTP method, which decides whether the request is retried
+            url (str): The URL, whose host picks the budget
+            request (Callable[[], R]): Sends the request and returns the response
+
+        Returns:
+            R: The last response. Retryable failures that run out of retries are returned
+                as they are, for the caller to raise on.
+        """
+        host = self.host(url)
+        for attempt in range(self.max_retries + 1):
+            host.acquire()
+            start = time.monotonic()
+            try:
+                response = request()
+            except TRANSPORT_ERRORS:
+                host.release(None, time.monotonic() - start)
+                delay = self._retry_delay(method, attempt, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                host.release(None, time.monotonic() - start)
+                raise
+            else:
+                status = getattr(response, "status_code", None)
+                host.release(status, time.monotonic() - start, retry_after(response))
+                delay = self._retry_delay(method, attempt, response)
+                if delay is None:
+                    return response
+            host.record_retry()
+            logger.debug("Retrying %s %s in %.2fs", method, url, delay)
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def send_async(
+        self, method: str, url: str, request: Callable[[], Awaitable[R]]
+    ) -> R:
+        """Send a request once the host's budget allows it, retrying where safe.
+
+        The async counterpart of ``send``, with ``request`` returning an awaitable.
+        """
+        host = self.host(url)
+        for attempt in range(self.max_retries + 1):
+            await host.acquire_async()
+            start = time.monotonic()
+            try:
+                response = await request()
+            except TRANSPORT_ERRORS:
+                host.release(None, time.monotonic() - start)
+                delay = self._retry_delay(method, attempt, None)
+                if delay is None:
+                    raise
+            except BaseException:
+                host.release(None, time.monotonic() - start)
+                raise
+            else:
+                status = getattr(response, "status_code", None)
+                host.release(status, time.monotonic() - start, retry_after(response))
+                delay = self._retry_delay(method, attempt, response)
+                if delay is None:
+                    return response
+            host.record_retry()
+            logger.debug("Retrying %s %s in %.2fs", method, url, delay)
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def shared_scheduler() -> RequestScheduler:
+    """Return the scheduler shared by the API clients, so clients of one host share a budget."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+import logs
+
+logger = logs.get_logger(__name__)
+
+# Per user, so the cache does not depend on the working directory
+DEFAULT_CACHE_PATH = Path("~/.fitness_tracker/api_cache.sqlite")
+DEFAULT_TTL = 60 * 60.0
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class CachedResponse(NamedTuple):
+    """A cached response body and the validators it came with."""
+
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class CacheStats(NamedTuple):
+    """How the cache answered since it was opened."""
+
+    hits: int
+    revalidated: int
+    misses: int
+    entries: int
+    size: int
+
+
+class ResponseCache:
+    """On-disk cache of parsed API responses for conditional requests.
+
+    Entries are keyed by method, URL and query parameters. An entry stored with an ``ETag``
+    or ``Last-Modified`` header is revalidated on every read, so it only costs a 304. An
+    entry without validators is served as is until it is ``ttl`` seconds old. Once the
+    bodies add up to more than ``max_bytes`` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        """Open, or create, the cache at ``path``.
+
+        Args:
+            path (Path): The SQLite file holding the cache, ``~`` is expanded
+            ttl (float): How long, in seconds, an entry without validators stays fresh
+            max_bytes (int): The total body size kept before evicting
+        """
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._revalidated = 0
+        self._misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, body TEXT NOT NULL, etag TEXT, "
+            "last_modified TEXT, stored_at REAL NOT NULL, used_at REAL NOT NULL, "
+            "size INTEGER NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_responses_used_at ON responses (used_at)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Mapping[str, Any]] = None) -> str:
+        """Return the cache key of a request."""
+        parts = [method.upper(), url, json.dumps(dict(params or {}), sort_keys=True, default=str)]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return the entry under ``key``, marking it as recently used."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._connection.execute(
+                "UPDATE responses SET used_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._connection.commit()
+        return CachedResponse(json.loads(row[0]), row[1], row[2], row[3])
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Whether the entry can be served without asking the server."""
+        if entry.etag or entry.last_modified:
+            return False
+        return time.time() - entry.stored_at < self.ttl
+
+    def conditional_headers(self, entry: CachedResponse) -> dict[str, str]:
+        """Return the headers that revalidate ``entry``."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def hit(self) -> None:
+        """Count an entry served without a request."""
+        with self._lock:
+            self._hits += 1
+
+    def revalidated(self, key: str) -> None:
+        """Restart the age of the entry under ``key`` after the server answered 304."""
+        with self._lock:
+            self._revalidated += 1
+            self._connection.execute(
+                "UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._connection.commit()
+
+    def put(self, key: str, url: str, data: Any, headers: Mapping[str, str]) -> None:
+        """Store a response body under ``key``, then evict down to ``max_bytes``.
+
+        Args:
+            key (str): The cache key, see ``key``
+            url (str): The request URL, kept for ``invalidate``
+            data (Any): The parsed JSON body
+            headers (Mapping[str, str]): The response headers, for the validators
+        """
+        body = json.dumps(data)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, etag, last_modified, stored_at, used_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    url,
+                    body,
+                    headers.get("ETag"),
+                    headers.get("Last-Modified"),
+                    now,
+                    now,
+                    len(body),
+                ),
+            )
+            evicted = self._connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY used_at DESC, key) "
+                "AS total FROM responses) WHERE total > ?)",
+                (self.max_bytes,),
+            ).rowcount
+            self._connection.commit()
+        if evicted:
+            logger.debug("Evicted %d least recently used responses", evicted)
+
+    def invalidate(self, url: str) -> None:
+        """Drop every entry for ``url``, whatever the method and parameters."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self._connection.commit()
+
+    def stats(self) -> CacheStats:
+        """Return the hit counters and the current size."""
+        with self._lock:
+            entries, size = self._connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+            return CacheStats(self._hits, self._revalidated, self._misses, entries, size)
+
+    def close(self) -> None:
+        """Close the cache file."""
+        with self._lock:
+            self._connection.close()
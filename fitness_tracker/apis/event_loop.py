@@ -0,0 +1,42 @@
+import asyncio
+import threading
+from collections.abc import Coroutine
+from typing import Any, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the event loop shared by the sync API wrappers, starting it on first use.
+
+    The loop runs forever on a daemon thread, so async clients, and the connection pools
+    they hold, outlive any single call.
+    """
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="fitness-tracker-event-loop", daemon=True
+            ).start()
+        return _loop
+
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared loop and block until it finishes.
+
+    Raises:
+        RuntimeError: If called from the shared loop itself, which would deadlock.
+    """
+    loop = shared_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("Cannot block on the shared event loop from inside it, await instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -1,18 +1,54 @@
+from typing import Optional
+
 from fitness_tracker.apis.hevy_app.session import HevyAppSession
 from fitness_tracker.apis.hevy_app.web_session import HevyAppWebSession
 from fitness_tracker.apis.hevy_app.exercises import HevyAppExercises
 from fitness_tracker.apis.hevy_app.workouts import HevyAppWorkouts
 from fitness_tracker.apis.hevy_app.routines import HevyAppRoutines
-from fitness_tracker.apis.base import BaseClient
+from fitness_tracker.apis.hevy_app.transport import (
+    DEFAULT_POOL_SIZE,
+    DEFAULT_TIMEOUT,
+    ConnectionStats,
+    HevyAppTransport,
+)
+from fitness_tracker.apis.cache import ResponseCache
+from fitness_tracker.apis.base import BaseClient, SchedulerStats
 
 
 class HevyAppClient(BaseClient):
     """Hevy App API client class"""
 
-    def __init__(self) -> None:
-        """Initiate the client with the token"""
-        self._session = HevyAppSession()
-        self._web_session = HevyAppWebSession()
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """Initiate the client with the token
+
+        Args:
+            pool_size (int): The number of connections kept open per host
+            timeout (float): The request timeout in seconds
+            cache (Optional[ResponseCache]): The cache for slow-changing resources such as
+                exercise templates, no caching if None. It is left open on ``close``, since
+                whoever created it may share it with other clients
+        """
+        self._transport = HevyAppTransport(pool_size=pool_size, timeout=timeout)
+        self.cache = cache
+        self._session = HevyAppSession(transport=self._transport, cache=self.cache)
+        self._web_session = HevyAppWebSession(transport=self._transport)
         self.exercises = HevyAppExercises(session=self._session, web_session=self._web_session)
         self.workouts = HevyAppWorkouts(session=self._session)
         self.routines = HevyAppRoutines(session=self._session, web_session=self._web_session)
+
+    def connection_stats(self) -> list[ConnectionStats]:
+        """Return the connection reuse of each host the client has talked to."""
+        return self._transport.stats()
+
+    def scheduler_stats(self) -> list[SchedulerStats]:
+        """Return the queue depth, concurrency limit and throttle counts of each host."""
+        return self._transport.scheduler.stats()
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._transport.close()
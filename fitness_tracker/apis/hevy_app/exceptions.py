@@ -21,3 +21,12 @@ class HevyAppAPIError(Exception):
         logger.error(
             f"Hevy App API Error: {message} (status_code={status_code}, url={url})"
         )
+
+
+class HevyAppExerciseNotFoundError(HevyAppAPIError):
+    """The Hevy App API has no exercise template with the given id"""
+
+    def __init__(self, exercise_template_id: str, url: str) -> None:
+        """Initiate the error"""
+        super().__init__(f"Exercise with id {exercise_template_id} does not exist", url=url)
+        self.exercise_template_id = exercise_template_id
@@ -1,5 +1,6 @@
 from typing import Optional
 
+from fitness_tracker.apis.hevy_app.pagination import DEFAULT_PAGE_WORKERS, fetch_all_pages
 from fitness_tracker.apis.hevy_app.session import HevyAppSession
 from fitness_tracker.apis.hevy_app.web_session import HevyAppWebSession
 from fitness_tracker.apis.hevy_app.types import ExerciseResponse, ExerciseTemplate
@@ -29,6 +30,18 @@ class HevyAppExercises:
             return ExerciseResponse(**data)
         return None
 
+    def get_all(
+        self, per_page: int = 100, max_workers: int = DEFAULT_PAGE_WORKERS
+    ) -> list[ExerciseTemplate]:
+        """Get every exercise template, fetching the pages concurrently.
+
+        Args:
+            per_page (int): The number of items per page. Maximum is 100.
+            max_workers (int): The number of pages fetched at once
+        """
+        pages = fetch_all_pages(lambda page: self.get(page=page, per_page=per_page), max_workers)
+        return [template for page in pages for template in page.exercise_templates]
+
     def get_template(self, id: str) -> Optional[ExerciseTemplate]:
         """Get a single exercise template by ID.
 
@@ -36,7 +49,7 @@ class HevyAppExercises:
             id (int): The ID of the exercise template to retrieve.
         """
         endpoint = f"{self.endpoint}/{id}"
-        data = self._session.make_request(method="GET", endpoint=endpoint)
+        data = self._session.make_request(method="GET", endpoint=endpoint, cached=True)
         if data:
             return ExerciseTemplate(**data)
         return None
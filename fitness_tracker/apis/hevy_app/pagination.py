@@ -0,0 +1,48 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional, TypeVar
+
+import logs
+
+logger = logs.get_logger(__name__)
+
+R = TypeVar("R")
+
+DEFAULT_PAGE_WORKERS = 4
+
+
+def page_count(response: Any) -> int:
+    """Read ``page_count`` from a parsed page model or a raw JSON page."""
+    if isinstance(response, dict):
+        return int(response.get("page_count", 1))
+    return int(getattr(response, "page_count", 1))
+
+
+def fetch_all_pages(
+    fetch: Callable[[int], Optional[R]], max_workers: int = DEFAULT_PAGE_WORKERS
+) -> list[R]:
+    """Fetch every page of a paginated Hevy App endpoint.
+
+    Page 1 is fetched first to learn the page count, then pages 2..N are fetched
+    concurrently on a bounded thread pool. Keep ``max_workers`` within the transport's
+    pool size so the workers reuse kept-alive connections.
+
+    Args:
+        fetch (Callable[[int], Optional[R]]): Fetches a single page by number
+        max_workers (int): The number of pages fetched at once
+
+    Returns:
+        list[R]: The pages in page order. Pages that came back empty are skipped.
+    """
+    first = fetch(1)
+    if first is None:
+        return []
+
+    count = page_count(first)
+    if count <= 1:
+        return [first]
+
+    logger.debug("Fetching pages 2..%d with %d workers", count, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        rest = list(executor.map(fetch, range(2, count + 1)))
+    return [first] + [page for page in rest if page is not None]
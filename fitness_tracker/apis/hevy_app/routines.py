@@ -1,5 +1,6 @@
 from typing import Any, Optional
 
+from fitness_tracker.apis.hevy_app.pagination import DEFAULT_PAGE_WORKERS, fetch_all_pages
 from fitness_tracker.apis.hevy_app.session import HevyAppSession
 from fitness_tracker.apis.hevy_app.types import (
     PostRoutinesRequestBody,
@@ -32,6 +33,18 @@ class HevyAppRoutines:
         if data:
             return data
 
+    def get_all(
+        self, per_page: int = 10, max_workers: int = DEFAULT_PAGE_WORKERS
+    ) -> list[dict[str, Any]]:
+        """Get every routine, fetching the pages concurrently.
+
+        Args:
+            per_page (int): The number of items per page. Maximum is 100.
+            max_workers (int): The number of pages fetched at once
+        """
+        pages = fetch_all_pages(lambda page: self.get(page=page, per_page=per_page), max_workers)
+        return [routine for page in pages for routine in page.get("routines", [])]
+
     def get_routine(self, id: str) -> Optional[Workout]:
         """Get a single routine by ID.
 
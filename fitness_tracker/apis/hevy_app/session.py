@@ -6,7 +6,9 @@ import logs
 from dotenv import load_dotenv
 import os
 
+from fitness_tracker.apis.cache import ResponseCache
 from fitness_tracker.apis.hevy_app.exceptions import HevyAppAPIError
+from fitness_tracker.apis.hevy_app.transport import HevyAppTransport
 from urllib.parse import urlencode
 
 
@@ -19,7 +21,9 @@ class HevyAppSession:
     """HevyApp API session class"""
 
     def __init__(
-        self
+        self,
+        transport: Optional[HevyAppTransport] = None,
+        cache: Optional[ResponseCache] = None,
     ) -> None:
         """Initiate the client and make sure it is correctly authorized
         If token is passed, it is used to make a call to
@@ -30,9 +34,13 @@ class HevyAppSession:
         and uses the token obtained in this way
 
         :param token:    HevyAppOAuthToken
+        :param transport: Pooled HTTP transport to send requests over, a new one if None
+        :param cache:    Response cache for ``cached`` requests, no caching if None
         """
 
         self.api_key = os.environ['HEVY_API_KEY']
+        self._transport = transport or HevyAppTransport()
+        self.cache = cache
 
     def make_url(self, endpoint: str, query: Optional[dict[str, str]] = None) -> str:
         """Get complete URL for a given API endpoint.
@@ -97,12 +105,18 @@ class HevyAppSession:
         return data
 
 
-    def make_request(self, method: str, endpoint: str, **kwargs: Any) -> Optional[dict[str, Any]]:
+    def make_request(
+        self, method: str, endpoint: str, cached: bool = False, **kwargs: Any
+    ) -> Optional[dict[str, Any]]:
         """Make a request to the HevyApp API.
 
+        A ``cached`` GET is answered from the response cache while its entry is fresh, and
+        revalidated with ``If-None-Match``/``If-Modified-Since`` once it is not.
+
         :param mode:    Mode of the request, either GET or POST
         :param endpoint: API endpoint to request
         :param params:  Parameters to pass to the API
+        :param cached:  Whether to go through the response cache, for slow-changing resources
         :type method:   The method to use for the request
         :type enpoint:  str
         :type params:   Dict[str, Any]
@@ -120,33 +134,45 @@ class HevyAppSession:
 
         url = self.make_url(endpoint)
 
+        key = entry = None
+        if cached and self.cache is not None and method.upper() == "GET":
+            key = self.cache.key(method, url, kwargs.get("params"))
+            entry = self.cache.get(key)
+            if entry is not None and self.cache.is_fresh(entry):
+                self.cache.hit()
+                return entry.data
+            if entry is not None:
+                headers.update(self.cache.conditional_headers(entry))
+
         print(f"Making request to {url}")
 
-        with requests.Session() as session:
-            try:
-                headers = self._get_request_headers()
-                response = session.request(
-                    method.upper(),
-                    url,
-                    headers=headers,
-                    timeout=10,
-                    verify=False,
-                    **kwargs,
-                )
-                logger.debug(
-                    f"HevyApp API Request: status_code={response.status_code}, url={url}"
-                )
-
-            except Exception as e:
-                raise HevyAppAPIError(
-                    f"Error connecting to HevyApp API: {e}",
-                    url=url,
-                ) from e
-            if not response:
-                raise HevyAppAPIError(
-                    f"Error {response.status_code} for '{response.request.path_url}' {response.text}",
-                    status_code=response.status_code,
-                    url=response.request.path_url,
-                )
+        try:
+            response = self._transport.request(
+                method.upper(),
+                url,
+                headers=headers,
+                **kwargs,
+            )
+            logger.debug(
+                f"HevyApp API Request: status_code={response.status_code}, url={url}"
+            )
+
+        except Exception as e:
+            raise HevyAppAPIError(
+                f"Error connecting to HevyApp API: {e}",
+                url=url,
+            ) from e
+        if key is not None and entry is not None and response.status_code == 304:
+            self.cache.revalidated(key)
+            return entry.data
+        if not response:
+            raise HevyAppAPIError(
+                f"Error {response.status_code} for '{response.request.path_url}' {response.text}",
+                status_code=response.status_code,
+                url=response.request.path_url,
+            )
         if response.status_code != 204:
-            return self.format_response(endpoint, response)
+            data = self.format_response(endpoint, response)
+            if key is not None:
+                self.cache.put(key, url, data, response.headers)
+            return data
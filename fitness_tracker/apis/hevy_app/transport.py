@@ -0,0 +1,101 @@
+from typing import Any, NamedTuple, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import logs
+
+from fitness_tracker.apis.base import RequestScheduler, shared_scheduler
+
+logger = logs.get_logger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10.0
+
+
+class ConnectionStats(NamedTuple):
+    """Connection reuse of one host's pool."""
+
+    host: str
+    requests: int
+    connections: int
+
+    @property
+    def reused(self) -> int:
+        """Requests that went out on an already open connection."""
+        return self.requests - self.connections
+
+
+class HevyAppTransport:
+    """Long-lived, pooled HTTP transport shared by the Hevy App sessions.
+
+    One ``requests.Session`` keeps connections to each host alive between calls, so only the
+    first request to a host pays for the TCP and TLS handshakes. Every request is paced by
+    a ``RequestScheduler``, which also retries throttled GETs.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: Union[float, tuple[float, float]] = DEFAULT_TIMEOUT,
+        verify: bool = False,
+        scheduler: Optional[RequestScheduler] = None,
+    ) -> None:
+        """Initiate the transport.
+
+        Args:
+            pool_size (int): The number of connections kept open per host. Raise this when
+                requests are made from several threads at once.
+            timeout (Union[float, tuple[float, float]]): The default timeout, or a
+                ``(connect, read)`` pair
+            verify (bool): Whether to verify TLS certificates
+            scheduler (Optional[RequestScheduler]): Paces the requests, the shared one if None
+        """
+        self.timeout = timeout
+        self.scheduler = scheduler or shared_scheduler()
+        self._session = requests.Session()
+        self._session.verify = verify
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._adapter = adapter
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Send a request over the pooled session, applying the default timeout."""
+        kwargs.setdefault("timeout", self.timeout)
+        return self.scheduler.send(
+            method, url, lambda: self._session.request(method, url, **kwargs)
+        )
+
+    def stats(self) -> list[ConnectionStats]:
+        """Return how many requests and new connections each host's pool has seen."""
+        pools = self._adapter.poolmanager.pools
+        stats = []
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats.append(
+                    ConnectionStats(
+                        host=f"{key.key_scheme}://{key.key_host}:{key.key_port}",
+                        requests=pool.num_requests,
+                        connections=pool.num_connections,
+                    )
+                )
+        return stats
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        for stats in self.stats():
+            logger.debug(
+                "Closing %s after %d requests over %d connections",
+                stats.host,
+                stats.requests,
+                stats.connections,
+            )
+        self._session.close()
+
+    def __enter__(self) -> "HevyAppTransport":
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
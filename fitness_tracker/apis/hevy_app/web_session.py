@@ -7,6 +7,7 @@ import requests
 from dotenv import load_dotenv
 
 from fitness_tracker.apis.hevy_app.exceptions import HevyAppAPIError
+from fitness_tracker.apis.hevy_app.transport import HevyAppTransport
 
 load_dotenv()
 
@@ -16,7 +17,7 @@ logger = logs.get_logger(__name__)
 class HevyAppWebSession:
     """HevyApp API session class"""
 
-    def __init__(self) -> None:
+    def __init__(self, transport: Optional[HevyAppTransport] = None) -> None:
         """Initiate the client and make sure it is correctly authorized
         If token is passed, it is used to make a call to
         /my/account endpoint to check if the token is access_token is valid
@@ -26,8 +27,10 @@ class HevyAppWebSession:
         and uses the token obtained in this way
 
         :param token:    HevyAppOAuthToken
+        :param transport: Pooled HTTP transport to send requests over, a new one if None
         """
         self.api_key = os.environ["HEVY_WEB_API_KEY"]
+        self._transport = transport or HevyAppTransport()
 
     def make_url(self, endpoint: str, query: Optional[dict[str, str]] = None) -> str:
         """Get complete URL for a given API endpoint.
@@ -109,29 +112,26 @@ class HevyAppWebSession:
 
         print(f"Making request to {url}")
 
-        with requests.Session() as session:
-            try:
-                headers = self._get_request_headers()
-                response = session.request(
-                    method.upper(),
-                    url,
-                    headers=headers,
-                    timeout=10,
-                    verify=False,
-                    **kwargs,
-                )
-                logger.debug(f"HevyApp API Request: status_code={response.status_code}, url={url}")
-
-            except Exception as e:
-                raise HevyAppAPIError(
-                    f"Error connecting to HevyApp API: {e}",
-                    url=url,
-                ) from e
-            if not response:
-                raise HevyAppAPIError(
-                    f"Error {response.status_code} for '{response.request.path_url}' {response.text}",
-                    status_code=response.status_code,
-                    url=response.request.path_url,
-                )
+        try:
+            headers = self._get_request_headers()
+            response = self._transport.request(
+                method.upper(),
+                url,
+                headers=headers,
+                **kwargs,
+            )
+            logger.debug(f"HevyApp API Request: status_code={response.status_code}, url={url}")
+
+        except Exception as e:
+            raise HevyAppAPIError(
+                f"Error connecting to HevyApp API: {e}",
+                url=url,
+            ) from e
+        if not response:
+            raise HevyAppAPIError(
+                f"Error {response.status_code} for '{response.request.path_url}' {response.text}",
+                status_code=response.status_code,
+                url=response.request.path_url,
+            )
         if response.status_code != 204 and method.upper() != "DELETE":
             return self.format_response(endpoint, response)
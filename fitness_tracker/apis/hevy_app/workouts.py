@@ -1,11 +1,14 @@
 from datetime import datetime
 from typing import Optional
 
+from fitness_tracker.apis.hevy_app.pagination import DEFAULT_PAGE_WORKERS, fetch_all_pages
 from fitness_tracker.apis.hevy_app.session import HevyAppSession
 from fitness_tracker.apis.hevy_app.types import (
+    DeletedWorkout,
     PaginatedWorkoutEvents,
     PostWorkoutsRequestBody,
     PostWorkoutsResponse,
+    UpdatedWorkout,
     Workout,
     WorkoutResponse,
 )
@@ -32,6 +35,18 @@ class HevyAppWorkouts:
         if data:
             return WorkoutResponse(**data)
 
+    def get_all(
+        self, per_page: int = 10, max_workers: int = DEFAULT_PAGE_WORKERS
+    ) -> list[Workout]:
+        """Get every workout, fetching the pages concurrently.
+
+        Args:
+            per_page (int): The number of items per page. Maximum is 10.
+            max_workers (int): The number of pages fetched at once
+        """
+        pages = fetch_all_pages(lambda page: self.get(page=page, per_page=per_page), max_workers)
+        return [workout for page in pages for workout in page.workouts]
+
     def get_workout(self, id: str) -> Optional[Workout]:
         """Get a single workout's complete details by the workoutId.
 
@@ -75,6 +90,27 @@ class HevyAppWorkouts:
         if data:
             return PaginatedWorkoutEvents(**data)
 
+    def get_all_workout_events(
+        self,
+        per_page: int = 10,
+        since: datetime = datetime(1970, 1, 1),
+        max_workers: int = DEFAULT_PAGE_WORKERS,
+    ) -> list[UpdatedWorkout | DeletedWorkout]:
+        """Retrieve every workout event since a given date, fetching the pages concurrently.
+
+        Args:
+            per_page (int): The number of items per page. Maximum is 10.
+            since (datetime): The date and time to start retrieving workouts from.
+            max_workers (int): The number of pages fetched at once
+
+        Returns the events ordered from newest to oldest, as the pages are.
+        """
+        pages = fetch_all_pages(
+            lambda page: self.get_workout_events(page=page, per_page=per_page, since=since),
+            max_workers,
+        )
+        return [event for page in pages for event in page.events]
+
     def update_workout(self, id: str, workout: Workout) -> Optional[Workout]:
         """Update a workout by ID.
 
@@ -1,3 +1,3 @@
-from fitness_tracker.apis.true_coach.client import TrueCoachClient
+from fitness_tracker.apis.true_coach.client import AsyncTrueCoachClient, TrueCoachClient
 
-__all__ = ["TrueCoachClient"]
\ No newline at end of file
+__all__ = ["AsyncTrueCoachClient", "TrueCoachClient"]
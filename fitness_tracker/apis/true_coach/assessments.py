@@ -1,46 +1,85 @@
 from typing import Optional
 
+from fitness_tracker.apis.event_loop import run
+from fitness_tracker.apis.true_coach.async_session import AsyncTrueCoachSession
 from fitness_tracker.apis.true_coach.session import TrueCoachSession
 from fitness_tracker.apis.true_coach.types import AssessmentResponse, PostAssessmentItem, AssessmentItem
 
 
-class TrueCoachAssessments:
-    """True Coach API Assessments class."""
+class AsyncTrueCoachAssessments:
+    """Async True Coach API Assessments class."""
 
-    def __init__(self, session: TrueCoachSession) -> None:
+    def __init__(self, session: AsyncTrueCoachSession) -> None:
         """Initiate the Assessments class with the token."""
         self._session = session
         self.endpoint = "assessments"
 
-    def get(self, assessment_id: int) -> Optional[AssessmentResponse]:
+    async def get(self, assessment_id: int) -> Optional[AssessmentResponse]:
         """Get all the exercises.
 
         Args:
             assessment_id (int): The assessment id.
         """
-        response = self._session.make_request(
-            method="GET", endpoint=self.endpoint + f"/{assessment_id}"
+        response = await self._session.make_request(
+            method="GET", endpoint=self.endpoint + f"/{assessment_id}", cached=True
         )
         if response:
             return AssessmentResponse(**response)
         return None
 
-    def get_weights(self) -> Optional[AssessmentResponse]:
+    async def get_weights(self) -> Optional[AssessmentResponse]:
         """Get all the exercises."""
-        return self.get(assessment_id=13513325)
+        return await self.get(assessment_id=13513325)
 
-    def get_calories_burned(self) -> Optional[AssessmentResponse]:
+    async def get_calories_burned(self) -> Optional[AssessmentResponse]:
         """Get all the exercises."""
-        return self.get(assessment_id=14517944)
+        return await self.get(assessment_id=14517944)
 
-    def post(self, assessment_item: PostAssessmentItem) -> AssessmentItem:
+    async def post(self, assessment_item: PostAssessmentItem) -> AssessmentItem:
         """Post an assessment item.
 
         Args:
             assessment_item (PostAssessmentItem): The assessment item.
         """
-        response = self._session.make_request(
+        response = await self._session.make_request(
             method="POST", endpoint="/v2/assessment_items", json=assessment_item.model_dump()
         )
+        # The cached assessment no longer lists every item
+        self._session.invalidate(
+            self.endpoint + f"/{assessment_item.assessment_item.assessment_id}"
+        )
         return AssessmentItem(**response['assessment_item']) # type: ignore
 
+
+class TrueCoachAssessments:
+    """True Coach API Assessments class."""
+
+    def __init__(self, session: TrueCoachSession) -> None:
+        """Initiate the Assessments class with the token."""
+        self._session = session
+        self._async = AsyncTrueCoachAssessments(session.async_session)
+        self.endpoint = self._async.endpoint
+
+    def get(self, assessment_id: int) -> Optional[AssessmentResponse]:
+        """Get an assessment.
+
+        Args:
+            assessment_id (int): The assessment id.
+        """
+        return run(self._async.get(assessment_id))
+
+    def get_weights(self) -> Optional[AssessmentResponse]:
+        """Get the weights assessment."""
+        return run(self._async.get_weights())
+
+    def get_calories_burned(self) -> Optional[AssessmentResponse]:
+        """Get the calories burned assessment."""
+        return run(self._async.get_calories_burned())
+
+    def post(self, assessment_item: PostAssessmentItem) -> AssessmentItem:
+        """Post an assessment item.
+
+        Args:
+            assessment_item (PostAssessmentItem): The assessment item.
+        """
+        return run(self._async.post(assessment_item))
@@ -0,0 +1,175 @@
+from typing import Any, Optional
+
+import httpx
+
+import logs
+
+from fitness_tracker.apis.cache import ResponseCache
+from fitness_tracker.apis.base import RequestScheduler, shared_scheduler
+from fitness_tracker.apis.true_coach.auth import TrueCoachOAuthToken, authorize, make_url
+from fitness_tracker.apis.true_coach.exceptions import TrueCoachAPIError
+
+USER_AGENT = "beets/4 +https://beets.io/"
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_TIMEOUT = 10.0
+
+logger = logs.get_logger(__name__)
+
+
+class AsyncTrueCoachSession:
+    """Async TrueCoach API session class"""
+
+    def __init__(
+        self,
+        token: Optional[TrueCoachOAuthToken] = None,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT,
+        scheduler: Optional[RequestScheduler] = None,
+        cache: Optional[ResponseCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        """Initiate the session and make sure it is correctly authorized
+
+        If the token is not passed, it authorizes the user using username and password
+        credentials given in the config and uses the token obtained in this way.
+
+        Requests go through one pooled ``httpx.AsyncClient``, so concurrent calls share
+        keep-alive connections up to ``max_connections``, paced by ``scheduler``.
+
+        :param token:    TrueCoachOAuthToken
+        :param max_connections: Maximum number of open connections
+        :param timeout: Request timeout in seconds
+        :param scheduler: Paces and retries the requests, the shared one if None
+        :param cache: Response cache for ``cached`` requests, no caching if None
+        :param transport: The transport of the ``httpx.AsyncClient``, its default if None
+        """
+        self.token = token
+        if self.token is None:
+            self.token = authorize()
+        self.scheduler = scheduler or shared_scheduler()
+        self.cache = cache
+
+        self._client = httpx.AsyncClient(
+            verify=False,
+            timeout=timeout,
+            transport=transport,
+            limits=httpx.Limits(
+                max_connections=max_connections, max_keepalive_connections=max_connections
+            ),
+        )
+
+    def _get_request_headers(self):
+        """Formats Authorization and User-Agent HTTP client request headers
+
+        :returns: HTTP client request headers
+        :rtype: dict
+        """
+        return {
+            "Authorization": f"Bearer {getattr(self.token, 'access_token')}",
+            "User-Agent": USER_AGENT,
+            "Role": "Client",
+        }
+
+    def format_response(self, endpoint: str, response: httpx.Response) -> dict[str, Any]:
+        """
+        Extract the "results" field from a JSON response.
+
+        :param endpoint: The endpoint that was requested.
+        :type endpoint: str
+        :param response: The response object to extract the results from.
+        :type response: httpx.Response
+        :return: The "results" field from the JSON response, or the entire JSON response
+                if "results" is not present.
+        :rtype: Dict[str, Any]
+        :raises TrueCoachAPIError: If the response is empty or if there is an error with
+                                  the response.
+        """
+        if response.is_error:
+            raise TrueCoachAPIError(
+                f"Error {response.status_code} for '{response.request.url.raw_path.decode()}",
+                status_code=response.status_code,
+                url=response.request.url.raw_path.decode(),
+            )
+        data = response.json()
+        if response.status_code == 200:
+            if isinstance(data, dict):
+                data["request_url"] = str(response.url)
+            else:
+                data = {"results": data, "request_url": str(response.url)}
+        return data
+
+    async def make_request(
+        self, method: str, endpoint: str, cached: bool = False, **kwargs: Any
+    ) -> Optional[dict[str, Any]]:
+        """Make a request to the TrueCoach API.
+
+        A ``cached`` GET is answered from the response cache while its entry is fresh, and
+        revalidated with ``If-None-Match``/``If-Modified-Since`` once it is not.
+
+        :param method:   The method to use for the request
+        :param endpoint: API endpoint to request
+        :param cached:   Whether to go through the response cache, for slow-changing resources
+        :param kwargs:   Passed on to ``httpx.AsyncClient.request``, e.g. json or params
+        :return:        JSON response from the API
+        :rtype:         Dict[str, Any]
+        :raises TrueCoachAPIError: If there is an error making the request.
+        """
+        if endpoint.startswith("https://"):
+            endpoint = endpoint.replace("https://", "")
+
+        url = make_url(endpoint)
+        headers = self._get_request_headers()
+
+        key = entry = None
+        if cached and self.cache is not None and method.upper() == "GET":
+            key = self.cache.key(method, url, kwargs.get("params"))
+            entry = self.cache.get(key)
+            if entry is not None and self.cache.is_fresh(entry):
+                self.cache.hit()
+                return entry.data
+            if entry is not None:
+                headers.update(self.cache.conditional_headers(entry))
+
+        try:
+            response = await self.scheduler.send_async(
+                method,
+                url,
+                lambda: self._client.request(
+                    method.upper(),
+                    url,
+                    headers=headers,
+                    **kwargs,
+                ),
+            )
+            logger.debug(f"TrueCoach API Request: status_code={response.status_code}, url={url}")
+
+        except Exception as e:
+            raise TrueCoachAPIError(
+                f"Error connecting to TrueCoach API: {e}",
+                url=url,
+            ) from e
+        if key is not None and entry is not None and response.status_code == 304:
+            self.cache.revalidated(key)
+            return entry.data
+        if response.is_error:
+            raise TrueCoachAPIError(
+                f"Error {response.status_code} for '{response.request.url.raw_path.decode()}",
+                status_code=response.status_code,
+                url=response.request.url.raw_path.decode(),
+            )
+        if response.status_code != 204:
+            data = self.format_response(endpoint, response)
+            if key is not None:
+                self.cache.put(key, url, data, response.headers)
+            return data
+        return None
+
+    def invalidate(self, endpoint: str) -> None:
+        """Drop the cached responses of ``endpoint``."""
+        if self.cache is not None:
+            self.cache.invalidate(make_url(endpoint))
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._client.aclose()
@@ -1,17 +1,99 @@
+from typing import Any, Optional
+
+from fitness_tracker.apis.true_coach.async_session import (
+    DEFAULT_MAX_CONNECTIONS,
+    AsyncTrueCoachSession,
+)
 from fitness_tracker.apis.true_coach.session import TrueCoachSession
-from fitness_tracker.apis.true_coach.workouts import TrueCoachWorkouts
-from fitness_tracker.apis.true_coach.exercises import TrueCoachExercises
-from fitness_tracker.apis.true_coach.assessments import TrueCoachAssessments
-from fitness_tracker.apis.base import BaseClient
+from fitness_tracker.apis.true_coach.workouts import AsyncTrueCoachWorkouts, TrueCoachWorkouts
+from fitness_tracker.apis.true_coach.exercises import AsyncTrueCoachExercises, TrueCoachExercises
+from fitness_tracker.apis.true_coach.assessments import (
+    AsyncTrueCoachAssessments,
+    TrueCoachAssessments,
+)
+from fitness_tracker.apis.cache import ResponseCache
+from fitness_tracker.apis.base import BaseClient, SchedulerStats
+
+
+class AsyncTrueCoachClient:
+    """Async True Coach API client class
+
+    The client, and the connection pool it holds, belong to the event loop it is first
+    used on.
+
+    Example:
+        >>> async def update_workout_items(items):
+        ...     async with AsyncTrueCoachClient() as client:
+        ...         await asyncio.gather(
+        ...             *(client.workouts.update_workout_item(i, item) for i, item in items)
+        ...         )
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        """Initiate the client with the token
+
+        Args:
+            max_connections (int): The maximum number of concurrent connections
+            cache (Optional[ResponseCache]): The cache for slow-changing resources such as
+                exercises and assessments, no caching if None. It is left open on ``aclose``,
+                since whoever created it may share it with other clients
+        """
+        self.cache = cache
+        self._session = AsyncTrueCoachSession(max_connections=max_connections, cache=self.cache)
+        self.workouts = AsyncTrueCoachWorkouts(session=self._session)
+        self.exercises = AsyncTrueCoachExercises(session=self._session)
+        self.assessments = AsyncTrueCoachAssessments(session=self._session)
+
+    def scheduler_stats(self) -> list[SchedulerStats]:
+        """Return the queue depth, concurrency limit and throttle counts of each host."""
+        return self._session.scheduler.stats()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._session.aclose()
+
+    async def __aenter__(self) -> "AsyncTrueCoachClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Optional[Any]) -> None:
+        await self.aclose()
+
 
 class TrueCoachClient(BaseClient):
-    """True Coach API client class"""
-    
-    def __init__(self) -> None:
+    """True Coach API client class
+
+    Each call runs the matching ``AsyncTrueCoachSession`` coroutine on the shared event loop
+    and blocks until it completes. The session is only ever used on that loop, so it is not
+    exposed; async callers create an ``AsyncTrueCoachClient`` on their own loop instead.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
         """Initiate the client with the token
 
+        Args:
+            max_connections (int): The maximum number of concurrent connections
+            cache (Optional[ResponseCache]): The cache for slow-changing resources, no
+                caching if None
         """
-        self._session = TrueCoachSession()
+        self._session = TrueCoachSession(
+            async_session=AsyncTrueCoachSession(max_connections=max_connections, cache=cache)
+        )
         self.workouts = TrueCoachWorkouts(session=self._session)
         self.exercises = TrueCoachExercises(session=self._session)
         self.assessments = TrueCoachAssessments(session=self._session)
+
+    def scheduler_stats(self) -> list[SchedulerStats]:
+        """Return the queue depth, concurrency limit and throttle counts of each host."""
+        return self._session.async_session.scheduler.stats()
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self._session.close()
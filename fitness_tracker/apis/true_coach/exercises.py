@@ -1,21 +1,39 @@
 
+from fitness_tracker.apis.event_loop import run
+from fitness_tracker.apis.true_coach.async_session import AsyncTrueCoachSession
 from fitness_tracker.apis.true_coach.session import TrueCoachSession
 from fitness_tracker.apis.true_coach.types import ExerciseResponse
 from typing import Optional
 
-class TrueCoachExercises:
-    """True Coach API Exercises class"""
+class AsyncTrueCoachExercises:
+    """Async True Coach API Exercises class"""
 
-    def __init__(self, session:TrueCoachSession) -> None:
+    def __init__(self, session: AsyncTrueCoachSession) -> None:
         """Initiate the Exercises class with the token
 
         """
         self._session = session
         self.endpoint = "exercises"
 
-    def get(self) -> Optional[ExerciseResponse]:
+    async def get(self) -> Optional[ExerciseResponse]:
         """Get all the exercises"""
                 
-        data = self._session.make_request(method="GET", endpoint=self.endpoint)
+        data = await self._session.make_request(
+            method="GET", endpoint=self.endpoint, cached=True
+        )
         if data:
-            return ExerciseResponse(**data)
\ No newline at end of file
+            return ExerciseResponse(**data)
+
+
+class TrueCoachExercises:
+    """True Coach API Exercises class"""
+
+    def __init__(self, session: TrueCoachSession) -> None:
+        """Initiate the Exercises class with the token"""
+        self._session = session
+        self._async = AsyncTrueCoachExercises(session.async_session)
+        self.endpoint = self._async.endpoint
+
+    def get(self) -> Optional[ExerciseResponse]:
+        """Get all the exercises"""
+        return run(self._async.get())
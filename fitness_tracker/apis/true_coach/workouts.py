@@ -1,6 +1,8 @@
 from pprint import pprint
 from typing import Any, Literal, Optional
 
+from fitness_tracker.apis.event_loop import run
+from fitness_tracker.apis.true_coach.async_session import AsyncTrueCoachSession
 from fitness_tracker.apis.true_coach.session import TrueCoachSession
 from fitness_tracker.apis.true_coach.types import (
     PutWorkoutItemRequest,
@@ -9,15 +11,15 @@ from fitness_tracker.apis.true_coach.types import (
 )
 
 
-class TrueCoachWorkouts:
-    """True Coach API Workouts class"""
+class AsyncTrueCoachWorkouts:
+    """Async True Coach API Workouts class"""
 
-    def __init__(self, session: TrueCoachSession) -> None:
+    def __init__(self, session: AsyncTrueCoachSession) -> None:
         """Initiate the Workouts class with the token"""
         self._session = session
         self.endpoint = "clients/2876143/workouts"
 
-    def get(
+    async def get(
         self,
         order: Literal["asc", "desc"] = "asc",
         page: int = 1,
@@ -31,7 +33,8 @@ class TrueCoachWorkouts:
             order (Literal["asc", "desc"]): The order of the workouts
             page (int): The page of the workouts
             per_page (int): The number of workouts per page
-            states (Literal["pending", "completed", "missed"] | list[Literal["pending", "completed", "missed"]]): The states of the workouts
+            states (Literal["pending", "completed", "missed"] | list[Literal["pending",
+                "completed", "missed"]]): The states of the workouts
 
         Returns:
             WorkoutResponse: The workouts of the user
@@ -42,12 +45,12 @@ class TrueCoachWorkouts:
 
         params = {"order": order, "page": page, "per_page": per_page, "states": states}
 
-        data = self._session.make_request(method="GET", endpoint=self.endpoint, json=params)
+        data = await self._session.make_request(method="GET", endpoint=self.endpoint, json=params)
         if data:
             return WorkoutResponse(**data)
         return None
 
-    def update_workout_item(
+    async def update_workout_item(
         self, workout_item_id: int, workout_item: PutWorkoutItemRequest
     ) -> Optional[PutWorkoutItemResponse]:
         """Update the state of a workout item.
@@ -60,7 +63,7 @@ class TrueCoachWorkouts:
             PutWorkoutItemResponse: The updated workout item
         """
         endpoint = f"workout_items/{workout_item_id}"
-        data = self._session.make_request(
+        data = await self._session.make_request(
             method="PUT", endpoint=endpoint, json={"workout_item": workout_item.model_dump()}
         )
         if data:
@@ -71,9 +74,10 @@ class TrueCoachWorkouts:
                 raise
         return None
 
-    def update_workout(self, workout_id: int, workout: dict[str, Any]) -> Any:
+    async def update_workout(self, workout_id: int, workout: dict[str, Any]) -> Any:
+        """Update a workout with the given fields."""
         endpoint = f"workouts/{workout_id}"
-        data = self._session.make_request(method="PUT", endpoint=endpoint, json=workout)
+        data = await self._session.make_request(method="PUT", endpoint=endpoint, json=workout)
         if data:
             try:
                 return data
@@ -82,14 +86,58 @@ class TrueCoachWorkouts:
                 raise
         return None
 
-    def mark_as_completed(self, workout_id: int) -> Any:
-        return self.update_workout(
+    async def mark_as_completed(self, workout_id: int) -> Any:
+        """Mark a workout as completed."""
+        return await self.update_workout(
             workout_id=workout_id,
             workout={"workout": {"state_event": "mark_as_completed"}},
         )
 
-    def mark_as_missed(self, workout_id: int) -> Any:
-        return self.update_workout(
+    async def mark_as_missed(self, workout_id: int) -> Any:
+        """Mark a workout as missed."""
+        return await self.update_workout(
             workout_id=workout_id,
             workout={"workout": {"state_event": "mark_as_missed"}},
         )
+
+
+class TrueCoachWorkouts:
+    """True Coach API Workouts class"""
+
+    def __init__(self, session: TrueCoachSession) -> None:
+        """Initiate the Workouts class with the token"""
+        self._session = session
+        self._async = AsyncTrueCoachWorkouts(session.async_session)
+        self.endpoint = self._async.endpoint
+
+    def get(
+        self,
+        order: Literal["asc", "desc"] = "asc",
+        page: int = 1,
+        per_page: int = 10,
+        states: Literal["pending", "completed", "missed"]
+        | list[Literal["pending", "completed", "missed"]] = "pending",
+    ) -> Optional[WorkoutResponse]:
+        """Get the workouts of the user. See ``AsyncTrueCoachWorkouts.get``."""
+        return run(self._async.get(order=order, page=page, per_page=per_page, states=states))
+
+    def update_workout_item(
+        self, workout_item_id: int, workout_item: PutWorkoutItemRequest
+    ) -> Optional[PutWorkoutItemResponse]:
+        """Update the state of a workout item.
+
+        See ``AsyncTrueCoachWorkouts.update_workout_item``.
+        """
+        return run(self._async.update_workout_item(workout_item_id, workout_item))
+
+    def update_workout(self, workout_id: int, workout: dict[str, Any]) -> Any:
+        """Update a workout with the given fields. See ``AsyncTrueCoachWorkouts.update_workout``."""
+        return run(self._async.update_workout(workout_id, workout))
+
+    def mark_as_completed(self, workout_id: int) -> Any:
+        """Mark a workout as completed."""
+        return run(self._async.mark_as_completed(workout_id))
+
+    def mark_as_missed(self, workout_id: int) -> Any:
+        """Mark a workout as missed."""
+        return run(self._async.mark_as_missed(workout_id))
@@ -0,0 +1,17 @@
+-- Copy the Hevy sets of a workout into Sets in one pass: the join is evaluated once, and
+-- each row either inserts a new set or updates the one at the same position
+INSERT INTO Sets (workout_item_id, "index", weight_kg, type, reps, distance_meters, duration_seconds, rpe, hevy_app_id)
+SELECT wi.id as workout_item_id, has."index", has.weight_kg, has.type, has.reps, has.distance_meters, has.duration_seconds, has.rpe, has.id as hevy_app_id
+FROM Workout w
+JOIN WorkoutItem wi ON w.id = wi.workout_id
+JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+WHERE w.true_coach_id = :true_coach_id
+ON CONFLICT (workout_item_id, "index") DO UPDATE SET
+    weight_kg = excluded.weight_kg,
+    reps = excluded.reps,
+    distance_meters = excluded.distance_meters,
+    duration_seconds = excluded.duration_seconds,
+    rpe = excluded.rpe,
+    type = excluded.type,
+    hevy_app_id = excluded.hevy_app_id;
@@ -27,9 +27,8 @@ SET hevy_app_id = (
     FROM JoinedTable jt
     WHERE WorkoutItem.true_coach_id = jt.true_coach_id
 )
-WHERE EXISTS (
-    SELECT 1
+WHERE WorkoutItem.true_coach_id IN (
+    SELECT jt.true_coach_id
     FROM JoinedTable jt
-    WHERE WorkoutItem.true_coach_id = jt.true_coach_id
 );
 
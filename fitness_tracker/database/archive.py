@@ -0,0 +1,114 @@
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+
+import logs
+
+load_dotenv()
+
+logger = logs.get_logger(__name__)
+
+ARCHIVE_COLUMNS = ["timestamp", "value"]
+
+# Where the archive lives, unless APPLE_HEALTH_ARCHIVE_ROOT points elsewhere
+ARCHIVE_ROOT_VARIABLE = "APPLE_HEALTH_ARCHIVE_ROOT"
+DEFAULT_ARCHIVE_ROOT = Path("~/.fitness_tracker/apple_health_archive")
+
+
+def default_archive_root() -> Path:
+    """Return the configured archive folder, independent of the working directory."""
+    return Path(os.environ.get(ARCHIVE_ROOT_VARIABLE, DEFAULT_ARCHIVE_ROOT)).expanduser()
+
+
+def next_month(month: datetime) -> datetime:
+    """Return the first day of the month after ``month``."""
+    if month.month == 12:
+        return month.replace(year=month.year + 1, month=1, day=1)
+    return month.replace(month=month.month + 1, day=1)
+
+
+class ParquetArchive:
+    """Month-partitioned Parquet files of ``(timestamp, value)`` series, one folder per key.
+
+    Files are laid out as ``<root>/<key>/<YYYY-MM>.parquet``, so a range read only opens the
+    months it overlaps and only decodes the two columns. Parquet I/O goes through pyarrow.
+    """
+
+    def __init__(self, root: Path) -> None:
+        """Initiate the archive rooted at ``root``."""
+        self.root = Path(root)
+
+    def path(self, key: int, month: datetime) -> Path:
+        """Return the file holding ``key`` for ``month``."""
+        return self.root / str(key) / f"{month:%Y-%m}.parquet"
+
+    def write(self, key: int, month: datetime, frame: pd.DataFrame) -> None:
+        """Merge rows into the month file of ``key``.
+
+        Rows already in the file are replaced by the incoming rows with the same timestamp.
+        The file is written to a temporary name and swapped in, so readers never see a
+        partial file.
+
+        Args:
+            key (int): The series key, e.g. the data type id
+            month (datetime): The first day of the month the rows fall in
+            frame (pd.DataFrame): The rows, with ``timestamp`` and ``value`` columns
+        """
+        path = self.path(key, month)
+        frame = frame[ARCHIVE_COLUMNS]
+        if path.exists():
+            frame = pd.concat([frame, pd.read_parquet(path, columns=ARCHIVE_COLUMNS)])
+        frame = frame.drop_duplicates("timestamp").sort_values("timestamp", ignore_index=True)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".parquet.tmp")
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        logger.debug("Archived %d rows to %s", len(frame), path)
+
+    def months(self, key: int) -> Iterator[datetime]:
+        """Yield the first day of every archived month of ``key``, in order."""
+        folder = self.root / str(key)
+        if folder.is_dir():
+            for path in sorted(folder.glob("*.parquet")):
+                yield datetime.strptime(path.stem, "%Y-%m")
+
+    def keys(self) -> Iterator[int]:
+        """Yield every key that has archived months."""
+        if self.root.is_dir():
+            for folder in sorted(self.root.iterdir()):
+                if folder.is_dir() and folder.name.isdigit():
+                    yield int(folder.name)
+
+    def read(
+        self, key: int, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """Read the archived rows of ``key`` within ``[start, end]``, sorted by timestamp."""
+        folder = self.root / str(key)
+        if not folder.is_dir():
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+
+        files = []
+        for path in sorted(folder.glob("*.parquet")):
+            month = datetime.strptime(path.stem, "%Y-%m")
+            if end is not None and month > end:
+                continue
+            if start is not None and next_month(month) <= start:
+                continue
+            files.append(path)
+        if not files:
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS)
+
+        frame = pd.concat(
+            [pd.read_parquet(f, columns=ARCHIVE_COLUMNS) for f in files], ignore_index=True
+        )
+        if start is not None:
+            frame = frame[frame["timestamp"] >= start]
+        if end is not None:
+            frame = frame[frame["timestamp"] <= end]
+        return frame
@@ -1,6 +1,8 @@
 import logging
+from typing import Any
 
-from sqlalchemy.engine import Engine
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
 
 from fitness_tracker.database.models import *  # noqa: F403
 from fitness_tracker.database.services import (
@@ -15,12 +17,42 @@ logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 
+def _disable_pysqlite_transactions(dbapi_connection: Any, connection_record: Any) -> None:
+    """Stop pysqlite from beginning and committing transactions on its own."""
+    dbapi_connection.isolation_level = None
+
+
+def _begin(connection: Connection) -> None:
+    """Begin the transaction SQLAlchemy asked for."""
+    connection.exec_driver_sql("BEGIN")
+
+
+def enable_sqlite_savepoints(engine: Engine) -> None:
+    """Make ``Session.begin_nested`` savepoints work on a pysqlite engine.
+
+    pysqlite only begins a transaction before DML, so a ``SAVEPOINT`` issued first starts
+    one of its own and releasing it commits. Letting SQLAlchemy emit ``BEGIN`` itself keeps
+    savepoints nested inside the session's transaction. Safe to call more than once.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if not event.contains(engine, "connect", _disable_pysqlite_transactions):
+        event.listen(engine, "connect", _disable_pysqlite_transactions)
+        event.listen(engine, "begin", _begin)
+
+
 class Database:
     """A class representing a connection to a MySQL database.
 
     This class provides methods for creating and dropping triggers, fetching rows from
     the database, and getting parameters for a Songstats creator query.
 
+    On a SQLite engine, building a Database calls ``enable_sqlite_savepoints``, which
+    changes the engine for every user of it: pysqlite connections are opened with
+    ``isolation_level=None`` and SQLAlchemy emits ``BEGIN`` itself. Transactions then
+    start at ``BEGIN`` rather than at the first write, so ``Session.begin_nested``
+    savepoints nest properly. Other dialects are left alone.
+
     Attributes:
         connection: A connection to the MySQL database.
     """
@@ -36,6 +68,7 @@ class Database:
         """
         self.engine = engine
         logger.debug("Database engine: %s", self.engine)
+        enable_sqlite_savepoints(engine)
 
         self.true_coach = TrueCoachService(engine)
         self.hevy_app = HevyAppService(engine)
@@ -0,0 +1,75 @@
+from functools import cache
+
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from fitness_tracker.database.models import (
+    Exercise,
+    HevyAppWorkout,
+    HevyAppWorkoutItem,
+    TrueCoachExercise,
+    TrueCoachWorkout,
+    TrueCoachWorkoutItem,
+    Workout,
+    WorkoutItem,
+)
+
+# Most queries a profile may issue for one root object, whatever the number of items
+MAX_GRAPH_QUERIES = 5
+
+
+@cache
+def _profiles() -> dict[str, tuple[LoaderOption, ...]]:
+    """Build the loader profiles.
+
+    Collections are loaded with ``selectinload``, one ``IN`` query per level, and the
+    many-to-one and one-to-one links below them with ``joinedload``, so the number of queries
+    does not grow with the number of items.
+    """
+    return {
+        # TrueCoach workout -> items -> exercise -> linked Hevy exercise
+        "true_coach_workout_graph": (
+            selectinload(TrueCoachWorkout.workout_items)
+            .joinedload(TrueCoachWorkoutItem.exercise)
+            .joinedload(TrueCoachExercise.hevy_app),
+        ),
+        # Tracker workout -> TrueCoach workout, and items -> exercise -> Hevy exercise,
+        # TrueCoach item and sets
+        "tracker_workout_graph": (
+            joinedload(Workout.true_coach),
+            selectinload(Workout.workout_items).options(
+                joinedload(WorkoutItem.exercise).joinedload(Exercise.hevy_app),
+                joinedload(WorkoutItem.true_coach),
+                selectinload(WorkoutItem.sets),
+            ),
+        ),
+        # Hevy workout -> TrueCoach workout, and items -> exercise, TrueCoach item and sets
+        "hevy_app_workout_graph": (
+            joinedload(HevyAppWorkout.true_coach),
+            selectinload(HevyAppWorkout.workout_items).options(
+                joinedload(HevyAppWorkoutItem.exercise),
+                joinedload(HevyAppWorkoutItem.true_coach),
+                selectinload(HevyAppWorkoutItem.sets),
+            ),
+        ),
+    }
+
+
+def get_profile(name: str) -> tuple[LoaderOption, ...]:
+    """Return the loader options of a named profile, to pass to ``Query.options``.
+
+    Args:
+        name (str): The profile name, e.g. ``"tracker_workout_graph"``
+
+    Raises:
+        KeyError: If there is no profile with this name.
+    """
+    try:
+        return _profiles()[name]
+    except KeyError:
+        raise KeyError(f"Unknown loader profile {name!r}") from None
+
+
+def profile_names() -> list[str]:
+    """Return the names of all loader profiles."""
+    return sorted(_profiles())
@@ -8,6 +8,7 @@ from sqlalchemy import (
     UniqueConstraint
 )
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from fitness_tracker.database.models.base import BaseModel
 
@@ -62,3 +63,86 @@ class AppleHealthWorkout(BaseModel):
 
     # Constraints
     __table_args__ = (UniqueConstraint("workout_type_id", "start_date", "end_date", name="uq_workout_type_start_date_end_date"),)
+
+
+class AppleHealthHourlyRollup(BaseModel):
+    """Hourly aggregate of the ``AppleHealthDataRecord`` rows of a data type, in UTC."""
+
+    __tablename__: str = __qualname__
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    data_type_id = Column(Integer, ForeignKey("AppleHealthDataType.id"), nullable=False)
+    bucket = Column(DateTime, nullable=False)  # Start of the hour
+    count = Column(Integer, nullable=False)
+    sum = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+
+    # Constraints
+    __table_args__ = (UniqueConstraint("data_type_id", "bucket", name="uq_data_type_bucket"),)
+
+
+class AppleHealthDailyRollup(BaseModel):
+    """Daily aggregate of the ``AppleHealthDataRecord`` rows of a data type, in UTC."""
+
+    __tablename__: str = __qualname__
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    data_type_id = Column(Integer, ForeignKey("AppleHealthDataType.id"), nullable=False)
+    bucket = Column(DateTime, nullable=False)  # Start of the day
+    count = Column(Integer, nullable=False)
+    sum = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+
+    # Constraints
+    __table_args__ = (UniqueConstraint("data_type_id", "bucket", name="uq_data_type_bucket"),)
+
+
+class AppleHealthIngestLedger(BaseModel):
+    """Records each Health Auto Export file version that has been ingested.
+
+    Attributes:
+        path (str): The lower-cased Dropbox path of the file.
+        content_hash (str): The Dropbox content hash of the ingested version.
+        row_count (int): The number of CSV rows written from this version.
+        max_timestamp (datetime): The latest timestamp ingested from the file so far. Rows at
+            or before it are skipped when the file is rewritten.
+        ingested_at (datetime): When the version was ingested.
+    """
+
+    __tablename__: str = __qualname__
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    path = Column(String, nullable=False)
+    content_hash = Column(String, nullable=False)
+    row_count = Column(Integer, nullable=False, default=0)
+    max_timestamp = Column(DateTime, nullable=True)
+    ingested_at = Column(DateTime, default=func.now(), nullable=False)
+
+    # Constraints
+    __table_args__ = (UniqueConstraint("path", "content_hash", name="uq_path_content_hash"),)
+
+
+class AppleHealthMetricMapping(BaseModel):
+    """Maps an Apple Health data type onto a tracker ``Metric``.
+
+    Attributes:
+        data_type_id (int): The Apple Health data type to copy records from.
+        metric_id (int): The metric the records are copied into as ``MetricItem`` rows.
+        last_record_id (int): The highest ``AppleHealthDataRecord.id`` already considered for
+            this mapping. Only records above it are copied on the next run.
+    """
+
+    __tablename__: str = __qualname__
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    data_type_id = Column(Integer, ForeignKey("AppleHealthDataType.id"), nullable=False)
+    metric_id = Column(Integer, ForeignKey("Metric.id"), nullable=False)
+    last_record_id = Column(Integer, nullable=False, default=0)
+
+    # Relationships
+    data_type = relationship("AppleHealthDataType")
+
+    # Constraints
+    __table_args__ = (UniqueConstraint("data_type_id", "metric_id", name="uq_data_type_metric"),)
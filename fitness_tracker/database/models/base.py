@@ -1,10 +1,27 @@
-from typing import Any
+from functools import cache
+from typing import Any, NamedTuple
 
+from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.inspection import inspect # type: ignore
 from sqlalchemy.orm import declarative_base  # type: ignore
+from sqlalchemy.sql.dml import Insert
 
 Base = declarative_base()
 
+# The insert constructs that support ON CONFLICT, by dialect name
+UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+class ModelMetadata(NamedTuple):
+    """What a model class knows about its table, worked out once per class."""
+
+    columns: tuple[str, ...]
+    primary_keys: tuple[str, ...]
+    unique_constraints: tuple[tuple[str, ...], ...]
+    relationships: tuple[str, ...]
+    keys: tuple[str, ...]
+
 
 class BaseModel(Base):
     """Base class for all SQL models."""
@@ -12,22 +29,54 @@ class BaseModel(Base):
     """Base class used to initialize the declarative base for all tables."""
 
     __abstract__ = True
-    __keys__: list[str] = []
 
     @classmethod
     def create(cls, **kwargs: Any):
         """Creates a new instance of the table entry."""
         return cls(**kwargs)
 
+    @classmethod
+    @cache
+    def model_metadata(cls) -> ModelMetadata:
+        """Returns the column names, keys and constraints of the table, cached per class."""
+        mapper = inspect(cls)  # type: ignore
+        table = cls.__table__  # type: ignore
+        unique = [
+            tuple(column.name for column in constraint.columns)
+            for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ] + [
+            tuple(column.name for column in index.columns)
+            for index in table.indexes
+            if isinstance(index, Index) and index.unique
+        ]
+        return ModelMetadata(
+            columns=tuple(column.name for column in mapper.c),
+            primary_keys=tuple(column.name for column in table.primary_key),
+            unique_constraints=tuple(dict.fromkeys(unique)),
+            relationships=tuple(relationship.key for relationship in mapper.relationships),
+            keys=tuple(cls.__get_keys__()),
+        )
+
     @classmethod
     def columns(cls) -> list[str]:
         """Returns a list of all column names without the relationships."""
-        return [column.name for column in inspect(cls).c]  # type: ignore
+        return list(cls.model_metadata().columns)
+
+    @classmethod
+    def primary_keys(cls) -> list[str]:
+        """Returns a list of the primary key column names."""
+        return list(cls.model_metadata().primary_keys)
+
+    @classmethod
+    def unique_constraints(cls) -> list[tuple[str, ...]]:
+        """Returns the column names of every unique constraint and unique index."""
+        return list(cls.model_metadata().unique_constraints)
 
     @classmethod
     def relationships(cls): # type: ignore
         """Returns a list of all relationship names."""
-        return [column.key for column in inspect(cls).relationships]  # type: ignore
+        return list(cls.model_metadata().relationships)
 
     @classmethod
     def __get_keys__(cls):
@@ -39,9 +88,7 @@ class BaseModel(Base):
     @classmethod
     def keys(cls):
         """Returns a list of all column names including the relationships."""
-        if not cls.__keys__:  # Cache the keys
-            cls.__keys__ = cls.__get_keys__()
-        return cls.__keys__
+        return list(cls.model_metadata().keys)
 
     def __iter__(self):
         """Iterates over all columns and relationship names."""
@@ -66,11 +113,52 @@ class BaseModel(Base):
 
     def to_dict(self):
         """Returns a dictionary of all column names and values."""
-        return {key: self.__getitem__(key) for key in self.columns()}
+        return {key: getattr(self, key) for key in self.model_metadata().columns}
+
+    @classmethod
+    @cache
+    def insert_ignore_statement(cls) -> Insert:
+        """Returns the shared insert statement with the IGNORE keyword.
+
+        The statement carries no values, so it is executed with plain dicts, one or many at
+        a time, and SQLAlchemy compiles it once per engine rather than once per row.
+        """
+        return cls.__table__.insert().prefix_with("OR IGNORE")  # type: ignore
+
+    @classmethod
+    @cache
+    def upsert_statement(
+        cls,
+        dialect: str,
+        conflict_cols: tuple[str, ...] = (),
+        update_cols: tuple[str, ...] = (),
+    ) -> Insert:
+        """Returns the shared ``INSERT .. ON CONFLICT`` statement for a dialect.
+
+        Args:
+            dialect: The dialect name, ``sqlite`` or ``postgresql``.
+            conflict_cols: The columns of the unique constraint that decides a conflict.
+            update_cols: The columns to overwrite on conflict, none to skip the row.
+
+        Raises:
+            NotImplementedError: If the dialect has no ``ON CONFLICT`` support.
+        """
+        if dialect not in UPSERT_DIALECTS:
+            raise NotImplementedError(f"ON CONFLICT is not supported on {dialect}")
+        table = cls.__table__  # type: ignore
+        stmnt = UPSERT_DIALECTS[dialect](table)
+        if update_cols:
+            return stmnt.on_conflict_do_update(
+                index_elements=[table.c[column] for column in conflict_cols],
+                set_={column: stmnt.excluded[column] for column in update_cols},
+            )
+        return stmnt.on_conflict_do_nothing(
+            index_elements=[table.c[column] for column in conflict_cols] or None
+        )
 
     def insert_ignore(self):
         """Returns an insert statement with the IGNORE keyword."""
-        return self.__table__.insert().prefix_with("OR IGNORE").values(**self.to_dict())
+        return self.insert_ignore_statement().values(**self.to_dict())
 
     def pformat(self, indent: str = "   "):
         """Pretty formats the table entry.
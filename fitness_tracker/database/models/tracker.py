@@ -95,11 +95,13 @@ class WorkoutItem(BaseModel):
     __tablename__: str = __qualname__
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    workout_id = Column(Integer, ForeignKey("Workout.id"), nullable=False)
+    workout_id = Column(Integer, ForeignKey("Workout.id"), nullable=False, index=True)
     position = Column(Integer, nullable=False)
     exercise_id = Column(Integer, ForeignKey("Exercise.id"), nullable=False)
-    hevy_app_id = Column(Integer, ForeignKey("HevyAppWorkoutItem.id"), nullable=True)
-    true_coach_id = Column(Integer, ForeignKey("TrueCoachWorkoutItem.id"), nullable=True)
+    hevy_app_id = Column(Integer, ForeignKey("HevyAppWorkoutItem.id"), nullable=True, index=True)
+    true_coach_id = Column(
+        Integer, ForeignKey("TrueCoachWorkoutItem.id"), nullable=True, index=True
+    )
     rest = Column(Integer, nullable=False, default=90)
 
     # Relationships
@@ -54,7 +54,7 @@ class TrueCoachWorkoutItem(BaseModel):
     __tablename__: str = __qualname__
 
     id = Column(Integer, primary_key=True, autoincrement=False)  # API provides id
-    workout_id = Column(Integer, ForeignKey("TrueCoachWorkout.id"), nullable=False)
+    workout_id = Column(Integer, ForeignKey("TrueCoachWorkout.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     info = Column(String, nullable=True)
     comment = Column(String, nullable=True)
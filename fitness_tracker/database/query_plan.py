@@ -0,0 +1,203 @@
+"""Check that SQL statements are answered with index lookups rather than full table scans.
+
+Run against a database to check every statement of the SQL registry::
+
+    python -m fitness_tracker.database.query_plan sqlite:///fitness_tracker.db
+
+The exit status is 1 when a statement scans a table at or above the row threshold without
+being listed in ``KNOWN_SCANS``. Queries built by the services can be checked too, by
+recording them with ``capture_statements`` while they run and passing them to
+``check_query_plans``.
+"""
+import re
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from typing import Any, NamedTuple, Optional, Union
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql.base import Executable
+
+import logs
+
+from fitness_tracker.database.statements import get_statement, statement_names
+
+logger = logs.get_logger(__name__)
+
+DEFAULT_MIN_ROWS = 1_000
+
+# Scans that are inherent to a statement rather than a missing index, by statement name
+KNOWN_SCANS: dict[str, frozenset[str]] = {
+    # Scratch queries, never run by the sync
+    "scratch_pad": frozenset({"Workout", "AppleHealthDataRecord"}),
+    "true_coach_hevy_workout_item_ids": frozenset(
+        {"Workout", "WorkoutItem", "TrueCoachWorkoutItem"}
+    ),
+    # Looks for every workout item without a tracker counterpart
+    "true_coach/tracker/workout_items/insert": frozenset({"TrueCoachWorkoutItem"}),
+    # Looks for every metric item not posted to TrueCoach yet
+    "tracker/true_coach/assessments/select": frozenset({"MetricItem"}),
+}
+
+# A statement as SQL with its positional parameters
+RawStatement = tuple[str, Sequence[Any]]
+
+# Table references and their aliases, e.g. "JOIN WorkoutItem wi" or "FROM Sets AS s"
+_TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN|UPDATE|INTO)\s+"?(\w+)"?(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|SET\b|JOIN\b|'
+    r'LEFT\b|INNER\b|CROSS\b|GROUP\b|ORDER\b|LIMIT\b|SELECT\b|USING\b|VALUES\b)(\w+))?',
+    re.IGNORECASE,
+)
+_SCAN = re.compile(r"^SCAN (\w+)")
+_PLANNED = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+
+class FullScan(NamedTuple):
+    """A table a statement reads in full."""
+
+    statement: str
+    table: str
+    rows: int
+    detail: str
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    """Map every table name and alias in ``sql`` to its table name."""
+    aliases = {}
+    for table, alias in _TABLE_REFERENCE.findall(sql):
+        aliases[table] = table
+        if alias:
+            aliases[alias] = table
+    return aliases
+
+
+def compile_statement(
+    connection: Connection, statement: Executable, params: Optional[Mapping[str, Any]] = None
+) -> RawStatement:
+    """Compile a statement to SQL and positional parameters.
+
+    Bind parameters without a value, in the statement or in ``params``, are bound to NULL,
+    which does not change the plan.
+    """
+    compiled = statement.compile(dialect=connection.dialect)
+    values = dict.fromkeys(compiled.binds)
+    values.update({k: v for k, v in compiled.params.items() if v is not None})
+    values.update(params or {})
+    return str(compiled), tuple(values[name] for name in compiled.positiontup or ())
+
+
+def explain(connection: Connection, sql: str, params: Sequence[Any] = ()) -> list[str]:
+    """Return the ``EXPLAIN QUERY PLAN`` details of a statement."""
+    plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", tuple(params))
+    return [row[3] for row in plan]
+
+
+def table_rows(connection: Connection) -> dict[str, int]:
+    """Return an estimate of the row count of every table, from its largest rowid."""
+    rows = {}
+    for table in inspect(connection).get_table_names():
+        rows[table] = connection.exec_driver_sql(f'SELECT MAX(rowid) FROM "{table}"').scalar() or 0
+    return rows
+
+
+def full_scans(
+    connection: Connection,
+    name: str,
+    statement: RawStatement,
+    min_rows: int = DEFAULT_MIN_ROWS,
+    rows: Optional[Mapping[str, int]] = None,
+) -> list[FullScan]:
+    """Return the tables of at least ``min_rows`` rows that ``statement`` scans in full.
+
+    Scans of CTEs and subquery results are ignored, only stored tables count. A scan of an
+    index is still a scan, since it reads every entry.
+    """
+    rows = rows if rows is not None else table_rows(connection)
+    sql, params = statement
+    aliases = _aliases(sql)
+    scans = []
+    for detail in explain(connection, sql, params):
+        match = _SCAN.match(detail)
+        if not match:
+            continue
+        table = aliases.get(match.group(1), match.group(1))
+        if table in rows and rows[table] >= min_rows:
+            scans.append(FullScan(name, table, rows[table], detail))
+    return scans
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[dict[str, RawStatement]]:
+    """Record the distinct statements run on ``engine`` within the block.
+
+    Yields a dict, filled as statements run, of each SQL string to itself and the
+    parameters it first ran with. Executemany statements keep their first parameter set.
+    """
+    captured: dict[str, RawStatement] = {}
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(_PLANNED) and statement not in captured:
+            if executemany:
+                parameters = parameters[0] if parameters else ()
+            captured[statement] = (statement, parameters)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def check_query_plans(
+    engine: Engine,
+    min_rows: int = DEFAULT_MIN_ROWS,
+    statements: Optional[Mapping[str, Union[Executable, RawStatement]]] = None,
+    known_scans: Mapping[str, frozenset[str]] = KNOWN_SCANS,
+) -> list[FullScan]:
+    """Return the unexpected full scans of a set of statements.
+
+    Args:
+        engine (Engine): The database to plan against, its table sizes set the threshold
+        min_rows (int): Scans of smaller tables are fine
+        statements (Optional[Mapping[str, Union[Executable, RawStatement]]]): The statements
+            by name, either SQLAlchemy statements or captured SQL with its parameters. Every
+            statement of the SQL registry if None
+        known_scans (Mapping[str, frozenset[str]]): Tables each statement may scan
+
+    Returns:
+        list[FullScan]: The scans not listed in ``known_scans``
+    """
+    if statements is None:
+        statements = {name: get_statement(name) for name in statement_names()}
+    problems = []
+    with engine.connect() as connection:
+        rows = table_rows(connection)
+        for name, statement in statements.items():
+            raw = (
+                compile_statement(connection, statement)
+                if isinstance(statement, Executable)
+                else statement
+            )
+            for scan in full_scans(connection, name, raw, min_rows, rows):
+                if scan.table in known_scans.get(name, frozenset()):
+                    logger.debug("Known scan in %s: %s", name, scan.detail)
+                    continue
+                problems.append(scan)
+    return problems
+
+
+def main(argv: list[str]) -> int:
+    """Check the query plans of the database at ``argv[1]``."""
+    if len(argv) < 2:
+        print(f"Usage: {argv[0]} DATABASE_URL [MIN_ROWS]")  # noqa: T201
+        return 2
+    min_rows = int(argv[2]) if len(argv) > 2 else DEFAULT_MIN_ROWS
+    problems = check_query_plans(create_engine(argv[1]), min_rows=min_rows)
+    for scan in problems:
+        print(f"{scan.statement}: {scan.detail} on {scan.table} ({scan.rows} rows)")  # noqa: T201
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -3,6 +3,8 @@ from sqlalchemy.orm import Session
 from fitness_tracker.database.models.apple_health import (
     AppleHealthDataRecord,
     AppleHealthDataType,
+    AppleHealthIngestLedger,
+    AppleHealthMetricMapping,
     AppleHealthWorkoutType,
     AppleHealthWorkout
 )
@@ -38,3 +40,20 @@ class AppleHealthWorkoutRepository(BaseRepository[AppleHealthWorkout]):
     def __init__(self, session: Session) -> None:
         """Initiate the Apple Health Workout repository with the session."""
         super().__init__(session=session, model_class=AppleHealthWorkout)
+
+
+class AppleHealthIngestLedgerRepository(BaseRepository[AppleHealthIngestLedger]):
+    """Apple Health Ingest Ledger repository class."""
+
+    def __init__(self, session: Session) -> None:
+        """Initiate the Apple Health Ingest Ledger repository with the session."""
+        super().__init__(session=session, model_class=AppleHealthIngestLedger)
+
+
+class AppleHealthMetricMappingRepository(BaseRepository[AppleHealthMetricMapping]):
+    """Apple Health Metric Mapping repository class."""
+
+    def __init__(self, session: Session) -> None:
+        """Initiate the Apple Health Metric Mapping repository with the session."""
+        super().__init__(session=session, model_class=AppleHealthMetricMapping)
+
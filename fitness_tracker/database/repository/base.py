@@ -1,15 +1,26 @@
-from collections.abc import Sequence
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any, Generic, Optional, TypeVar
 
 import logs
 from fitness_tracker.database.models.base import BaseModel
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import func
+from sqlalchemy.sql.elements import ClauseElement
 
 T = TypeVar("T", bound=BaseModel)
 
 logger = logs.get_logger(__name__)
 
+# Values bound per IN query, well below SQLite's default limit of 999 host parameters
+IN_CHUNK_SIZE = 500
+
+
+def chunked(values: Iterable[Any], size: int = IN_CHUNK_SIZE) -> Iterator[list[Any]]:
+    """Split distinct values into lists of at most ``size`` items."""
+    values = list(dict.fromkeys(values))
+    for offset in range(0, len(values), size):
+        yield values[offset : offset + size]
+
 
 class BaseRepository(Generic[T]):
     """Base repository class to be inherited by all other repositories."""
@@ -91,12 +102,89 @@ class BaseRepository(Generic[T]):
         :return: A list of boolean values indicating whether the records exist or not.
         :rtype: Sequence[bool]
         """  # noqa: W505
-        results: Sequence[bool] = []
+        results: list[bool] = []
         for key, values in kwargs.items():
-            for value in values:
-                results.append(self.exists(**{key: value}))
+            candidates = list(values)
+            stored = self.exists_many(key, candidates)
+            results.extend(value in stored for value in candidates)
         return results
 
+    def get_many(self, column: str, values: Iterable[Any], **kwargs: Any) -> list[T]:
+        """Function to return the records whose ``column`` is one of ``values``.
+
+        The values are looked up in chunks of ``IN_CHUNK_SIZE``, one ``IN`` query each, so
+        any number of values stays within SQLite's host parameter limit.
+
+        Args:
+            column: The name of the column to match.
+            values: The values to look up.
+            **kwargs: Further equality filters.
+
+        Returns:
+            The matching records, in no particular order.
+        """
+        records: list[T] = []
+        for chunk in chunked(values):
+            query = self.query(self.model_class, **kwargs)
+            records.extend(query.filter(getattr(self.model_class, column).in_(chunk)).all())
+        return records
+
+    def exists_many(self, column: str, values: Iterable[Any], **kwargs: Any) -> set[Any]:
+        """Function to return which of ``values`` are stored in ``column``.
+
+        Only the column itself is selected, in chunks of ``IN_CHUNK_SIZE``.
+
+        Args:
+            column: The name of the column to match.
+            values: The values to look up.
+            **kwargs: Further equality filters.
+
+        Returns:
+            The subset of ``values`` that has a record.
+        """
+        attribute = getattr(self.model_class, column)
+        stored: set[Any] = set()
+        for chunk in chunked(values):
+            stmnt = select(attribute).filter_by(**kwargs).where(attribute.in_(chunk))
+            stored.update(self.session.execute(stmnt).scalars())
+        return stored
+
+    def upsert_many(
+        self,
+        rows: Sequence[dict[str, Any]],
+        conflict_cols: Optional[Sequence[str]] = None,
+        update_cols: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Function to insert rows, updating or skipping the ones that already exist.
+
+        Runs as a single executemany of ``INSERT .. ON CONFLICT``, built for the dialect of
+        the session. An empty ``update_cols`` skips the conflicting rows, like ``INSERT OR
+        IGNORE``, and is the only mode that works without ``conflict_cols``.
+
+        Args:
+            rows: The column values of each row, all with the same keys.
+            conflict_cols: The columns of the unique constraint that decides a conflict.
+            update_cols: The columns to overwrite on conflict, every other column in the
+                rows if None.
+
+        Returns:
+            The number of rows the database reports as written.
+
+        Raises:
+            NotImplementedError: If the dialect has no ``ON CONFLICT`` support.
+        """
+        if not rows:
+            return 0
+        conflict_cols = tuple(conflict_cols or ())
+        if update_cols is None:
+            update_cols = [column for column in rows[0] if column not in conflict_cols]
+
+        stmnt = self.model_class.upsert_statement(
+            self.session.get_bind().dialect.name, conflict_cols, tuple(update_cols)
+        )
+        result = self.session.execute(stmnt, list(rows))
+        return max(result.rowcount, 0)
+
     def add(self, obj: T):
         """Function to add a record to the database.
 
@@ -126,12 +214,18 @@ class BaseRepository(Generic[T]):
         Args:
             obj: The record to add to the database.
         """
-        if getattr(obj, "date_created", None) is None:
-            obj.date_created = func.now()
-        if getattr(obj, "date_updated", None) is None:
-            obj.date_updated = func.now()
-        stmnt = obj.insert_ignore()
-        self.session.execute(stmnt)  # type: ignore
+        params = obj.to_dict()
+        stmnt = obj.insert_ignore_statement()
+        # SQL expressions such as func.now() cannot be bound as parameters, so they go into
+        # the statement
+        expressions = {
+            column: params.pop(column)
+            for column in list(params)
+            if isinstance(params[column], ClauseElement)
+        }
+        if expressions:
+            stmnt = stmnt.values(**expressions)
+        self.session.execute(stmnt, params)  # type: ignore
 
     def delete(self, obj: T) -> None:
         """Function to delete a record from the database.
@@ -142,8 +236,33 @@ class BaseRepository(Generic[T]):
         self.session.delete(obj)  # type: ignore
         logger.debug("Deleted %s from the database", obj)
 
+    def delete_where(self, **filters: Any) -> int:
+        """Function to delete the matching records with a single Core ``DELETE``.
+
+        A filter value that is a list, tuple, set or subquery matches with ``IN``, any
+        other value with ``=``. No records are loaded, so ORM cascades do not run and
+        matching objects already in the session are left as they are; use ``delete_all``
+        when the relationships have to be followed.
+
+        Args:
+            **filters: The column values of the records to delete.
+
+        Returns:
+            The number of deleted records.
+        """
+        table = self.model_class.__table__
+        stmnt = delete(table)
+        for column, value in filters.items():
+            if isinstance(value, (list, tuple, set, frozenset, ClauseElement)):
+                stmnt = stmnt.where(table.c[column].in_(value))
+            else:
+                stmnt = stmnt.where(table.c[column] == value)
+        result = self.session.execute(stmnt)
+        logger.debug("Deleted %d records from %s", result.rowcount, table.name)
+        return max(result.rowcount, 0)
+
     def delete_all(self, **kwargs: Any) -> None:
-        """Function to delete a record from the database by id.
+        """Function to delete the matching records through the ORM, following cascades.
 
         :param kwargs: The kwargs of the record to delete from the database
         :type kwargs: dict
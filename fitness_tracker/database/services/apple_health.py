@@ -1,64 +1,697 @@
 import re
-from datetime import datetime, timezone
-from typing import Optional
+import time
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Literal, NamedTuple, Optional
 
+import numpy as np
+import pandas as pd
 from pandas import DataFrame
+from sqlalchemy import DateTime, Integer, String, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import select
+from sqlalchemy.sql import bindparam, exists, func, literal, select, tuple_, type_coerce
 
+import logs
+from fitness_tracker.database.archive import ParquetArchive, default_archive_root, next_month
 from fitness_tracker.database.models.apple_health import (
+    AppleHealthDailyRollup,
     AppleHealthDataRecord,
     AppleHealthDataType,
+    AppleHealthHourlyRollup,
+    AppleHealthIngestLedger,
+    AppleHealthMetricMapping,
     AppleHealthWorkout,
     AppleHealthWorkoutType,
 )
+from fitness_tracker.database.models.tracker import Metric, MetricItem, Workout
 from fitness_tracker.database.repository.apple_health import (
     AppleHealthDataRecordRepository,
     AppleHealthDataTypeRepository,
+    AppleHealthIngestLedgerRepository,
+    AppleHealthMetricMappingRepository,
     AppleHealthWorkoutRepository,
     AppleHealthWorkoutTypeRepository,
 )
 from fitness_tracker.database.services.base import BaseService
 
+logger = logs.get_logger(__name__)
+
+BULK_INSERT_CHUNK_SIZE = 5000
+SERIES_FETCH_SIZE = 50_000
+
+ARCHIVE_HORIZON = timedelta(days=365)
+
+Aggregate = Literal["sum", "mean", "max", "min"]
+
+# Coarsest first, so queries read the fewest rows that still answer them exactly
+ROLLUPS = (
+    (timedelta(days=1), AppleHealthDailyRollup),
+    (timedelta(hours=1), AppleHealthHourlyRollup),
+)
+EPOCH = datetime(1970, 1, 1)
+
+# Session.info key of the type ids stored in the session's open transaction, by cache
+PENDING_TYPE_IDS = "apple_health_pending_type_ids"
+
+
+class IngestStats(NamedTuple):
+    """Summary of a bulk ingest run."""
+
+    rows: int
+    inserted: int
+    seconds: float
+
+    @property
+    def duplicates(self) -> int:
+        """Rows that were ignored because they already existed."""
+        return self.rows - self.inserted
+
+    @property
+    def rows_per_second(self) -> float:
+        """Ingest throughput."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def parse_data_type_column(column: str) -> Optional[tuple[str, str]]:
+    """Split a Health Auto Export column such as ``"Heart Rate (count/min)"`` into name and unit.
+
+    Returns:
+        The ``(name, unit)`` pair, or None if the column has no unit.
+    """
+    match = re.search(r"\((.*?)\)", column)
+    if not match:
+        return None
+    return re.sub(r"\(.*?\)", "", column).strip(), match.group(1)
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Convert an aware datetime to naive UTC, the form the records are stored in."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def aggregate_intervals(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    how: Aggregate = "sum",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Aggregate the values falling inside each closed ``[start, end]`` interval.
+
+    Args:
+        timestamps (np.ndarray): The record timestamps, sorted ascending
+        values (np.ndarray): The record values, aligned with ``timestamps``
+        starts (np.ndarray): The interval starts
+        ends (np.ndarray): The interval ends
+        how (Aggregate): How the values of an interval are combined, one of ``"sum"``,
+            ``"mean"``, ``"max"`` or ``"min"``
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The aggregate and the number of records per interval.
+            The aggregate is NaN where an interval holds no records.
+    """
+    lo = np.searchsorted(timestamps, starts, side="left")
+    hi = np.searchsorted(timestamps, ends, side="right")
+    counts = np.maximum(hi - lo, 0)
+
+    if how in ("sum", "mean"):
+        cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+        result = np.where(counts > 0, cumsum[np.maximum(hi, lo)] - cumsum[lo], np.nan)
+        if how == "mean":
+            result = result / np.where(counts > 0, counts, 1)
+    else:
+        reduce = np.max if how == "max" else np.min
+        result = np.array(
+            [reduce(values[i:j]) if j > i else np.nan for i, j in zip(lo, hi)], dtype=float
+        )
+    return result, counts
+
 
 class AppleHealthService(BaseService):
     """Apple Health database service class."""
 
-    def __init__(self, engine: Engine) -> None:
-        """Initiate the Apple Health service with the engine."""
+    def __init__(self, engine: Engine, archive_root: Optional[Path] = None) -> None:
+        """Initiate the Apple Health service with the engine.
+
+        Args:
+            engine (Engine): The database engine
+            archive_root (Optional[Path]): The folder holding the Parquet archive of old
+                records. Defaults to ``APPLE_HEALTH_ARCHIVE_ROOT``, or
+                ``~/.fitness_tracker/apple_health_archive`` when that is not set.
+        """
         super().__init__(engine)
+        self.archive = ParquetArchive(archive_root or default_archive_root())
+        self._data_type_ids: Optional[dict[tuple[str, str], int]] = None
+        self._workout_type_ids: Optional[dict[str, int]] = None
+
+    def clear_type_cache(self) -> None:
+        """Forget the cached data type and workout type ids so they are reloaded on next use."""
+        self._data_type_ids = None
+        self._workout_type_ids = None
+
+    def get_data_type_ids(self, session: Session) -> dict[tuple[str, str], int]:
+        """Return the cached ``(name, unit)`` to data type id map, loading it on first use."""
+        if self._data_type_ids is None:
+            table = AppleHealthDataType.__table__
+            stmnt = select(table.c.id, table.c.name, table.c.unit)
+            self._data_type_ids = {(row.name, row.unit): row.id for row in session.execute(stmnt)}
+        return self._data_type_ids
+
+    def get_workout_type_ids(self, session: Session) -> dict[str, int]:
+        """Return the cached name to workout type id map, loading it on first use."""
+        if self._workout_type_ids is None:
+            table = AppleHealthWorkoutType.__table__
+            stmnt = select(table.c.id, table.c.name)
+            self._workout_type_ids = {row.name: row.id for row in session.execute(stmnt)}
+        return self._workout_type_ids
+
+    def _remember_type_ids(self, session: Session, cache: str, ids: dict[Any, int]) -> None:
+        """Add type ids to the ``cache`` attribute once ``session`` commits.
+
+        Until then they are only known to ``session``, and a rollback forgets them, so the
+        cache never holds ids of rows that were rolled back.
+        """
+        pending = session.info.get(PENDING_TYPE_IDS)
+        if pending is None:
+            pending = session.info[PENDING_TYPE_IDS] = {}
+
+            def publish(session: Session) -> None:
+                for name, stored in pending.items():
+                    known = getattr(self, name)
+                    # A cleared cache reloads everything committed on next use
+                    if known is not None:
+                        known.update(stored)
+                pending.clear()
+
+            event.listen(session, "after_commit", publish)
+            event.listen(session, "after_rollback", lambda session: pending.clear())
+        pending.setdefault(cache, {}).update(ids)
+
+    def _pending_type_ids(self, session: Session, cache: str) -> dict[Any, int]:
+        """Return the type ids for ``cache`` stored in the open transaction of ``session``."""
+        return session.info.get(PENDING_TYPE_IDS, {}).get(cache, {})
 
     def add_data_type(self, session: Session, column: str) -> Optional[AppleHealthDataType]:
         """Add a list of data types."""
-        repo = AppleHealthDataTypeRepository(session=session)
-        match = re.search(r"\((.*?)\)", column)
-        if match:
-            unit = match.group(1)
-            # Extract the column name without the unit
-            name = re.sub(r"\(.*?\)", "", column).strip()
-            entry = AppleHealthDataType(name=name, unit=unit)
-
-            repo.insert_ignore(entry)
-            session.commit()
-
-            return repo.get(name=name, unit=unit)
+        data_type_ids = self.resolve_data_type_ids(session, [column])
+        if column in data_type_ids:
+            return session.get(AppleHealthDataType, data_type_ids[column])
         return None
 
     def add_data_record(
         self, session: Session, data_type_id: int, timestamp: datetime, value: float
     ) -> None:
         """Add a data record."""
-        repo = AppleHealthDataTypeRepository(session=session)
         data_record = AppleHealthDataRecord(
             data_type_id=data_type_id, value=value, timestamp=timestamp
         )
         repo = AppleHealthDataRecordRepository(session=session)
         repo.insert_ignore(data_record)
 
-    def add_data_records(self, df: DataFrame) -> None:
-        """Add a list of data records."""
+    def resolve_data_type_ids(self, session: Session, columns: Iterable[str]) -> dict[str, int]:
+        """Insert any unknown data types and map each column to its data type id.
+
+        The new types are written in the caller's transaction and nothing is committed, so
+        they are only cached once the caller commits.
+
+        Args:
+            session (Session): The session to use
+            columns (Iterable[str]): The DataFrame columns, e.g. ``"Heart Rate (count/min)"``
+
+        Returns:
+            dict[str, int]: The data type id for every column that carries a unit.
+        """
+        parsed = {column: parse_data_type_column(column) for column in columns}
+        parsed = {column: name_unit for column, name_unit in parsed.items() if name_unit}
+        if not parsed:
+            return {}
+
+        ids = {
+            **self.get_data_type_ids(session),
+            **self._pending_type_ids(session, "_data_type_ids"),
+        }
+        missing = set(parsed.values()) - ids.keys()
+        if missing:
+            repo = AppleHealthDataTypeRepository(session=session)
+            repo.upsert_many(
+                [{"name": name, "unit": unit} for name, unit in missing], update_cols=[]
+            )
+            session.flush()
+            stored = {
+                (row.name, row.unit): row.id
+                for row in repo.get_many("name", {name for name, _ in missing})
+            }
+            self._remember_type_ids(session, "_data_type_ids", stored)
+            ids.update(stored)
+
+        return {column: ids[name_unit] for column, name_unit in parsed.items() if name_unit in ids}
+
+    def resolve_workout_type_ids(self, session: Session, names: Iterable[str]) -> dict[str, int]:
+        """Insert any unknown workout types and map each name to its workout type id.
+
+        The new types are written in the caller's transaction and nothing is committed, so
+        they are only cached once the caller commits.
+
+        Args:
+            session (Session): The session to use
+            names (Iterable[str]): The workout type names, e.g. ``"Outdoor Run"``
+
+        Returns:
+            dict[str, int]: The workout type id for every name.
+        """
+        names = {name for name in names if isinstance(name, str)}
+        ids = {
+            **self.get_workout_type_ids(session),
+            **self._pending_type_ids(session, "_workout_type_ids"),
+        }
+        missing = names - ids.keys()
+        if missing:
+            repo = AppleHealthWorkoutTypeRepository(session=session)
+            repo.upsert_many([{"name": name} for name in missing], update_cols=[])
+            session.flush()
+            stored = {row.name: row.id for row in repo.get_many("name", missing)}
+            self._remember_type_ids(session, "_workout_type_ids", stored)
+            ids.update(stored)
+
+        return {name: ids[name] for name in names if name in ids}
+
+    def add_data_records(
+        self, df: DataFrame, bulk: bool = True, chunk_size: int = BULK_INSERT_CHUNK_SIZE
+    ) -> Optional[IngestStats]:
+        """Add a list of data records.
+
+        Args:
+            df (DataFrame): Health Auto Export metrics indexed by timestamp, one column per
+                data type.
+            bulk (bool): Write the records as chunked ``INSERT OR IGNORE`` batches in a single
+                transaction. Set to False to use the original row-by-row path.
+            chunk_size (int): The number of rows per executemany batch.
+
+        Returns:
+            Optional[IngestStats]: The ingest summary for the bulk path.
+        """
+        if not bulk:
+            self._add_data_records_per_cell(df)
+            return None
+
+        start = time.perf_counter()
+        with self.get_session() as session:
+            data_type_ids = self.resolve_data_type_ids(session, df.columns)
+            rows = self._melt_data_records(df, data_type_ids)
+
+            stmnt = AppleHealthDataRecord.insert_ignore_statement()
+            inserted = 0
+            for offset in range(0, len(rows), chunk_size):
+                result = session.execute(stmnt, rows[offset : offset + chunk_size])
+                inserted += max(result.rowcount, 0)
+            if inserted:
+                self.refresh_rollups(session, self._touched_hours(rows))
+            session.commit()
+
+        stats = IngestStats(rows=len(rows), inserted=inserted, seconds=time.perf_counter() - start)
+        logger.info(
+            "Ingested %d Apple Health records (%d new, %d duplicates) at %.0f rows/s",
+            stats.rows,
+            stats.inserted,
+            stats.duplicates,
+            stats.rows_per_second,
+        )
+        return stats
+
+    @staticmethod
+    def _melt_data_records(df: DataFrame, data_type_ids: dict[str, int]) -> list[dict]:
+        """Convert a wide metrics DataFrame into ``AppleHealthDataRecord`` insert parameters."""
+        if not data_type_ids or df.empty:
+            return []
+
+        wide = df[list(data_type_ids)].rename(columns=data_type_ids)
+        wide.index = pd.to_datetime(wide.index, errors="coerce").rename("timestamp")
+        long = wide.reset_index().melt(
+            id_vars="timestamp", var_name="data_type_id", value_name="value"
+        )
+        long["value"] = pd.to_numeric(long["value"], errors="coerce")
+        long = long.dropna(subset=["timestamp", "value"])
+
+        return [
+            {"data_type_id": data_type_id, "timestamp": timestamp, "value": value}
+            for data_type_id, timestamp, value in zip(
+                long["data_type_id"].astype(int).tolist(),
+                long["timestamp"].tolist(),
+                long["value"].astype(float).tolist(),
+            )
+        ]
+
+    @staticmethod
+    def _touched_hours(rows: list[dict]) -> list[tuple[int, datetime]]:
+        """Return the distinct ``(data_type_id, hour)`` buckets covered by record rows."""
+        frame = pd.DataFrame(rows, columns=["data_type_id", "timestamp"])
+        frame["timestamp"] = frame["timestamp"].dt.floor("h")
+        return list(frame.drop_duplicates().itertuples(index=False, name=None))
+
+    def refresh_rollups(self, session: Session, hours: Iterable[tuple[int, datetime]]) -> None:
+        """Recompute the hourly and daily rollups of the given buckets from the raw records.
+
+        Each touched hour is re-aggregated with a range seek on the
+        ``(data_type_id, timestamp)`` index, and each touched day from its hourly rows, so
+        the cost follows the new records rather than the size of the table. Hours in a
+        month that has been archived are re-aggregated from the archived and SQLite records
+        together, so re-ingesting into them does not drop the archived records from the
+        rollups. The caller commits.
+
+        Args:
+            session (Session): The session to use
+            hours (Iterable[tuple[int, datetime]]): The ``(data_type_id, hour)`` buckets that
+                received records, with the hour truncated to its start in UTC
+        """
+        hours = set(hours)
+        if not hours:
+            return
+        days = {(data_type_id, hour.replace(hour=0)) for data_type_id, hour in hours}
+        archived = {
+            (data_type_id, hour)
+            for data_type_id, hour in hours
+            if self.archive.path(data_type_id, hour).exists()
+        }
+        self._refresh_archived_hours(session, archived)
+        hours -= archived
+
+        records = AppleHealthDataRecord.__table__
+        if hours:
+            session.execute(
+                self._rollup_statement(
+                    AppleHealthHourlyRollup.__table__,
+                    records.c.data_type_id,
+                    records.c.timestamp,
+                    func.count(),
+                    func.sum(records.c.value),
+                    func.min(records.c.value),
+                    func.max(records.c.value),
+                ),
+                [
+                    {"data_type_id": data_type_id, "start": hour, "end": hour + timedelta(hours=1)}
+                    for data_type_id, hour in hours
+                ],
+            )
+
+        self._refresh_daily_rollups(session, days)
+
+    def _refresh_archived_hours(
+        self,
+        session: Session,
+        hours: Iterable[tuple[int, datetime]],
+        months: Iterable[tuple[int, datetime]] = (),
+    ) -> None:
+        """Recompute hourly rollups in archived months from the archived and SQLite records.
+
+        Each month file is read once. Where a timestamp is in both, the SQLite copy wins, as
+        in ``get_series``. Only the hourly rollups are written; the caller refreshes the days.
+
+        Args:
+            session (Session): The session to use
+            hours (Iterable[tuple[int, datetime]]): The ``(data_type_id, hour)`` buckets to
+                recompute
+            months (Iterable[tuple[int, datetime]]): ``(data_type_id, month)`` partitions
+                whose every hour is recomputed
+        """
+        wanted: dict[tuple[int, datetime], Optional[set[datetime]]] = {}
+        for data_type_id, hour in hours:
+            month = hour.replace(day=1, hour=0)
+            hours_of_month = wanted.setdefault((data_type_id, month), set())
+            if hours_of_month is not None:
+                hours_of_month.add(hour)
+        for data_type_id, month in months:
+            wanted[(data_type_id, month)] = None
+        if not wanted:
+            return
+
+        records = AppleHealthDataRecord.__table__
+        rows = []
+        for (data_type_id, month), hours_of_month in wanted.items():
+            end = next_month(month)
+            live = pd.DataFrame(
+                session.execute(
+                    select(records.c.timestamp, records.c.value).where(
+                        records.c.data_type_id == data_type_id,
+                        records.c.timestamp >= month,
+                        records.c.timestamp < end,
+                    )
+                ).all(),
+                columns=["timestamp", "value"],
+            )
+            live["timestamp"] = pd.to_datetime(live["timestamp"])
+            frames = [f for f in (self.archive.read(data_type_id, month, end), live) if len(f)]
+            if not frames:
+                continue
+            frame = pd.concat(frames, ignore_index=True)
+            frame = frame.drop_duplicates("timestamp", keep="last")
+            frame = frame[frame["timestamp"] < end]
+            frame["bucket"] = pd.to_datetime(frame["timestamp"]).dt.floor("h")
+            if hours_of_month is not None:
+                frame = frame[frame["bucket"].isin(list(hours_of_month))]
+            buckets = frame.groupby("bucket")["value"].agg(["count", "sum", "min", "max"])
+            rows.extend(
+                {
+                    "data_type_id": data_type_id,
+                    "bucket": bucket.to_pydatetime(),
+                    "count": int(count),
+                    "sum": float(total),
+                    "min": float(minimum),
+                    "max": float(maximum),
+                }
+                for bucket, count, total, minimum, maximum in buckets.itertuples()
+            )
+        if rows:
+            session.execute(
+                AppleHealthHourlyRollup.__table__.insert().prefix_with("OR REPLACE"), rows
+            )
+
+    def _refresh_daily_rollups(self, session: Session, days: Iterable[tuple[int, datetime]]):
+        """Recompute the daily rollups of the given ``(data_type_id, day)`` buckets."""
+        days = set(days)
+        if not days:
+            return
+        hourly = AppleHealthHourlyRollup.__table__
+        session.execute(
+            self._rollup_statement(
+                AppleHealthDailyRollup.__table__,
+                hourly.c.data_type_id,
+                hourly.c.bucket,
+                func.sum(hourly.c.count),
+                func.sum(hourly.c.sum),
+                func.min(hourly.c.min),
+                func.max(hourly.c.max),
+            ),
+            [
+                {"data_type_id": data_type_id, "start": day, "end": day + timedelta(days=1)}
+                for data_type_id, day in days
+            ],
+        )
+
+    @staticmethod
+    def _rollup_statement(target, data_type_id, timestamp, count, total, minimum, maximum):
+        """Build an ``INSERT OR REPLACE`` of one aggregated bucket into a rollup table."""
+        bucket_data_type_id = bindparam("data_type_id", type_=Integer)
+        start = bindparam("start", type_=DateTime)
+        end = bindparam("end", type_=DateTime)
+        source = (
+            select(bucket_data_type_id, start, count, total, minimum, maximum)
+            .where(data_type_id == bucket_data_type_id, timestamp >= start, timestamp < end)
+            .group_by(data_type_id)
+        )
+        return (
+            target.insert()
+            .prefix_with("OR REPLACE")
+            .from_select(["data_type_id", "bucket", "count", "sum", "min", "max"], source)
+        )
+
+    def rebuild_rollups(self) -> None:
+        """Rebuild the hourly and daily rollups from the records in SQLite.
+
+        Rollups from before the oldest record in SQLite are kept, since their records have
+        been archived to Parquet. Archived months from that day on are re-aggregated from
+        the archive and SQLite together.
+        """
+        records = AppleHealthDataRecord.__table__
+        hourly = AppleHealthHourlyRollup.__table__
+        daily = AppleHealthDailyRollup.__table__
+        columns = ["data_type_id", "bucket", "count", "sum", "min", "max"]
+
+        with self.get_session() as session:
+            first = session.execute(select(func.min(records.c.timestamp))).scalar()
+            if first is None:
+                return
+            first_day = first.replace(hour=0, minute=0, second=0, microsecond=0)
+            session.execute(daily.delete().where(daily.c.bucket >= first_day))
+            session.execute(hourly.delete().where(hourly.c.bucket >= first_day))
+
+            hour = func.strftime("%Y-%m-%d %H:00:00.000000", records.c.timestamp)
+            session.execute(
+                hourly.insert().from_select(
+                    columns,
+                    select(
+                        records.c.data_type_id,
+                        hour,
+                        func.count(),
+                        func.sum(records.c.value),
+                        func.min(records.c.value),
+                        func.max(records.c.value),
+                    ).group_by(records.c.data_type_id, hour),
+                )
+            )
+            self._refresh_archived_hours(
+                session,
+                hours=(),
+                months=[
+                    (data_type_id, month)
+                    for data_type_id in self.archive.keys()
+                    for month in self.archive.months(data_type_id)
+                    if next_month(month) > first_day
+                ],
+            )
+
+            day = func.strftime("%Y-%m-%d 00:00:00.000000", hourly.c.bucket)
+            session.execute(
+                daily.insert().from_select(
+                    columns,
+                    select(
+                        hourly.c.data_type_id,
+                        day,
+                        func.sum(hourly.c.count),
+                        func.sum(hourly.c.sum),
+                        func.min(hourly.c.min),
+                        func.max(hourly.c.max),
+                    )
+                    .where(hourly.c.bucket >= first_day)
+                    .group_by(hourly.c.data_type_id, day),
+                )
+            )
+            session.commit()
+
+    def get_aggregates(
+        self,
+        data_type: str,
+        start: datetime,
+        end: datetime,
+        interval: timedelta = timedelta(days=1),
+    ) -> DataFrame:
+        """Aggregate a data type into ``interval`` wide buckets over ``[start, end)``.
+
+        The coarsest rollup whose buckets tile both the interval and the range is read, so a
+        year of daily heart rate is a few hundred daily rollup rows. Ranges or intervals that
+        do not line up with an hour fall back to the raw records, archived ones included.
+
+        Args:
+            data_type (str): The Apple Health data type name, e.g. ``"Heart Rate"``
+            start (datetime): The inclusive start of the range, in naive UTC
+            end (datetime): The exclusive end of the range, in naive UTC
+            interval (timedelta): The width of each returned bucket, counted from ``start``
+
+        Returns:
+            DataFrame: count, sum, min, max and mean per bucket, indexed by bucket start.
+        """
+        rollup = next(
+            (
+                model.__table__
+                for resolution, model in ROLLUPS
+                if interval % resolution == timedelta(0)
+                and (start - EPOCH) % resolution == timedelta(0)
+                and (end - EPOCH) % resolution == timedelta(0)
+            ),
+            None,
+        )
+        if rollup is not None:
+            data_type_id = select(AppleHealthDataType.id).where(
+                AppleHealthDataType.name == data_type
+            )
+            stmnt = select(
+                rollup.c.bucket, rollup.c["count"], rollup.c.sum, rollup.c.min, rollup.c.max
+            ).where(
+                rollup.c.data_type_id == data_type_id.scalar_subquery(),
+                rollup.c.bucket >= start,
+                rollup.c.bucket < end,
+            )
+            with self.get_session() as session:
+                rows = session.execute(stmnt).all()
+            frame = pd.DataFrame(rows, columns=["bucket", "count", "sum", "min", "max"])
+        else:
+            series = self.get_series(data_type, start, end)
+            series = series[series.index < end]
+            frame = pd.DataFrame(
+                {
+                    "bucket": series.index,
+                    "count": 1,
+                    "sum": series.values,
+                    "min": series.values,
+                    "max": series.values,
+                }
+            )
+
+        frame["bucket"] = pd.to_datetime(frame["bucket"])
+        frame["bucket"] = start + (frame["bucket"] - start) // interval * interval
+        frame = frame.groupby("bucket").agg(
+            {"count": "sum", "sum": "sum", "min": "min", "max": "max"}
+        )
+        frame["mean"] = frame["sum"] / frame["count"]
+        return frame
+
+    def archive_records(self, horizon: timedelta = ARCHIVE_HORIZON) -> int:
+        """Move records older than ``horizon`` from SQLite to the Parquet archive.
+
+        Whole months are archived, one file per data type and month, so the cutoff is the
+        start of the month ``horizon`` ago. Files are written before the rows are deleted,
+        and reads prefer SQLite when a timestamp is in both, so an interrupted run only
+        leaves duplicates that the next run folds in. The rollups are kept, so aggregates
+        over archived months still come from SQLite, and records later ingested into an
+        archived month are rolled up together with the archived ones. SQLite reuses the
+        freed pages, and a manual ``VACUUM`` shrinks the file.
+
+        Args:
+            horizon (timedelta): How much recent history to keep in SQLite
+
+        Returns:
+            int: The number of records archived.
+        """
+        cutoff = (datetime.now(tz=timezone.utc).replace(tzinfo=None) - horizon).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        records = AppleHealthDataRecord.__table__
+        month = func.strftime("%Y-%m", records.c.timestamp).label("month")
+
+        archived = 0
+        with self.get_session() as session:
+            partitions = session.execute(
+                select(records.c.data_type_id, month).where(records.c.timestamp < cutoff).distinct()
+            ).all()
+            for data_type_id, month_name in partitions:
+                start = datetime.strptime(month_name, "%Y-%m")
+                conditions = (
+                    records.c.data_type_id == data_type_id,
+                    records.c.timestamp >= start,
+                    records.c.timestamp < next_month(start),
+                )
+                frame = pd.DataFrame(
+                    session.execute(
+                        select(records.c.timestamp, records.c.value).where(*conditions)
+                    ).all(),
+                    columns=["timestamp", "value"],
+                )
+                frame["timestamp"] = pd.to_datetime(frame["timestamp"])
+                self.archive.write(data_type_id, start, frame)
+                session.execute(records.delete().where(*conditions))
+                archived += len(frame)
+            session.commit()
+
+        logger.info("Archived %d Apple Health records older than %s", archived, cutoff)
+        return archived
+
+    def _add_data_records_per_cell(self, df: DataFrame) -> None:
+        """Add a list of data records one cell at a time."""
         with self.get_session() as session:
+            hours = set()
             for column in df.columns:
                 data_type = self.add_data_type(session, column)
                 if data_type:
@@ -69,17 +702,18 @@ class AppleHealthService(BaseService):
                             timestamp=timestamp,
                             value=row[column],
                         )
+                        hour = pd.Timestamp(timestamp).floor("h").to_pydatetime()
+                        hours.add((data_type.id, hour))
+            session.flush()
+            self.refresh_rollups(session, hours)
             session.commit()
 
     def add_workout_type(self, session: Session, name: str) -> Optional[AppleHealthWorkoutType]:
         """Add a workout type."""
-        repo = AppleHealthWorkoutTypeRepository(session=session)
-        entry = AppleHealthWorkoutType(name=name)
-
-        repo.insert_ignore(entry)
-        session.commit()
-
-        return repo.get(name=name)
+        workout_type_ids = self.resolve_workout_type_ids(session, [name])
+        if name in workout_type_ids:
+            return session.get(AppleHealthWorkoutType, workout_type_ids[name])
+        return None
 
     def add_workout(
         self, session: Session, workout_type_id: int, start_date: datetime, end_date: datetime
@@ -93,21 +727,335 @@ class AppleHealthService(BaseService):
         session.commit()
 
     def add_workouts(self, df: DataFrame) -> None:
-        """Add a list of workouts."""
+        """Add a list of workouts in a single ``ON CONFLICT DO NOTHING`` batch and transaction."""
+        if df.empty:
+            return
         with self.get_session() as session:
-            for _, row in df.iterrows():
-                workout_type = self.add_workout_type(session, row["Type"])
-                if workout_type:
-                    start_date = datetime.strptime(row["Start"], "%Y-%m-%d %H:%M")
-                    end_date = datetime.strptime(row["End"], "%Y-%m-%d %H:%M")
-                    self.add_workout(
-                        session=session,
-                        workout_type_id=workout_type.id,
-                        start_date=start_date,
-                        end_date=end_date,
-                    )
+            workout_type_ids = self.resolve_workout_type_ids(session, df["Type"].unique())
+            rows = [
+                {
+                    "workout_type_id": workout_type_ids[name],
+                    "start_date": datetime.strptime(start, "%Y-%m-%d %H:%M"),
+                    "end_date": datetime.strptime(end, "%Y-%m-%d %H:%M"),
+                }
+                for name, start, end in zip(df["Type"], df["Start"], df["End"])
+                if name in workout_type_ids
+            ]
+            AppleHealthWorkoutRepository(session=session).upsert_many(rows, update_cols=[])
             session.commit()
 
+    def get_ingested_files(self, files: Iterable[tuple[str, str]]) -> set[tuple[str, str]]:
+        """Return the ``(path, content_hash)`` pairs that are already in the ingest ledger."""
+        files = set(files)
+        if not files:
+            return set()
+        stmnt = select(AppleHealthIngestLedger.path, AppleHealthIngestLedger.content_hash).where(
+            tuple_(AppleHealthIngestLedger.path, AppleHealthIngestLedger.content_hash).in_(files)
+        )
+        with self.get_session() as session:
+            return {(row.path, row.content_hash) for row in session.execute(stmnt)}
+
+    def get_ingest_watermark(self, path: str) -> Optional[datetime]:
+        """Return the latest timestamp ingested from any version of the file at ``path``."""
+        stmnt = select(func.max(AppleHealthIngestLedger.max_timestamp)).where(
+            AppleHealthIngestLedger.path == path
+        )
+        with self.get_session() as session:
+            return session.execute(stmnt).scalar()
+
+    def record_ingest(
+        self,
+        path: str,
+        content_hash: str,
+        row_count: int,
+        max_timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Record that a file version has been ingested.
+
+        Args:
+            path (str): The lower-cased Dropbox path of the file
+            content_hash (str): The Dropbox content hash of the ingested version
+            row_count (int): The number of CSV rows written from this version
+            max_timestamp (Optional[datetime]): The latest timestamp ingested from the file
+        """
+        entry = AppleHealthIngestLedger(
+            path=path,
+            content_hash=content_hash,
+            row_count=row_count,
+            max_timestamp=max_timestamp,
+            ingested_at=func.now(),
+        )
+        with self.get_session() as session:
+            AppleHealthIngestLedgerRepository(session=session).insert_ignore(entry)
+            session.commit()
+
+    def add_metric_mapping(self, data_type: str, metric: str) -> None:
+        """Copy records of an Apple Health data type into a tracker metric from now on.
+
+        Args:
+            data_type (str): The Apple Health data type name, e.g. ``"Body Fat Percentage"``
+            metric (str): The tracker metric name
+
+        Raises:
+            ValueError: If either the data type or the metric does not exist.
+        """
+        with self.get_session() as session:
+            data_type_id = session.execute(
+                select(AppleHealthDataType.id).where(AppleHealthDataType.name == data_type)
+            ).scalar()
+            metric_id = session.execute(select(Metric.id).where(Metric.name == metric)).scalar()
+            if data_type_id is None or metric_id is None:
+                raise ValueError(f"Unknown data type {data_type!r} or metric {metric!r}")
+
+            entry = AppleHealthMetricMapping(
+                data_type_id=data_type_id, metric_id=metric_id, last_record_id=0
+            )
+            AppleHealthMetricMappingRepository(session=session).insert_ignore(entry)
+            session.commit()
+
+    def project_metrics(self) -> int:
+        """Copy new records of every mapped data type into ``MetricItem``.
+
+        Each mapping keeps the highest record id it has already considered, so a run only
+        reads records inserted since the last one and is a couple of primary key lookups when
+        nothing is new.
+
+        Returns:
+            int: The number of metric items inserted.
+        """
+        records = AppleHealthDataRecord.__table__
+        mappings = AppleHealthMetricMapping.__table__
+        items = MetricItem.__table__
+
+        inserted = 0
+        with self.get_session() as session:
+            high = session.execute(select(func.max(records.c.id))).scalar()
+            if high is None:
+                return 0
+            stmnt = select(mappings).where(mappings.c.last_record_id < high)
+            for mapping in session.execute(stmnt).all():
+                # "+ 0" keeps SQLite off the data type index, so it walks the id range instead
+                source = select(
+                    literal(mapping.metric_id), records.c.value, records.c.timestamp, records.c.id
+                ).where(
+                    records.c.id > mapping.last_record_id,
+                    records.c.id <= high,
+                    records.c.data_type_id + 0 == mapping.data_type_id,
+                )
+                result = session.execute(
+                    items.insert()
+                    .prefix_with("OR IGNORE")
+                    .from_select(["metric_id", "value", "date", "apple_id"], source)
+                )
+                inserted += max(result.rowcount, 0)
+                session.execute(
+                    mappings.update()
+                    .where(mappings.c.id == mapping.id)
+                    .values(last_record_id=high)
+                )
+            session.commit()
+
+        logger.info("Projected %d Apple Health records into metrics", inserted)
+        return inserted
+
+    def attribute_to_workouts(
+        self,
+        session: Session,
+        data_type_id: int,
+        metric_id: int,
+        how: Aggregate = "sum",
+        min_value: Optional[float] = None,
+        decimals: Optional[int] = None,
+        backfill: bool = False,
+    ) -> int:
+        """Aggregate the records of a data type over each workout into a workout ``MetricItem``.
+
+        Only workouts that do not have an item for ``metric_id`` yet are considered. By default
+        each of them is aggregated in SQL with a range seek on the
+        ``(data_type_id, timestamp)`` index. With ``backfill`` the records spanning all pending
+        workouts are read once and joined in memory with ``aggregate_intervals`` instead, for
+        one-off backfills over a large history. The caller commits.
+
+        Args:
+            session (Session): The session to use
+            data_type_id (int): The Apple Health data type to aggregate, e.g. active energy
+            metric_id (int): The metric to record the aggregate as
+            how (Aggregate): How to combine the records within a workout
+            min_value (Optional[float]): Skip workouts whose aggregate is not above this value
+            decimals (Optional[int]): Round the aggregate to this many decimals
+            backfill (bool): Join in memory instead of seeking per workout
+
+        Returns:
+            int: The number of metric items inserted.
+        """
+        pending = (
+            select(Workout.id, Workout.start_date, Workout.end_date)
+            .where(
+                Workout.start_date.isnot(None),
+                Workout.end_date.isnot(None),
+                ~exists().where(
+                    MetricItem.workout_id == Workout.id, MetricItem.metric_id == metric_id
+                ),
+            )
+        )
+        if backfill:
+            rows = self._aggregate_workouts_in_memory(session, pending, data_type_id, how)
+        else:
+            rows = self._aggregate_workouts_in_sql(session, pending, data_type_id, how)
+
+        rows = [
+            {
+                "metric_id": metric_id,
+                "value": round(value, decimals) if decimals is not None else value,
+                "date": end_date,
+                "workout_id": workout_id,
+            }
+            for workout_id, end_date, value in rows
+            if value is not None and (min_value is None or value > min_value)
+        ]
+        if not rows:
+            return 0
+        result = session.execute(MetricItem.insert_ignore_statement(), rows)
+        return max(result.rowcount, 0)
+
+    @staticmethod
+    def _aggregate_workouts_in_sql(
+        session: Session, pending, data_type_id: int, how: Aggregate
+    ) -> list[tuple[int, datetime, Optional[float]]]:
+        """Aggregate each pending workout with a correlated index range seek."""
+        aggregate = {"sum": func.sum, "mean": func.avg, "max": func.max, "min": func.min}[how]
+        workouts = pending.subquery()
+        value = (
+            select(aggregate(AppleHealthDataRecord.value))
+            .where(
+                AppleHealthDataRecord.data_type_id == data_type_id,
+                AppleHealthDataRecord.timestamp.between(workouts.c.start_date, workouts.c.end_date),
+            )
+            .scalar_subquery()
+        )
+        stmnt = select(workouts.c.id, workouts.c.end_date, value)
+        return [tuple(row) for row in session.execute(stmnt)]
+
+    @staticmethod
+    def _aggregate_workouts_in_memory(
+        session: Session, pending, data_type_id: int, how: Aggregate
+    ) -> list[tuple[int, datetime, Optional[float]]]:
+        """Aggregate all pending workouts with one sorted read of the records."""
+        workouts = session.execute(pending).all()
+        if not workouts:
+            return []
+        starts = np.array([w.start_date for w in workouts], dtype="datetime64[us]")
+        ends = np.array([w.end_date for w in workouts], dtype="datetime64[us]")
+
+        # Read the timestamps as stored text and let NumPy parse them in one pass
+        stmnt = (
+            select(
+                type_coerce(AppleHealthDataRecord.timestamp, String).label("timestamp"),
+                AppleHealthDataRecord.value,
+            )
+            .where(
+                AppleHealthDataRecord.data_type_id == data_type_id,
+                AppleHealthDataRecord.timestamp.between(
+                    min(w.start_date for w in workouts), max(w.end_date for w in workouts)
+                ),
+            )
+            .order_by(AppleHealthDataRecord.timestamp)
+        )
+        records = session.connection().execute(stmnt).all()
+        timestamps = np.array([r.timestamp for r in records], dtype="datetime64[us]")
+        values = np.array([r.value for r in records], dtype=float)
+
+        result, counts = aggregate_intervals(timestamps, values, starts, ends, how)
+        return [
+            (w.id, w.end_date, float(value) if count else None)
+            for w, value, count in zip(workouts, result, counts)
+        ]
+
+    def get_series(
+        self,
+        name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        resample: Optional[str] = None,
+        how: Aggregate = "mean",
+    ) -> pd.Series:
+        """Load the records of a data type as a time series.
+
+        Only ``(timestamp, value)`` is selected, through a range seek on the
+        ``(data_type_id, timestamp)`` index, and the rows are copied batch by batch into
+        preallocated NumPy arrays rather than loaded as ORM objects. Records that have been
+        moved to the Parquet archive are read back and merged in. For coarse views of long
+        ranges, ``get_aggregates`` reads the rollups instead.
+
+        Args:
+            name (str): The Apple Health data type name, e.g. ``"Body Fat Percentage"``
+            start (Optional[datetime]): The inclusive start of the range, naive UTC or aware
+            end (Optional[datetime]): The inclusive end of the range, naive UTC or aware
+            resample (Optional[str]): A pandas offset alias such as ``"1h"`` to resample to
+            how (Aggregate): How to combine the records within each resampled bucket
+
+        Returns:
+            pd.Series: The values indexed by timestamp, in ascending order.
+        """
+        start, end = to_naive_utc(start), to_naive_utc(end)
+        records = AppleHealthDataRecord.__table__
+        with self.get_session() as session:
+            data_type_id = session.execute(
+                select(AppleHealthDataType.id).where(AppleHealthDataType.name == name)
+            ).scalar()
+            if data_type_id is None:
+                return pd.Series([], index=pd.DatetimeIndex([], name="timestamp"), name=name)
+
+            conditions = [records.c.data_type_id == data_type_id]
+            if start is not None:
+                conditions.append(records.c.timestamp >= start)
+            if end is not None:
+                conditions.append(records.c.timestamp <= end)
+
+            # Read the timestamps as stored text and let NumPy parse each batch in one pass
+            stmnt = (
+                select(type_coerce(records.c.timestamp, String), records.c.value)
+                .where(*conditions)
+                .order_by(records.c.timestamp)
+            )
+            connection = session.connection()
+            size = connection.execute(
+                select(func.count()).select_from(records).where(*conditions)
+            ).scalar()
+            timestamps = np.empty(size, dtype="datetime64[us]")
+            values = np.empty(size, dtype=float)
+
+            offset = 0
+            for partition in connection.execute(stmnt).partitions(SERIES_FETCH_SIZE):
+                stop = offset + len(partition)
+                if stop > size:
+                    # Records landed between the count and the select
+                    size = stop
+                    timestamps = np.resize(timestamps, size)
+                    values = np.resize(values, size)
+                batch_timestamps, batch_values = zip(*partition)
+                timestamps[offset:stop] = batch_timestamps
+                values[offset:stop] = batch_values
+                offset = stop
+
+        index = pd.DatetimeIndex(timestamps[:offset], name="timestamp")
+        series = pd.Series(values[:offset], index=index, name=name)
+
+        cold = self.archive.read(data_type_id, start, end)
+        if not cold.empty:
+            # Rows still in SQLite win over an archived copy of the same timestamp
+            archived = pd.Series(
+                cold["value"].to_numpy(dtype=float),
+                index=pd.DatetimeIndex(cold["timestamp"], name="timestamp"),
+                name=name,
+            )
+            series = pd.concat([archived, series])
+            series = series[~series.index.duplicated(keep="last")].sort_index()
+
+        if resample is not None:
+            series = series.resample(resample).agg(how)
+        return series
+
     def get_body_fat_percentage(
         self,
         start_date: Optional[datetime] = None,
@@ -118,14 +1066,8 @@ class AppleHealthService(BaseService):
             start_date = datetime(1970, 1, 1, tzinfo=timezone.utc)
         if end_date is None:
             end_date = datetime.now(tz=timezone.utc)
-        stmnt = (
-            select(AppleHealthDataRecord)
-            .join(AppleHealthDataType, AppleHealthDataRecord.data_type_id == AppleHealthDataType.id)
-            .where(
-                AppleHealthDataType.name == "Body Fat Percentage",
-                AppleHealthDataRecord.timestamp.between(start_date, end_date),
-            )
-        )
-        with self.get_session() as session:
-            result = session.execute(stmnt).scalars().all()
-            return [{"timestamp": record.timestamp, "value": record.value} for record in result]
+        series = self.get_series("Body Fat Percentage", start_date, end_date)
+        return [
+            {"timestamp": timestamp, "value": value}
+            for timestamp, value in zip(series.index.to_pydatetime(), series.tolist())
+        ]
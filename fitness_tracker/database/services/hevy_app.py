@@ -1,10 +1,17 @@
-from typing import Any
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
 
 from dateutil.parser import parse
+from sqlalchemy import event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+import logs
+
 from fitness_tracker.apis.hevy_app import HevyAppClient
+from fitness_tracker.apis.hevy_app.exceptions import HevyAppExerciseNotFoundError
+from fitness_tracker.apis.hevy_app.pagination import DEFAULT_PAGE_WORKERS
 from fitness_tracker.apis.hevy_app.types import (
     Exercise,
     ExerciseResponse,
@@ -13,6 +20,7 @@ from fitness_tracker.apis.hevy_app.types import (
     Workout,
     WorkoutResponse,
 )
+from fitness_tracker.database.loaders import get_profile
 from fitness_tracker.database.models.hevy_app import (
     HevyAppActivatedMuscle,
     HevyAppExercise,
@@ -29,6 +37,11 @@ from fitness_tracker.database.repository.hevy_app import (
 )
 from fitness_tracker.database.services.base import BaseService
 
+logger = logs.get_logger(__name__)
+
+# Session.info key of the exercise ids stored in the session's open transaction
+PENDING_EXERCISE_IDS = "hevy_app_pending_exercise_ids"
+
 
 class HevyAppService(BaseService):
     """Hevy App database service class"""
@@ -37,14 +50,168 @@ class HevyAppService(BaseService):
         """Initiate the Hevy App service with the engine"""
         super().__init__(engine)
         self.api = HevyAppClient()
+        # Exercise template ids known to be committed, filled once a session commits
+        self._exercise_ids: set[str] = set()
+        # Templates fetched from the API this run, by id
+        self._catalog: Optional[dict[str, ExerciseTemplate]] = None
 
     def add_exercises(self, exercises: ExerciseResponse):
         """Add a list of exercises"""
         with self.get_session() as session:
-            for exercise in exercises.exercise_templates:
-                self.add_exercise(session=session, exercise=exercise)
+            self.upsert_exercises(session, exercises.exercise_templates)
             session.commit()
 
+    def upsert_exercises(self, session: Session, templates: Iterable[ExerciseTemplate]) -> int:
+        """Insert or update exercise templates and their activated muscles in bulk.
+
+        The exercises are written with one ``INSERT .. ON CONFLICT DO UPDATE``, and only the
+        muscle rows not stored yet are inserted. Nothing is committed.
+
+        Args:
+            session (Session): The session to use
+            templates (Iterable[ExerciseTemplate]): The templates to store
+
+        Returns:
+            int: The number of templates written
+        """
+        templates = list({template.id: template for template in templates}.values())
+        if not templates:
+            return 0
+
+        HevyAppExerciseRepository(session=session).upsert_many(
+            [
+                {
+                    "id": template.id,
+                    "name": template.title,
+                    "type": template.type,
+                    "equipment": template.equipment,
+                    "default": not template.is_custom,
+                }
+                for template in templates
+            ],
+            conflict_cols=["id"],
+        )
+
+        muscles = {
+            (template.id, template.primary_muscle_group, "primary_muscle") for template in templates
+        } | {
+            (template.id, muscle, "secondary_muscle")
+            for template in templates
+            for muscle in template.secondary_muscle_groups
+        }
+        stored = {
+            (muscle.exercise_id, muscle.muscle, muscle.category)
+            for muscle in HevyAppActivatedMuscleRepository(session=session).get_many(
+                "exercise_id", [template.id for template in templates]
+            )
+        }
+        missing = muscles - stored
+        if missing:
+            session.execute(
+                HevyAppActivatedMuscle.__table__.insert(),
+                [
+                    {"exercise_id": exercise_id, "muscle": muscle, "category": category}
+                    for exercise_id, muscle, category in sorted(missing)
+                ],
+            )
+
+        self._remember_exercise_ids(session, [template.id for template in templates])
+        return len(templates)
+
+    def _remember_exercise_ids(self, session: Session, ids: Iterable[str]) -> None:
+        """Add exercise ids to the known ids once ``session`` commits.
+
+        Until then they are only known to ``session``, and a rollback forgets them, so the
+        cache never holds ids of rows that were rolled back.
+        """
+        pending = session.info.get(PENDING_EXERCISE_IDS)
+        if pending is None:
+            pending = session.info[PENDING_EXERCISE_IDS] = set()
+
+            def publish(session: Session) -> None:
+                self._exercise_ids.update(pending)
+                pending.clear()
+
+            event.listen(session, "after_commit", publish)
+            event.listen(session, "after_rollback", lambda session: pending.clear())
+        pending.update(ids)
+
+    def _known_exercise_ids(self, session: Session) -> set[str]:
+        """Return the exercise ids known to be stored, as seen from ``session``."""
+        return self._exercise_ids | session.info.get(PENDING_EXERCISE_IDS, set())
+
+    def sync_exercise_catalog(
+        self, session: Session, max_workers: int = DEFAULT_PAGE_WORKERS
+    ) -> dict[str, ExerciseTemplate]:
+        """Fetch every exercise template and store them in one go.
+
+        The pages are fetched concurrently at 100 templates each, the maximum the API allows,
+        and the templates are kept in memory for the rest of the run. Nothing is committed.
+
+        Args:
+            session (Session): The session to use
+            max_workers (int): The number of pages fetched at once
+
+        Returns:
+            dict[str, ExerciseTemplate]: The catalog by template id
+        """
+        templates = self.api.exercises.get_all(per_page=100, max_workers=max_workers)
+        self._catalog = {template.id: template for template in templates}
+        self.upsert_exercises(session, templates)
+        logger.info("Synced %d exercise templates", len(templates))
+        return self._catalog
+
+    def resolve_exercises(
+        self, session: Session, ids: Iterable[str], max_workers: int = DEFAULT_PAGE_WORKERS
+    ) -> None:
+        """Make sure the exercise templates with the given ids are stored.
+
+        Ids not stored yet are looked up in the catalog, which is synced the first time one
+        is missing. Only the ids the catalog does not have either are fetched one by one.
+        Nothing is committed.
+
+        Args:
+            session (Session): The session to use
+            ids (Iterable[str]): The exercise template ids, e.g. of a batch of workouts
+            max_workers (int): The number of requests made at once
+
+        Raises:
+            HevyAppExerciseNotFoundError: If the API has no template for one of the ids
+        """
+        missing = set(ids) - self._known_exercise_ids(session)
+        if not missing:
+            return
+
+        self._remember_exercise_ids(
+            session, HevyAppExerciseRepository(session=session).exists_many("id", missing)
+        )
+        missing -= self._known_exercise_ids(session)
+        if not missing:
+            return
+
+        if self._catalog is None:
+            self.sync_exercise_catalog(session, max_workers=max_workers)
+        else:
+            cataloged = [self._catalog[id] for id in missing if id in self._catalog]
+            self.upsert_exercises(session, cataloged)
+        missing -= self._known_exercise_ids(session)
+        if not missing:
+            return
+
+        logger.debug("Fetching %d exercise templates missing from the catalog", len(missing))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            templates = list(executor.map(self.api.exercises.get_template, sorted(missing)))
+        fetched = [template for template in templates if template is not None]
+        self._catalog.update((template.id, template) for template in fetched)
+        self.upsert_exercises(session, fetched)
+
+        missing -= self._known_exercise_ids(session)
+        if missing:
+            exercise_template_id = min(missing)
+            raise HevyAppExerciseNotFoundError(
+                exercise_template_id, url=f"{self.api.exercises.endpoint}/{exercise_template_id}"
+            )
+
     def add_exercise(self, session: Session, exercise: ExerciseTemplate):
         """Add a new exercise"""
         exercise_repo = HevyAppExerciseRepository(session=session)
@@ -111,18 +278,10 @@ class HevyAppService(BaseService):
         repo.insert_ignore(entry)
 
     def add_workout_item(self, session: Session, workout_id: str, exercise: Exercise):
-        """Add workout items"""
+        """Add workout items. Nothing is committed."""
         workout_item_repo = HevyAppWorkoutItemRepository(session=session)
-        exercise_repo = HevyAppExerciseRepository(session=session)
-        # check if the exercise exists
-        exercise_instance = exercise_repo.get(id=exercise.exercise_template_id)
-        if not exercise_instance:
-            # call the API to get the exercise
-            exercise_template = self.api.exercises.get_template(exercise.exercise_template_id)
-            if exercise_template:
-                self.add_exercise(session=session, exercise=exercise_template)
-            else:
-                raise Exception(f"Exercise with id {exercise.exercise_template_id} does not exist")
+        # a no-op when the exercise was resolved for the whole batch beforehand
+        self.resolve_exercises(session, [exercise.exercise_template_id])
 
         entry = HevyAppWorkoutItem(
             workout_id=workout_id,
@@ -139,7 +298,7 @@ class HevyAppService(BaseService):
             return
 
         workout_item_repo.merge(entry)
-        session.commit()
+        session.flush()
 
         # get the workout item id
         instance = workout_item_repo.get(workout_id=workout_id, index=exercise.index)
@@ -152,26 +311,97 @@ class HevyAppService(BaseService):
 
     def add_workout(self, session: Session, workout: Workout):
         """Add a new workout"""
-        workout_repo = HevyAppWorkoutRepository(session=session)
-        instance = HevyAppWorkout(
-            id=workout.id,
-            title=workout.title,
-            description=workout.description,
-            start_time=parse(workout.start_time),
-            end_time=parse(workout.end_time),
-            updated_at=parse(workout.updated_at),
-            created_at=parse(workout.created_at),
+        self.upsert_workouts(session, [workout])
+
+    def upsert_workouts(self, session: Session, workouts: list[Workout]) -> int:
+        """Insert or update workouts with their items and sets in bulk.
+
+        Each table is written with one executemany of ``INSERT .. ON CONFLICT DO UPDATE``,
+        keyed on the workout id, ``(workout_id, index)`` for the items and
+        ``(workout_item_id, index)`` for the sets. The item ids the sets need are read back
+        with a single query. Items and sets no longer in a workout are kept, as before.
+        Nothing is committed, so the whole batch is one transaction.
+
+        Args:
+            session (Session): The session to use
+            workouts (list[Workout]): The workouts to store
+
+        Returns:
+            int: The number of workouts written
+        """
+        workouts = list({workout.id: workout for workout in workouts}.values())
+        if not workouts:
+            return 0
+
+        self.resolve_exercises(
+            session,
+            [
+                exercise.exercise_template_id
+                for workout in workouts
+                for exercise in workout.exercises
+            ],
+        )
+
+        HevyAppWorkoutRepository(session=session).upsert_many(
+            [
+                {
+                    "id": workout.id,
+                    "title": workout.title,
+                    "description": workout.description,
+                    "start_time": parse(workout.start_time),
+                    "end_time": parse(workout.end_time),
+                    "updated_at": parse(workout.updated_at),
+                    "created_at": parse(workout.created_at),
+                }
+                for workout in workouts
+            ],
+            conflict_cols=["id"],
+        )
+        item_repo = HevyAppWorkoutItemRepository(session=session)
+        item_repo.upsert_many(
+            [
+                {
+                    "workout_id": workout.id,
+                    "index": exercise.index,
+                    "name": exercise.title,
+                    "notes": exercise.notes,
+                    "superset_id": exercise.superset_id,
+                    "exercise_id": exercise.exercise_template_id,
+                }
+                for workout in workouts
+                for exercise in workout.exercises
+            ],
+            conflict_cols=["workout_id", "index"],
         )
-        workout_repo.merge(instance)
 
-        for exercise in workout.exercises:
-            self.add_workout_item(session=session, workout_id=workout.id, exercise=exercise)
+        item_ids = {
+            (item.workout_id, item.index): item.id
+            for item in item_repo.get_many("workout_id", [workout.id for workout in workouts])
+        }
+        HevyAppSetsRepository(session=session).upsert_many(
+            [
+                {
+                    "workout_item_id": item_ids[(workout.id, exercise.index)],
+                    "index": hevy_set.index,
+                    "type": hevy_set.type,
+                    "weight_kg": hevy_set.weight_kg,
+                    "reps": hevy_set.reps,
+                    "distance_meters": hevy_set.distance_meters,
+                    "duration_seconds": hevy_set.duration_seconds,
+                    "rpe": hevy_set.rpe,
+                }
+                for workout in workouts
+                for exercise in workout.exercises
+                for hevy_set in exercise.sets
+            ],
+            conflict_cols=["workout_item_id", "index"],
+        )
+        return len(workouts)
 
     def add_workouts(self, workouts: WorkoutResponse):
         """Add a list of workouts."""
         with self.get_session() as session:
-            for workout in workouts.workouts:
-                self.add_workout(session=session, workout=workout)
+            self.upsert_workouts(session, workouts.workouts)
             session.commit()
 
     def get_workout(self, session: Session, **kwargs: Any):
@@ -185,6 +415,19 @@ class HevyAppService(BaseService):
         workout_repo = HevyAppWorkoutRepository(session=session)
         return workout_repo.get(**kwargs)
 
+    def get_workout_graph(self, session: Session, workout_id: str) -> Optional[HevyAppWorkout]:
+        """Get a workout with its True Coach workout and items, exercises and sets.
+
+        Loaded with the ``hevy_app_workout_graph`` profile, in a fixed number of queries.
+
+        Args:
+            session (Session): The session to use
+            workout_id (str): The Hevy workout id
+        """
+        workout_repo = HevyAppWorkoutRepository(session=session)
+        query = workout_repo.query(HevyAppWorkout, id=workout_id)
+        return query.options(*get_profile("hevy_app_workout_graph")).first()
+
     def get_placeholders(self) -> list[HevyAppExercise]:
         """Get placeholders."""
         with self.get_session() as session:
@@ -1,8 +1,9 @@
-from typing import Any
+from typing import Any, Optional
 
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
+from fitness_tracker.database.loaders import get_profile
 from fitness_tracker.database.models import TrueCoachExercise, TrueCoachWorkout
 from fitness_tracker.database.models.tracker import Exercise, Workout
 from fitness_tracker.database.repository.tracker import (
@@ -37,6 +38,17 @@ class FitnessTrackerService(BaseService):
         workout_repo = FitnessTrackerWorkoutRepository(session=session)
         return workout_repo.get(**kwargs)
 
+    def get_workout_graph(self, session: Session, true_coach_id: int) -> Optional[Workout]:
+        """Get the workout of a True Coach workout with everything needed to post it to Hevy.
+
+        Loads the True Coach workout, the items with their exercises, linked Hevy exercises,
+        True Coach items and sets with the ``tracker_workout_graph`` profile, in a fixed
+        number of queries.
+        """
+        workout_repo = FitnessTrackerWorkoutRepository(session=session)
+        query = workout_repo.query(Workout, true_coach_id=true_coach_id)
+        return query.options(*get_profile("tracker_workout_graph")).first()
+
     def add_exercise(self, session: Session, exercise: TrueCoachExercise):
         """Add a new exercise."""
         exercise_repo = FitnessTrackerExerciseRepository(session=session)
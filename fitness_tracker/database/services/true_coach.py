@@ -1,7 +1,7 @@
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
-from sqlalchemy import text
+from sqlalchemy import select, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
@@ -16,18 +16,19 @@ from fitness_tracker.apis.true_coach.types import (
     Workout,
     WorkoutItem,
 )
+from fitness_tracker.database.loaders import get_profile
 from fitness_tracker.database.models.true_coach import (
     TrueCoachAssessment,
     TrueCoachAssessmentItem,
     TrueCoachExercise,
-    TrueCoachExerciseTags,
     TrueCoachTag,
     TrueCoachWorkout,
     TrueCoachWorkoutItem,
 )
-from fitness_tracker.database.models.tracker import (
-    Sets as SetsTrackerModel,
-    WorkoutItem as WorkoutItemTrackerModel,
+from fitness_tracker.database.models.tracker import WorkoutItem as WorkoutItemTrackerModel
+from fitness_tracker.database.repository.tracker import (
+    FitnessTrackerSetsRepository,
+    FitnessTrackerWorkoutItemRepository,
 )
 from fitness_tracker.database.repository.true_coach import (
     TrueCoachAssessmentItemRepository,
@@ -85,89 +86,56 @@ class TrueCoachService(BaseService):
                 session=session, exercise_id=exercise_id, tags=tag.secondary_muscles
             )
 
-    def add_pattern_tags(self, session: Session, exercise_id: int, tags: list[str]):
-        """Add pattern tags."""
+    def _add_tags(self, session: Session, exercise_id: int, category: str, tags: list[str]):
+        """Link an exercise to the tags of a category, creating the tags that are missing."""
         tag_repo = TrueCoachTagRepository(session=session)
+        tag_ids = {tag.name: tag.id for tag in tag_repo.get_many("name", tags, category=category)}
+        missing = [tag for tag in dict.fromkeys(tags) if tag not in tag_ids]
+        if missing:
+            instances = [TrueCoachTag(name=tag, category=category) for tag in missing]
+            for instance in instances:
+                tag_repo.add(instance)
+            session.flush()
+            tag_ids.update((instance.name, instance.id) for instance in instances)
+
         exercise_tags = TrueCoachExerciseTagsRepository(session=session)
-        for tag in tags:
-            instance = tag_repo.get(name=tag, category="pattern")
-            if not instance:
-                tag_repo.add(TrueCoachTag(name=tag, category="pattern"))
-                session.commit()
-                instance = tag_repo.get(name=tag, category="pattern")
-            exercise_tags.insert_ignore(
-                TrueCoachExerciseTags(exercise_id=exercise_id, tag_id=instance.id)
-            )
+        linked = exercise_tags.exists_many("tag_id", tag_ids.values(), exercise_id=exercise_id)
+        exercise_tags.upsert_many(
+            [
+                {"exercise_id": exercise_id, "tag_id": tag_id}
+                for tag_id in tag_ids.values()
+                if tag_id not in linked
+            ],
+            update_cols=[],
+        )
+
+    def add_pattern_tags(self, session: Session, exercise_id: int, tags: list[str]):
+        """Add pattern tags."""
+        self._add_tags(session=session, exercise_id=exercise_id, category="pattern", tags=tags)
 
     def add_plane_tags(self, session: Session, exercise_id: int, tags: list[str]):
         """Add plane tags."""
-        tag_repo = TrueCoachTagRepository(session=session)
-        exercise_tags = TrueCoachExerciseTagsRepository(session=session)
-        for tag in tags:
-            instance = tag_repo.get(name=tag, category="plane")
-            if not instance:
-                tag_repo.add(TrueCoachTag(name=tag, category="plane"))
-                session.commit()
-                instance = tag_repo.get(name=tag, category="plane")
-            exercise_tags.insert_ignore(
-                TrueCoachExerciseTags(exercise_id=exercise_id, tag_id=instance.id)
-            )
+        self._add_tags(session=session, exercise_id=exercise_id, category="plane", tags=tags)
 
     def add_level_tags(self, session: Session, exercise_id: int, tags: list[str]):
         """Add level tags."""
-        tag_repo = TrueCoachTagRepository(session=session)
-        exercise_tags = TrueCoachExerciseTagsRepository(session=session)
-        for tag in tags:
-            instance = tag_repo.get(name=tag, category="level")
-            if not instance:
-                tag_repo.add(TrueCoachTag(name=tag, category="level"))
-                session.commit()
-                instance = tag_repo.get(name=tag, category="level")
-            exercise_tags.insert_ignore(
-                TrueCoachExerciseTags(exercise_id=exercise_id, tag_id=instance.id)
-            )
+        self._add_tags(session=session, exercise_id=exercise_id, category="level", tags=tags)
 
     def add_type_tags(self, session: Session, exercise_id: int, tags: list[str]):
         """Get the tags for a specific type."""
-        exercise_tags = TrueCoachExerciseTagsRepository(session=session)
-        tag_repo = TrueCoachTagRepository(session=session)
-        for tag in tags:
-            instance = tag_repo.get(name=tag, category="type")
-            if not instance:
-                tag_repo.add(TrueCoachTag(name=tag, category="type"))
-                session.commit()
-                instance = tag_repo.get(name=tag, category="type")
-            exercise_tags.insert_ignore(
-                TrueCoachExerciseTags(exercise_id=exercise_id, tag_id=instance.id)
-            )
+        self._add_tags(session=session, exercise_id=exercise_id, category="type", tags=tags)
 
     def add_primary_muscle_tags(self, session: Session, exercise_id: int, tags: list[str]):
         """Get the tags for a specific primary muscle."""
-        exercise_tags = TrueCoachExerciseTagsRepository(session=session)
-        tag_repo = TrueCoachTagRepository(session=session)
-        for tag in tags:
-            instance = tag_repo.get(name=tag, category="primary_muscle")
-            if not instance:
-                tag_repo.add(TrueCoachTag(name=tag, category="primary_muscle"))
-                session.commit()
-                instance = tag_repo.get(name=tag, category="primary_muscle")
-            exercise_tags.insert_ignore(
-                TrueCoachExerciseTags(exercise_id=exercise_id, tag_id=instance.id)
-            )
+        self._add_tags(
+            session=session, exercise_id=exercise_id, category="primary_muscle", tags=tags
+        )
 
     def add_secondary_muscle_tags(self, session: Session, exercise_id: int, tags: list[str]):
         """Get the tags for a specific secondary muscle."""
-        exercise_tags = TrueCoachExerciseTagsRepository(session=session)
-        tag_repo = TrueCoachTagRepository(session=session)
-        for tag in tags:
-            instance = tag_repo.get(name=tag, category="secondary_muscle")
-            if not instance:
-                tag_repo.add(TrueCoachTag(name=tag, category="secondary_muscle"))
-                session.commit()
-                instance = tag_repo.get(name=tag, category="secondary_muscle")
-            exercise_tags.insert_ignore(
-                TrueCoachExerciseTags(exercise_id=exercise_id, tag_id=instance.id)
-            )
+        self._add_tags(
+            session=session, exercise_id=exercise_id, category="secondary_muscle", tags=tags
+        )
 
     def add_workout_item(self, session: Session, workout_item: WorkoutItem):
         """Add a new workout item."""
@@ -229,37 +197,21 @@ class TrueCoachService(BaseService):
         # If workout_items is empty, default to a list with a dummy value:
         items_to_keep = workout_items if workout_items else [-1]
 
-        # Build a subquery to fetch TrueCoachWorkoutItem IDs to delete.
-        tc_subq = (
-            session.query(TrueCoachWorkoutItem.id)
-            .filter(
-                TrueCoachWorkoutItem.workout_id == workout_id,
-                ~TrueCoachWorkoutItem.id.in_(items_to_keep),
-            )
-            .subquery()
+        # Select the TrueCoachWorkoutItem IDs to delete.
+        tc_ids = select(TrueCoachWorkoutItem.id).where(
+            TrueCoachWorkoutItem.workout_id == workout_id,
+            ~TrueCoachWorkoutItem.id.in_(items_to_keep),
         )
 
-        # Build a subquery to fetch WorkoutItem IDs associated with the TrueCoachWorkoutItem IDs
-        wi_subq = (
-            session.query(WorkoutItemTrackerModel.id)
-            .filter(WorkoutItemTrackerModel.true_coach_id.in_(tc_subq))
-            .subquery()
+        # Select the WorkoutItem IDs associated with the TrueCoachWorkoutItem IDs
+        wi_ids = select(WorkoutItemTrackerModel.id).where(
+            WorkoutItemTrackerModel.true_coach_id.in_(tc_ids)
         )
 
-        # Delete SETS records where workout_item_id is in the list of WorkoutItem IDs.
-        session.query(SetsTrackerModel).filter(
-            SetsTrackerModel.workout_item_id.in_(wi_subq)
-        ).delete(synchronize_session=False)
-
-        # Delete WorkoutItem records.
-        session.query(WorkoutItemTrackerModel).filter(
-            WorkoutItemTrackerModel.id.in_(wi_subq)
-        ).delete(synchronize_session=False)
-
-        # Delete TrueCoachWorkoutItem records.
-        session.query(TrueCoachWorkoutItem).filter(TrueCoachWorkoutItem.id.in_(tc_subq)).delete(
-            synchronize_session=False
-        )
+        # Delete the Sets, then the WorkoutItem and TrueCoachWorkoutItem records.
+        FitnessTrackerSetsRepository(session=session).delete_where(workout_item_id=wi_ids)
+        FitnessTrackerWorkoutItemRepository(session=session).delete_where(id=wi_ids)
+        TrueCoachWorkoutItemRepository(session=session).delete_where(id=tc_ids)
 
         # Commit the transaction.
         session.commit()
@@ -269,6 +221,15 @@ class TrueCoachService(BaseService):
         workout_repo = TrueCoachWorkoutRepository(session=session)
         return workout_repo.get(**kwargs)
 
+    def get_workout_graph(self, session: Session, true_coach_id: int) -> Optional[TrueCoachWorkout]:
+        """Get a workout with its items, their exercises and the linked Hevy exercises.
+
+        Loaded with the ``true_coach_workout_graph`` profile, in a fixed number of queries.
+        """
+        workout_repo = TrueCoachWorkoutRepository(session=session)
+        query = workout_repo.query(TrueCoachWorkout, id=true_coach_id)
+        return query.options(*get_profile("true_coach_workout_graph")).first()
+
     def get_workout_item(self, session: Session, **kwargs: Any):
         """Get a workout item by kwargs"""
         workout_item_repo = TrueCoachWorkoutItemRepository(session=session)
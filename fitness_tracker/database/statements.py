@@ -0,0 +1,72 @@
+import re
+from collections.abc import Iterator
+from functools import cache
+from importlib.resources import files
+from importlib.resources.abc import Traversable
+
+from sqlalchemy.sql import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+
+import logs
+
+logger = logs.get_logger(__name__)
+
+SQL_PACKAGE = "fitness_tracker.database"
+SQL_FOLDER = "SQL"
+
+# The named parameters text() recognises, e.g. ":true_coach_id" but not "::TEXT"
+_BIND_PARAM = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+
+
+def _walk(folder: Traversable, prefix: str = "") -> Iterator[tuple[str, str]]:
+    """Yield ``(name, sql)`` for every ``.sql`` file under ``folder``."""
+    for entry in sorted(folder.iterdir(), key=lambda entry: entry.name):
+        if entry.is_dir():
+            yield from _walk(entry, f"{prefix}{entry.name}/")
+        elif entry.name.endswith(".sql"):
+            yield prefix + entry.name[: -len(".sql")], entry.read_text(encoding="utf-8")
+
+
+def compile_statement(sql: str) -> TextClause:
+    """Wrap SQL in a ``TextClause`` with its bind parameters declared."""
+    names = dict.fromkeys(_BIND_PARAM.findall(_strip_comments(sql)))
+    return text(sql).bindparams(*(bindparam(name) for name in names))
+
+
+def _strip_comments(sql: str) -> str:
+    """Drop ``--`` comments, so parameters in commented-out SQL are not declared."""
+    return re.sub(r"--[^\n]*", "", sql)
+
+
+@cache
+def _statements() -> dict[str, TextClause]:
+    """Load and compile every SQL file of the package, once per process."""
+    statements = {
+        name: compile_statement(sql) for name, sql in _walk(files(SQL_PACKAGE) / SQL_FOLDER)
+    }
+    logger.debug("Loaded %d SQL statements", len(statements))
+    return statements
+
+
+def get_statement(name: str) -> TextClause:
+    """Return the statement of an SQL file by its path under ``database/SQL``.
+
+    The files are read from the installed package rather than the working directory, and
+    only on the first call.
+
+    Args:
+        name (str): The file path without the ``.sql`` suffix, e.g.
+            ``"hevy/tracker/sets/upsert"``
+
+    Raises:
+        KeyError: If there is no such file
+    """
+    try:
+        return _statements()[name]
+    except KeyError:
+        raise KeyError(f"No SQL statement named {name!r}") from None
+
+
+def statement_names() -> list[str]:
+    """Return the names of every SQL statement."""
+    return sorted(_statements())
@@ -1,72 +1,178 @@
 import json
+from collections.abc import Iterator
 from datetime import datetime
-from io import StringIO
 from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import IO, Optional, Union
 
 import pandas as pd
 from dropbox import Dropbox
-from dropbox.files import FileMetadata
+from dropbox.exceptions import ApiError
+from dropbox.files import FileMetadata, ListFolderContinueError, ListFolderResult
 from fitness_tracker.database import Database
 
+import logs
+
+from . import utils
+
+logger = logs.get_logger(__name__)
+
+SYNC_STATE_FILE = "apple_health_sync_datetime.json"
+METRICS_FOLDER = "/apps/health auto export/health auto export/Health App Data"
+WORKOUTS_FOLDER = "/apps/health auto export/health auto export/Apple Workouts"
+
+CSV_CHUNK_SIZE = 10_000
+DOWNLOAD_SPOOL_SIZE = 8 * 1024 * 1024
+
 
 class AppleHealthToFitnessTrackerSyncronizer:
     """Syncronizer class."""
 
-    def __init__(self, database: Database, source: Dropbox) -> None:
-        """Initiate the syncronizer with the clients."""
+    def __init__(self, database: Database, source: Dropbox, max_downloads: int = 4) -> None:
+        """Initiate the syncronizer with the clients.
+
+        Args:
+            database (Database): The database to write to
+            source (Dropbox): The Dropbox client to download the exports with
+            max_downloads (int): The number of files downloaded concurrently
+        """
         self._database = database
         self._source = source
+        self._max_downloads = max_downloads
+
+    def load_sync_state(self) -> dict[str, Union[str, datetime]]:
+        """Load the Dropbox list_folder cursor saved for each folder.
 
-    def load_previous_sync_datetimes(self):
-        """Load the previous sync datetime from the database."""
-        file = Path("apple_health_sync_datetime.json")
+        Older state files hold the wall-clock time of the last sync instead of a cursor.
+        Those values are returned as datetimes, and the next sync lists the folder in full
+        once, keeping only files modified after that time.
+        """
+        file = Path(SYNC_STATE_FILE)
         if file.exists():
             with file.open("r") as f:
-                sync_datetimes = json.load(f)
-                # convert strings back to datetime objects
-                return {k: datetime.fromisoformat(v) for k, v in sync_datetimes.items()}
+                state: dict[str, str] = json.load(f)
+            return {k: self._parse_sync_position(v) for k, v in state.items()}
         return {"Workout": datetime(2025, 2, 5, 14, 44), "Metrics": datetime(2025, 2, 10, 13, 59)}
 
-    def save_sync_datetimes(self, sync_datetimes: dict[str, datetime]):
-        """Save the sync datetimes to the database."""
-        with open("apple_health_sync_datetime.json", "w") as f:
-            # convert datetime objects to strings before saving
-            json.dump({k: v.isoformat() for k, v in sync_datetimes.items()}, f)
+    @staticmethod
+    def _parse_sync_position(value: str) -> Union[str, datetime]:
+        """Return a legacy sync timestamp as a datetime and anything else as a cursor."""
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+
+    def save_sync_state(self, state: dict[str, Union[str, datetime]]) -> None:
+        """Save the Dropbox list_folder cursor for each folder."""
+        with open(SYNC_STATE_FILE, "w") as f:
+            json.dump(
+                {k: v.isoformat() if isinstance(v, datetime) else v for k, v in state.items()}, f
+            )
+
+    def get_new_files(
+        self, folder_path: str, position: Union[str, datetime]
+    ) -> tuple[list[FileMetadata], str]:
+        """List the CSV files added or changed in a folder since the last sync.
+
+        With a cursor, only the changes since that cursor are fetched via
+        ``files_list_folder_continue``. If Dropbox has reset the cursor, or there is no cursor
+        yet, the folder is listed in full.
 
-    def get_new_files_since(self, folder_path: str, target_datetime: datetime):
-        # List files in the folder (recursive=True lists subfolders too)
-        response = self._source.files_list_folder(folder_path, recursive=True)
+        Args:
+            folder_path (str): The Dropbox folder to list (recursively)
+            position (Union[str, datetime]): The saved cursor, or a legacy sync timestamp
 
-        new_files = []
+        Returns:
+            tuple[list[FileMetadata], str]: The new files and the cursor to resume from.
+        """
+        since: Optional[datetime] = None
+        if isinstance(position, datetime):
+            since = position
+            response = self._source.files_list_folder(folder_path, recursive=True)
+        else:
+            try:
+                response = self._source.files_list_folder_continue(position)
+            except ApiError as e:
+                if not (isinstance(e.error, ListFolderContinueError) and e.error.is_reset()):
+                    raise
+                logger.warning("Dropbox cursor for %s was reset, listing it in full", folder_path)
+                response = self._source.files_list_folder(folder_path, recursive=True)
 
+        new_files: dict[str, FileMetadata] = {}
         while True:
-            # Check each entry in the folder listing
-            for entry in response.entries:
-                if (
-                    isinstance(entry, FileMetadata)
-                    and entry.name.endswith(".csv")
-                    and entry.server_modified > target_datetime
-                ):
-                    new_files.append(entry)
-
-            # Check if there's more data to fetch
+            new_files.update(
+                (entry.path_lower, entry)
+                for entry in self._new_csv_entries(response, since)
+            )
             if not response.has_more:
                 break
-
-            # Continue fetching if needed
             response = self._source.files_list_folder_continue(response.cursor)
 
-        return new_files
+        return list(new_files.values()), response.cursor
+
+    @staticmethod
+    def _new_csv_entries(
+        response: ListFolderResult, since: Optional[datetime] = None
+    ) -> list[FileMetadata]:
+        """Filter a list_folder page down to CSV files, optionally modified after ``since``."""
+        return [
+            entry
+            for entry in response.entries
+            if isinstance(entry, FileMetadata)
+            and entry.name.endswith(".csv")
+            and (since is None or entry.server_modified > since)
+        ]
+
+    def download_from_dropbox(self, file_metadata: FileMetadata) -> IO[bytes]:
+        """Download a file from Dropbox into a spooled temporary file.
+
+        Small files stay in memory and larger ones roll over to disk, so files can be
+        downloaded ahead of the database writer without the downloads piling up in memory.
+        This does not touch the database and is safe to call from worker threads.
+
+        Args:
+            file_metadata (FileMetadata): The Dropbox file to download
 
-    def load_csv_from_dropbox(self, file_metadata: FileMetadata):
-        # Download the file
+        Returns:
+            IO[bytes]: The downloaded file, rewound to the start. The caller closes it.
+        """
+        buffer = SpooledTemporaryFile(max_size=DOWNLOAD_SPOOL_SIZE)
         _, res = self._source.files_download(file_metadata.path_lower)
-        # Read content using pandas
-        csv_content = res.content.decode("utf-8")  # Decode bytes to string
-        df = pd.read_csv(StringIO(csv_content), index_col=False)
+        with res:
+            for block in res.iter_content(chunk_size=64 * 1024):
+                buffer.write(block)
+        buffer.seek(0)
+        return buffer
 
-        # Convert 'Date' column from UK time to UTC if present
+    def iter_csv_chunks(
+        self, buffer: IO[bytes], chunksize: int = CSV_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Parse a CSV file object in chunks, converting each 'Date' column to naive UTC."""
+        for chunk in pd.read_csv(buffer, index_col=False, chunksize=chunksize):
+            yield self.convert_dates_to_utc(chunk)
 
+    def iter_downloads(self, files: list[FileMetadata]) -> Iterator[IO[bytes]]:
+        """Download files on a bounded thread pool while the caller processes earlier ones.
+
+        Args:
+            files (list[FileMetadata]): The Dropbox files to download
+
+        Downloads that finished but were never yielded, because the caller stopped early,
+        are closed.
+
+        Yields:
+            IO[bytes]: Each downloaded file, in the order of ``files``.
+        """
+        yield from utils.prefetch(
+            self.download_from_dropbox,
+            files,
+            self._max_downloads,
+            discard=lambda buffer: buffer.close(),
+        )
+
+    @staticmethod
+    def convert_dates_to_utc(df: pd.DataFrame) -> pd.DataFrame:
+        """Convert the 'Date' column from UK time to naive UTC if present."""
         if "Date" in df.columns:
             # Parse as Europe/London, then convert to UTC
             df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
@@ -80,51 +186,92 @@ class AppleHealthToFitnessTrackerSyncronizer:
 
         return df
 
-    def sync_metrics(self):
-        # Load the previous sync datetime
-        sync_datetimes = self.load_previous_sync_datetimes()
-        target_datetime = sync_datetimes["Metrics"]
+    def skip_ingested_files(self, files: list[FileMetadata]) -> list[FileMetadata]:
+        """Drop the files whose current content has already been ingested.
 
-        # Get new files since the target datetime
-        new_files = self.get_new_files_since(
-            "/apps/health auto export/health auto export/Health App Data", target_datetime
+        Dropbox reports a file as changed whenever it is rewritten, even if the bytes are
+        identical, so the ingest ledger is checked by ``(path, content_hash)`` before anything
+        is downloaded.
+        """
+        ingested = self._database.apple_health.get_ingested_files(
+            (f.path_lower, f.content_hash) for f in files if f.content_hash
         )
+        new_files = [f for f in files if (f.path_lower, f.content_hash) not in ingested]
+        if len(new_files) < len(files):
+            logger.info("Skipping %d unchanged files", len(files) - len(new_files))
+        return new_files
+
+    def ingest_metrics_file(self, file_metadata: FileMetadata, buffer: IO[bytes]) -> None:
+        """Write a downloaded metrics export and record it in the ingest ledger.
+
+        Health Auto Export rewrites its files in place as the day goes on. Only the rows from
+        the latest timestamp already ingested from the file onwards are written, so a rewrite
+        costs the new rows rather than the whole file. The last minute is written again,
+        since it may have gained values after the previous version was exported; the values
+        already stored are ignored by the ``INSERT OR IGNORE``.
 
-        # Load and process each new file
-        for file_metadata in new_files:
-            df = self.load_csv_from_dropbox(file_metadata)
-            if "Date" not in df.columns:
+        Args:
+            file_metadata (FileMetadata): The Dropbox file that was downloaded
+            buffer (IO[bytes]): The downloaded file
+        """
+        path = file_metadata.path_lower
+        watermark = self._database.apple_health.get_ingest_watermark(path)
+        max_timestamp = watermark
+        row_count = 0
+        for chunk in self.iter_csv_chunks(buffer):
+            if "Date" not in chunk.columns:
+                break
+            if watermark is not None:
+                chunk = chunk.loc[chunk["Date"] >= watermark]
+            if chunk.empty:
                 continue
-            df = df.set_index("Date")
-            self._database.apple_health.add_data_records(df)
+            self._database.apple_health.add_data_records(chunk.set_index("Date"))
+            row_count += len(chunk)
+            chunk_max = chunk["Date"].max()
+            if pd.notna(chunk_max) and (max_timestamp is None or chunk_max > max_timestamp):
+                max_timestamp = chunk_max.to_pydatetime()
+
+        if file_metadata.content_hash:
+            self._database.apple_health.record_ingest(
+                path, file_metadata.content_hash, row_count, max_timestamp
+            )
+
+    def sync_metrics(self):
+        # Get the files changed since the saved cursor
+        state = self.load_sync_state()
+        new_files, cursor = self.get_new_files(METRICS_FOLDER, state["Metrics"])
+        new_files = self.skip_ingested_files(new_files)
+
+        # Download ahead on the pool, writing each file one chunk at a time on this thread
+        for file_metadata, buffer in zip(new_files, self.iter_downloads(new_files)):
+            with buffer:
+                self.ingest_metrics_file(file_metadata, buffer)
 
-        # Update the sync datetime
-        sync_datetimes["Metrics"] = datetime.now()
-        self.save_sync_datetimes(sync_datetimes)
+        # Only move the cursor on once every file has been written
+        state["Metrics"] = cursor
+        self.save_sync_state(state)
         self.insert_metrics()
 
     def sync_workouts(self):
-        # Load the previous sync datetime
-        sync_datetimes = self.load_previous_sync_datetimes()
-        target_datetime = sync_datetimes["Workout"]
-
-        # Get new files since the target datetime
-        new_files = self.get_new_files_since(
-            "/apps/health auto export/health auto export/Apple Workouts", target_datetime
-        )
+        # Get the files changed since the saved cursor
+        state = self.load_sync_state()
+        new_files, cursor = self.get_new_files(WORKOUTS_FOLDER, state["Workout"])
+        new_files = self.skip_ingested_files(new_files)
 
-        # Load and process each new file
-        for file_metadata in new_files:
-            df = self.load_csv_from_dropbox(file_metadata)
+        # Download ahead on the pool, writing each file on this thread
+        for file_metadata, buffer in zip(new_files, self.iter_downloads(new_files)):
+            with buffer:
+                df = pd.concat(self.iter_csv_chunks(buffer), ignore_index=True)
             self._database.apple_health.add_workouts(df)
+            if file_metadata.content_hash:
+                self._database.apple_health.record_ingest(
+                    file_metadata.path_lower, file_metadata.content_hash, len(df)
+                )
 
-        # Update the sync datetime
-        sync_datetimes["Workout"] = datetime.now()
-        self.save_sync_datetimes(sync_datetimes)
+        # Only move the cursor on once every file has been written
+        state["Workout"] = cursor
+        self.save_sync_state(state)
 
     def insert_metrics(self):
-        """Insert the metrics into the database."""
-        with self._database.apple_health.get_session() as session:
-            query = Path("fitness_tracker/database/SQL/apple_health/metrics/insert.sql").read_text()
-            session.execute(query)
-            session.commit()
+        """Copy the new records of every mapped Apple Health data type into the metrics."""
+        self._database.apple_health.project_metrics()
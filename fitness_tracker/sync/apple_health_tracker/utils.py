@@ -0,0 +1,52 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _discard_result(future: Future[R], discard: Callable[[R], None]) -> None:
+    """Hand the result of a finished future to ``discard``, if it produced one."""
+    if not future.cancelled() and future.exception() is None:
+        discard(future.result())
+
+
+def prefetch(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    max_workers: int = 4,
+    discard: Optional[Callable[[R], None]] = None,
+) -> Iterator[R]:
+    """Apply ``func`` to ``items`` on a bounded thread pool, yielding results in input order.
+
+    While the caller is busy with one result, up to ``max_workers`` further calls run in the
+    background. No more than ``max_workers`` results are ever in flight or waiting to be
+    consumed, so a long list of items does not pile up in memory.
+
+    If the caller stops early, calls that have not started are cancelled and the results of
+    the others are passed to ``discard`` once they finish, e.g. to close them.
+
+    Args:
+        func (Callable[[T], R]): The function to run in the worker threads
+        items (Iterable[T]): The items to process
+        max_workers (int): The maximum number of concurrent calls
+        discard (Optional[Callable[[R], None]]): Releases a result that was never yielded
+
+    Yields:
+        R: The result of ``func`` for each item, in the order of ``items``.
+    """
+    pending: deque[Future[R]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                if not future.cancel() and discard is not None:
+                    future.add_done_callback(lambda done: _discard_result(done, discard))
@@ -1,20 +1,35 @@
 from datetime import datetime
-from pathlib import Path
 from typing import Optional
 
 from fitness_tracker.apis import HevyAppClient
 from fitness_tracker.apis.hevy_app.types import DeletedWorkout, UpdatedWorkout, Workout
 from fitness_tracker.apis.hevy_app.types import Exercise as HevyAppExercise
 from fitness_tracker.database import Database
+from fitness_tracker.database.statements import get_statement
 from fitness_tracker.database.models import TrueCoachExercise
 from fitness_tracker.llm.fitness_llm import FitnessLLM
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import text
 from dateutil.parser import parse
 
+import logs
+
+CALORIES_DATA_TYPE_ID = 1
+CALORIES_METRIC_ID = 2
+CALORIES_MIN_VALUE = 200
+
+# Events applied per transaction by sync_events
+DEFAULT_BATCH_SIZE = 50
+
+logger = logs.get_logger(__name__)
+
 
 class HevyToFitnessTrackerSyncronizer:
-    """Syncronizer class"""
+    """Syncronizer class
+
+    The per-event steps only flush, they never commit. ``sync_events`` owns the
+    transaction, see its docstring for the crash-consistency guarantees.
+    """
 
     def __init__(self, database: Database, source: HevyAppClient, llm: FitnessLLM) -> None:
         """Initiate the syncronizer with the clients."""
@@ -25,6 +40,8 @@ class HevyToFitnessTrackerSyncronizer:
     def update_workout(self, session: Session, workout: UpdatedWorkout) -> None:
         """Update the workout with the given id.
 
+        Nothing is committed, the caller decides when the event becomes durable.
+
         Args:
             workout_id (int): The workout id to syncronize
 
@@ -32,12 +49,11 @@ class HevyToFitnessTrackerSyncronizer:
         self._database.hevy_app.add_workout(session, workout.workout)
         true_coach_id = self.link_workout(session, workout.workout.id, workout.workout)
         print(f"True Coach ID for workout {workout.workout.id} is {true_coach_id}")
-        session.commit()
+        session.flush()
         if true_coach_id:
             self.link_workout_items(session, true_coach_id)
             self.update_exercise(session, true_coach_id)
-            self.update_sets(session, true_coach_id)
-            self.insert_sets(session, true_coach_id)
+            self.upsert_sets(session, true_coach_id)
             self.update_exercises(session, true_coach_id)
         else:
             print(f"Could not find True Coach ID for workout {workout.workout.id}")
@@ -90,13 +106,9 @@ class HevyToFitnessTrackerSyncronizer:
             hevy_exercises (list[HevyAppExercise]): The Hevy App exercises
 
         """
-        insert_script = text(
-            Path("fitness_tracker/database/SQL/hevy/tracker/workout_items/update.sql").read_text(
-                encoding="utf-8"
-            )
-        )
+        insert_script = get_statement("hevy/tracker/workout_items/update")
         session.execute(insert_script, {"true_coach_id": true_coach_id})
-        session.commit()
+        session.flush()
 
         stmnt = text("""
                     SELECT tcwi.id as true_coach_id, tcwi.name, tcwi.position as 'order'
@@ -137,7 +149,7 @@ class HevyToFitnessTrackerSyncronizer:
                         WHERE true_coach_id = :true_coach_id
                         """)
             session.execute(stmnt, link.model_dump())
-        session.commit()
+        session.flush()
 
     def update_exercise(self, session: Session, true_coach_id: int) -> None:
         """Update the exercise with the given id.
@@ -173,39 +185,19 @@ class HevyToFitnessTrackerSyncronizer:
                     );
                         """)
         session.execute(stmnt, {"true_coach_id": true_coach_id})  # type: ignore
-        session.commit()
-
-    def update_sets(self, session: Session, true_coach_id: int) -> None:
-        """Update the sets with the given id.
-
-        Args:
-            session (Session): The session to use
-            true_coach_id (int): The True Coach exercise id to syncronize
-
-        """
-        stmnt = text(
-            Path("fitness_tracker/database/SQL/hevy/tracker/sets/update.sql").read_text(
-                encoding="utf-8"
-            )
-        )
-        session.execute(stmnt, {"true_coach_id": true_coach_id})
-        session.commit()
+        session.flush()
 
-    def insert_sets(self, session: Session, true_coach_id: int) -> None:
-        """Insert the sets with the given id.
+    def upsert_sets(self, session: Session, true_coach_id: int) -> None:
+        """Insert the Hevy sets of the workout, or update the sets already copied.
 
         Args:
             session (Session): The session to use
             true_coach_id (int): The True Coach exercise id to syncronize
 
         """
-        stmnt = text(
-            Path("fitness_tracker/database/SQL/hevy/tracker/sets/insert.sql").read_text(
-                encoding="utf-8"
-            )
-        )
+        stmnt = get_statement("hevy/tracker/sets/upsert")
         session.execute(stmnt, {"true_coach_id": true_coach_id})
-        session.commit()
+        session.flush()
 
     def update_exercises(self, session: Session, true_coach_id: int) -> None:
         """Update the exercises.
@@ -215,13 +207,9 @@ class HevyToFitnessTrackerSyncronizer:
             true_coach_id (int): The True Coach workout id
 
         """
-        stmnt = text(
-            Path("fitness_tracker/database/SQL/hevy/tracker/exercises/update.sql").read_text(
-                encoding="utf-8"
-            )
-        )
+        stmnt = get_statement("hevy/tracker/exercises/update")
         session.execute(stmnt, {"true_coach_id": true_coach_id})
-        session.commit()
+        session.flush()
 
 
     def link_exercises(
@@ -288,19 +276,61 @@ class HevyToFitnessTrackerSyncronizer:
             instance.hevy_app_id = hevy_exercise.exercise_template_id
             session.merge(instance)
 
-    def sync_events(self, events: list[UpdatedWorkout | DeletedWorkout]) -> None:
+    def sync_events(
+        self,
+        events: list[UpdatedWorkout | DeletedWorkout],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
         """Syncronize the events
 
+        Each event runs in its own savepoint, and the session commits once every
+        ``batch_size`` events instead of after every step.
+
+        Crash consistency:
+            * An event is applied whole or not at all: a workout is never left stored but
+              only partly linked, and a failing event is rolled back on its own.
+            * On an error the events before the failing one are committed before the error
+              is raised, so a rerun resumes with the failing event.
+            * On a crash, up to ``batch_size`` - 1 events that were applied but not yet
+              committed are lost. They are replayed by the next sync, since every step is an
+              upsert or skips what is already linked.
+            * The write lock is held for the whole batch, including the LLM calls that link
+              the workout items. Lower ``batch_size`` to release it more often; 1 commits
+              every event.
+
         Args:
             events (list[UpdatedWorkout | DeletedWorkout]): The events to syncronize
+            batch_size (int): The number of events per commit
 
         """
         with self._database.hevy_app.get_session() as session:
-            for event in events:
-                if isinstance(event, UpdatedWorkout):
-                    self.update_workout(session, event)
-                elif isinstance(event, DeletedWorkout):  # type: ignore
-                    self.delete_workout(session, event)
+            # Store every exercise template of the batch up front, from the catalog, rather
+            # than fetching them one by one in the middle of the workouts
+            self._database.hevy_app.resolve_exercises(
+                session,
+                [
+                    exercise.exercise_template_id
+                    for event in events
+                    if isinstance(event, UpdatedWorkout)
+                    for exercise in event.workout.exercises
+                ],
+            )
+            session.commit()
+
+            for position, event in enumerate(events, start=1):
+                try:
+                    with session.begin_nested():
+                        if isinstance(event, UpdatedWorkout):
+                            self.update_workout(session, event)
+                        elif isinstance(event, DeletedWorkout):  # type: ignore
+                            self.delete_workout(session, event)
+                except Exception:
+                    # The savepoint already undid the failed event, keep the ones before it
+                    session.commit()
+                    logger.exception("Failed to sync event %d of %d", position, len(events))
+                    raise
+                if position % batch_size == 0:
+                    session.commit()
 
             session.commit()
 
@@ -311,32 +341,25 @@ class HevyToFitnessTrackerSyncronizer:
             since (datetime): The datetime to syncronize
 
         """
-        res = self._source.workouts.get_workout_events(since=since)
-        if res:
-            if res.page_count > 1:
-                for page in range(2, res.page_count + 1):
-                    new_res = self._source.workouts.get_workout_events(since=since, page=page)
-                    if new_res:
-                        for event in new_res.events:
-                            res.events.append(event)
+        # Pages 2..N are fetched concurrently and come back in page order, newest first
+        events = self._source.workouts.get_all_workout_events(since=since)
 
-            self.sync_events(res.events[::-1])
+        self.sync_events(events[::-1])
 
-            return res.events[::-1]
-        return []
+        return events[::-1]
 
     def update_metrics(self, session: Session) -> None:
-        """Update the metrics with the given id.
+        """Attribute the Apple Health calories burned to the workouts that have none yet.
 
         Args:
             session (Session): The session to use
-            metrics (list[UpdatedWorkout | DeletedWorkout]): The metrics to syncronize
 
         """
-        stmnt = text(
-                Path("fitness_tracker/database/SQL/hevy/tracker/metric/calories_burned/insert.sql").read_text(
-                    encoding="utf-8"
-                )
-            )
-        session.execute(stmnt) # type: ignore
-        session.commit()
+        self._database.apple_health.attribute_to_workouts(
+            session,
+            data_type_id=CALORIES_DATA_TYPE_ID,
+            metric_id=CALORIES_METRIC_ID,
+            min_value=CALORIES_MIN_VALUE,
+            decimals=0,
+        )
+        session.flush()
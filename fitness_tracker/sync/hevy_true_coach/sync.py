@@ -26,7 +26,7 @@ class HevyToTrueCoachSyncronizer:
 
         """
         with self._database.hevy_app.get_session() as session:
-            hevy_app_workout = self._database.hevy_app.get_workout(session, id=hevy_workout_id)
+            hevy_app_workout = self._database.hevy_app.get_workout_graph(session, hevy_workout_id)
             if not isinstance(hevy_app_workout, HevyAppWorkout):
                 msg = f"Workout with id {hevy_workout_id} not found"
                 raise TypeError(msg)
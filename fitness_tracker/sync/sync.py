@@ -1,9 +1,11 @@
 import os
+from typing import Any, Optional
 
 import dropbox
 from sqlalchemy.engine import Engine
 
 from fitness_tracker.apis import HevyAppClient, TrueCoachClient
+from fitness_tracker.apis.cache import ResponseCache
 from fitness_tracker.database import Database
 from fitness_tracker.llm.fitness_llm import FitnessLLM
 from fitness_tracker.sync.apple_health_tracker.sync import AppleHealthToFitnessTrackerSyncronizer
@@ -16,14 +18,19 @@ from fitness_tracker.sync.tracker_true_coach.sync import TrackerToTrueCoachSyncr
 
 
 class Syncronizer:
-    """Syncronizer class."""
+    """Syncronizer class.
+
+    The syncronizer owns the API clients and the response cache they share, so it closes
+    them all on ``close``, or on exit when used as a context manager.
+    """
 
     def __init__(self, engine: Engine) -> None:
         """Initiate the syncronizer with the clients."""
         self._database = Database(engine)
-        self._hevy_app = HevyAppClient()
+        self._cache = ResponseCache()
+        self._hevy_app = HevyAppClient(cache=self._cache)
         self._dbx = dropbox.Dropbox(os.environ["DROPBOX_ACCESS_TOKEN"])
-        self._true_coach = TrueCoachClient()
+        self._true_coach = TrueCoachClient(cache=self._cache)
         self._llm = FitnessLLM("gpt-4o-mini-2024-07-18")
         self.true_coach_to_hevy = TrueCoachToHevySyncronizer(
             database=self._database, source=self._true_coach, target=self._hevy_app, llm=self._llm
@@ -46,3 +53,15 @@ class Syncronizer:
         self.tracker_to_true_coach = TrackerToTrueCoachSyncronizer(
             database=self._database, target=self._true_coach
         )
+
+    def close(self) -> None:
+        """Close the API clients, then the response cache they share."""
+        self._hevy_app.close()
+        self._true_coach.close()
+        self._cache.close()
+
+    def __enter__(self) -> "Syncronizer":
+        return self
+
+    def __exit__(self, *exc_info: Optional[Any]) -> None:
+        self.close()
@@ -34,7 +34,7 @@ class TrackerToHevySyncronizer:
 
         """
         with self._database.hevy_app.get_session() as session:
-            workout = self._database.tracker.get_workout(session, true_coach_id=workout_id)
+            workout = self._database.tracker.get_workout_graph(session, workout_id)
             placeholder_exercises = self._database.hevy_app.get_placeholders()
 
             if workout:
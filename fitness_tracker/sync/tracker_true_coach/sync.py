@@ -1,8 +1,7 @@
-from pathlib import Path
-
 from fitness_tracker.apis import TrueCoachClient
 from fitness_tracker.apis.true_coach.types import AssessmentItem, PostAssessment, PostAssessmentItem
 from fitness_tracker.database import Database
+from fitness_tracker.database.statements import get_statement
 from sqlalchemy import text
 
 
@@ -35,11 +34,7 @@ class TrackerToTrueCoachSyncronizer:
 
     def sync_assessments(self) -> None:
         """Sync all the assessments."""
-        query = text(
-            Path(
-                "fitness_tracker/database/SQL/tracker/true_coach/assessments/select.sql"
-            ).read_text()
-        )
+        query = get_statement("tracker/true_coach/assessments/select")
 
         with self._database.tracker.get_session() as session:
             result = session.execute(query)  # type: ignore
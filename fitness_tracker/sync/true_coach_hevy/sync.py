@@ -1,5 +1,3 @@
-from pathlib import Path
-
 from fitness_tracker.apis import HevyAppClient, TrueCoachClient
 from fitness_tracker.apis.hevy_app.types import (
     PostRoutinesRequest,
@@ -7,6 +5,7 @@ from fitness_tracker.apis.hevy_app.types import (
     PostRoutinesRequestExercise,
 )
 from fitness_tracker.database import Database
+from fitness_tracker.database.statements import get_statement
 from fitness_tracker.database.models import (
     Exercise,
     HevyAppExercise,
@@ -16,7 +15,6 @@ from fitness_tracker.database.models import (
 from fitness_tracker.database.repository.tracker import FitnessTrackerExerciseRepository
 from fitness_tracker.llm.fitness_llm import FitnessLLM
 from sqlalchemy.orm import Session
-from sqlalchemy.sql import text
 from tqdm import tqdm
 
 from . import utils
@@ -42,7 +40,7 @@ class TrueCoachToHevySyncronizer:
 
         """
         with self._database.hevy_app.get_session() as session:
-            true_coach_workout = self._database.true_coach.get_workout(session, id=workout_id)
+            true_coach_workout = self._database.true_coach.get_workout_graph(session, workout_id)
             placeholder_exercises = self._database.hevy_app.get_placeholders()
 
             if true_coach_workout:
@@ -139,10 +137,6 @@ class TrueCoachToHevySyncronizer:
         Args:
             session (Session): The session to use
         """
-        stmnt = text(
-            Path(
-                "fitness_tracker/database/SQL/true_coach/tracker/workout_items/insert.sql"
-            ).read_text(encoding="utf-8")
-        )
+        stmnt = get_statement("true_coach/tracker/workout_items/insert")
         session.execute(stmnt)  # type: ignore
         session.commit()
@@ -0,0 +1,81 @@
+"""An in-memory stand-in for the parts of the Dropbox client the syncronizers use."""
+
+import io
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import requests
+import urllib3
+from dropbox.files import FileMetadata, ListFolderResult
+
+
+class FakeDropbox:
+    """Serves files from a dict, with an optional per-download latency.
+
+    It counts the downloads running at once, so tests can check how many are in flight.
+    """
+
+    def __init__(
+        self,
+        files: dict[str, bytes],
+        latency: float = 0.0,
+        latencies: Optional[dict[str, float]] = None,
+        modified: Optional[datetime] = None,
+    ) -> None:
+        """Initiate the fake.
+
+        Args:
+            files (dict[str, bytes]): The file contents by lower-cased path
+            latency (float): The seconds each download takes
+            latencies (Optional[dict[str, float]]): Per-path latencies overriding ``latency``
+            modified (Optional[datetime]): The ``server_modified`` time of every file
+        """
+        self.files = files
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.modified = modified or datetime(2025, 1, 1)
+        self.downloads: list[str] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def metadata(self, path: str) -> FileMetadata:
+        """Return the metadata of a file."""
+        return FileMetadata(
+            name=path.rsplit("/", 1)[-1],
+            path_lower=path,
+            id=f"id:{path}",
+            client_modified=self.modified,
+            server_modified=self.modified,
+            rev="0123456789abcdef",
+            size=len(self.files[path]),
+            content_hash="0" * 64,
+        )
+
+    def files_list_folder(self, path: str, recursive: bool = False) -> ListFolderResult:
+        """List every file under ``path`` on a single page."""
+        entries = [self.metadata(name) for name in sorted(self.files) if name.startswith(path)]
+        return ListFolderResult(entries=entries, cursor=f"cursor:{path}", has_more=False)
+
+    def files_list_folder_continue(self, cursor: str) -> ListFolderResult:
+        """Report no changes since ``cursor``."""
+        return ListFolderResult(entries=[], cursor=cursor, has_more=False)
+
+    def files_download(self, path: str) -> tuple[FileMetadata, requests.Response]:
+        """Return the metadata and a streaming response for a file, after its latency."""
+        with self._lock:
+            self.downloads.append(path)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latencies.get(path, self.latency))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = urllib3.HTTPResponse(io.BytesIO(self.files[path]), preload_content=False)
+        return self.metadata(path), response
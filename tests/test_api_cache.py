@@ -0,0 +1,174 @@
+"""Tests for where the API response cache is written and how it answers."""
+
+import json
+import time
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+from sqlalchemy import create_engine
+
+from fitness_tracker.apis.cache import ResponseCache
+from fitness_tracker.apis.hevy_app.client import HevyAppClient
+from fitness_tracker.apis.hevy_app.session import HevyAppSession
+from fitness_tracker.database import Database
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Run in an empty working directory, with a home of its own and placeholder API keys."""
+    cwd = tmp_path / "cwd"
+    cwd.mkdir()
+    monkeypatch.chdir(cwd)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    monkeypatch.setenv("HEVY_API_KEY", "key")
+    monkeypatch.setenv("HEVY_WEB_API_KEY", "key")
+    return cwd
+
+
+def test_clients_do_not_cache_by_default(workdir: Path) -> None:
+    """Building a client, or a Database, writes no cache file."""
+    hevy_app = HevyAppClient()
+    database = Database(create_engine("sqlite://"))
+
+    assert hevy_app.cache is None
+    assert database.hevy_app.api.cache is None
+    assert list(workdir.iterdir()) == []
+    hevy_app.close()
+
+
+def test_default_cache_path_is_per_user(workdir: Path, tmp_path: Path) -> None:
+    """An opted-in cache lives under the home folder, not the working directory."""
+    cache = ResponseCache()
+    cache.close()
+
+    assert cache.path == tmp_path / "home" / ".fitness_tracker" / "api_cache.sqlite"
+    assert cache.path.exists()
+    assert list(workdir.iterdir()) == []
+
+
+class FakeResponse:
+    """The parts of ``requests.Response`` the Hevy session reads."""
+
+    def __init__(
+        self, status_code: int, body: Any = None, headers: Optional[dict[str, str]] = None
+    ) -> None:
+        """Build a response with ``body`` as its JSON."""
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.url = "https://api.hevyapp.com/v1/exercise_templates"
+        self.text = ""
+        self._body = body
+
+    def __bool__(self) -> bool:
+        """Whether the status is a success, as ``requests.Response`` does."""
+        return self.status_code < HTTPStatus.BAD_REQUEST
+
+    def json(self) -> Any:
+        """Return the body."""
+        return self._body
+
+
+class FakeTransport:
+    """Answers requests from a queue of responses, recording the headers sent."""
+
+    def __init__(self, *responses: FakeResponse) -> None:
+        """Queue ``responses`` in the order they are returned."""
+        self.responses = list(responses)
+        self.headers: list[dict[str, str]] = []
+
+    def request(self, method: str, url: str, **kwargs: Any) -> FakeResponse:
+        """Record the headers and return the next response."""
+        self.headers.append(kwargs["headers"])
+        return self.responses.pop(0)
+
+
+@pytest.mark.parametrize(
+    ("validator", "condition"),
+    [
+        ({"ETag": '"v1"'}, {"If-None-Match": '"v1"'}),
+        (
+            {"Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"},
+            {"If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"},
+        ),
+    ],
+)
+def test_304_is_answered_from_the_cache(
+    tmp_path: Path, validator: dict[str, str], condition: dict[str, str]
+) -> None:
+    """An entry with a validator is revalidated, and a 304 serves the stored body."""
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    transport = FakeTransport(
+        FakeResponse(200, {"exercise_templates": [1, 2]}, validator), FakeResponse(304)
+    )
+    session = HevyAppSession(transport=transport, cache=cache)  # type: ignore[arg-type]
+
+    first = session.make_request("GET", "exercise_templates", cached=True)
+    second = session.make_request("GET", "exercise_templates", cached=True)
+
+    assert second == first
+    assert second["exercise_templates"] == [1, 2]
+    assert condition.items() <= transport.headers[1].items()
+    assert cache.stats()[:3] == (0, 1, 1)
+    cache.close()
+
+
+def test_entries_without_validators_expire_after_the_ttl(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An entry without validators is served until it is ``ttl`` seconds old."""
+    now = 1_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache = ResponseCache(tmp_path / "cache.sqlite", ttl=60)
+    key = cache.key("GET", "https://example.com/exercises")
+    cache.put(key, "https://example.com/exercises", {"id": 1}, {})
+
+    now += 59
+    entry = cache.get(key)
+    assert entry is not None
+    assert cache.is_fresh(entry)
+
+    now += 1
+    assert not cache.is_fresh(entry)
+    cache.close()
+
+
+def test_least_recently_used_entries_are_evicted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Going over ``max_bytes`` evicts the entries read longest ago."""
+    now = 1_000.0
+    monkeypatch.setattr(time, "time", lambda: now)
+    body = {"data": "x" * 90}
+    size = len(json.dumps(body))
+    cache = ResponseCache(tmp_path / "cache.sqlite", max_bytes=3 * size)
+    keys = [cache.key("GET", f"https://example.com/{i}") for i in range(4)]
+    for i, key in enumerate(keys[:3]):
+        now += 1
+        cache.put(key, f"https://example.com/{i}", body, {})
+    # Reading the oldest entry makes the second one the least recently used
+    now += 1
+    assert cache.get(keys[0]) is not None
+
+    now += 1
+    cache.put(keys[3], "https://example.com/3", body, {})
+
+    assert cache.get(keys[1]) is None
+    assert all(cache.get(key) is not None for key in (keys[0], keys[2], keys[3]))
+    assert cache.stats().size == 3 * size
+    cache.close()
+
+
+def test_closing_a_client_leaves_a_shared_cache_open(tmp_path: Path) -> None:
+    """Only the code that created the cache closes it."""
+    cache = ResponseCache(tmp_path / "cache.sqlite")
+    first = HevyAppClient(cache=cache)
+    second = HevyAppClient(cache=cache)
+
+    first.close()
+    cache.put(cache.key("GET", "https://example.com"), "https://example.com", {}, {})
+    assert cache.stats().entries == 1
+
+    second.close()
+    cache.close()
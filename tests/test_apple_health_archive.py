@@ -0,0 +1,74 @@
+"""Tests for the Apple Health rollups over archived months."""
+
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.apple_health import AppleHealthService
+
+COLUMN = "Heart Rate (count/min)"
+HOUR = datetime(2020, 3, 1, 10)
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[AppleHealthService]:
+    """A service on a fresh file-backed database, archiving under ``tmp_path``."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    Base.metadata.create_all(engine)
+    yield AppleHealthService(engine, archive_root=tmp_path / "archive")
+    engine.dispose()
+
+
+def minutes(start: datetime, values: list[float]) -> pd.DataFrame:
+    """Build a Health Auto Export style frame with one value per minute from ``start``."""
+    index = pd.date_range(start, periods=len(values), freq="min", name="Date")
+    return pd.DataFrame({COLUMN: values}, index=index)
+
+
+def aggregates(service: AppleHealthService, interval: timedelta) -> pd.DataFrame:
+    """Return the aggregates of ``HOUR``'s day in ``interval`` buckets, read from the rollups."""
+    day = HOUR.replace(hour=0)
+    return service.get_aggregates("Heart Rate", day, day + timedelta(days=1), interval)
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_ingest_into_archived_hour_keeps_archived_records(
+    service: AppleHealthService, bulk: bool
+) -> None:
+    """Records added to an archived hour are rolled up together with the archived ones."""
+    service.add_data_records(minutes(HOUR, [1.0] * 30))
+    assert service.archive_records() == 30
+
+    service.add_data_records(minutes(HOUR + timedelta(minutes=30), [3.0] * 10), bulk=bulk)
+
+    rollup = aggregates(service, timedelta(hours=1)).loc[HOUR]
+    assert rollup["count"] == 40
+    assert rollup["sum"] == 60.0
+    assert rollup["max"] == 3.0
+    assert aggregates(service, timedelta(days=1))["count"].tolist() == [40]
+
+
+def test_per_cell_ingest_refreshes_rollups(service: AppleHealthService) -> None:
+    """The row-by-row path keeps the rollups in step with the records."""
+    service.add_data_records(minutes(HOUR, [1.0, 2.0, 3.0]), bulk=False)
+
+    rollup = aggregates(service, timedelta(hours=1)).loc[HOUR]
+    assert rollup["count"] == 3
+    assert rollup["mean"] == 2.0
+
+
+def test_rebuild_rollups_includes_archived_records(service: AppleHealthService) -> None:
+    """Rebuilding keeps archived records in the rollups of months that are also in SQLite."""
+    service.add_data_records(minutes(HOUR, [1.0] * 30))
+    service.archive_records()
+    service.add_data_records(minutes(HOUR + timedelta(minutes=30), [3.0] * 10))
+
+    service.rebuild_rollups()
+
+    assert aggregates(service, timedelta(hours=1)).loc[HOUR, "count"] == 40
+    assert aggregates(service, timedelta(days=1))["count"].tolist() == [40]
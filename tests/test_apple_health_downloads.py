@@ -0,0 +1,99 @@
+"""Tests for the concurrent Apple Health export downloads."""
+
+import threading
+import time
+
+import pytest
+
+from fitness_tracker.sync.apple_health_tracker.sync import AppleHealthToFitnessTrackerSyncronizer
+from fitness_tracker.sync.apple_health_tracker.utils import prefetch
+from tests.fake_dropbox import FakeDropbox
+
+FOLDER = "/apps/health auto export"
+
+
+def make_dropbox(count: int, latency: float = 0.02) -> FakeDropbox:
+    """Build a fake with ``count`` CSV files whose latencies vary, so they finish out of order."""
+    files = {
+        f"{FOLDER}/{i:02d}.csv": f"Date,Value\n2025-01-01 00:00,{i}\n".encode()
+        for i in range(count)
+    }
+    latencies = {path: latency * (1 + i % 3) for i, path in enumerate(files)}
+    return FakeDropbox(files, latencies=latencies)
+
+
+@pytest.mark.parametrize("max_downloads", [1, 3, 8])
+def test_iter_downloads_keeps_order_and_bounds_in_flight(max_downloads: int) -> None:
+    """Downloads come back in listing order with at most ``max_downloads`` running at once."""
+    dropbox = make_dropbox(12)
+    syncronizer = AppleHealthToFitnessTrackerSyncronizer(
+        database=None, source=dropbox, max_downloads=max_downloads  # type: ignore[arg-type]
+    )
+    files = dropbox.files_list_folder(FOLDER, recursive=True).entries
+
+    contents = []
+    for buffer in syncronizer.iter_downloads(files):
+        with buffer:
+            contents.append(buffer.read())
+        # A slow consumer gives the pool every chance to run ahead
+        time.sleep(0.005)
+
+    assert contents == [dropbox.files[file.path_lower] for file in files]
+    assert dropbox.peak_in_flight <= max_downloads
+    assert len(dropbox.downloads) == len(files)
+
+
+def test_prefetch_never_holds_more_than_max_workers() -> None:
+    """Results in flight or waiting never exceed ``max_workers``, however slow the caller is."""
+    lock = threading.Lock()
+    outstanding = 0
+    peak = 0
+
+    def work(item: int) -> int:
+        nonlocal outstanding, peak
+        with lock:
+            outstanding += 1
+            peak = max(peak, outstanding)
+        time.sleep(0.001)
+        return item
+
+    results = []
+    for result in prefetch(work, range(30), max_workers=4):
+        time.sleep(0.003)
+        with lock:
+            outstanding -= 1
+        results.append(result)
+
+    assert results == list(range(30))
+    assert peak <= 4
+
+
+class Resource:
+    """A result that records whether it was closed."""
+
+    def __init__(self, item: int) -> None:
+        self.item = item
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_prefetch_discards_unconsumed_results_when_stopped_early() -> None:
+    """Results that finished but were never yielded are handed to ``discard``."""
+    created: list[Resource] = []
+
+    def work(item: int) -> Resource:
+        time.sleep(0.01)
+        resource = Resource(item)
+        created.append(resource)
+        return resource
+
+    results = prefetch(work, range(20), max_workers=4, discard=Resource.close)
+    first = next(results)
+    results.close()
+
+    assert first.item == 0
+    assert not first.closed
+    assert len(created) < 20
+    assert all(resource.closed for resource in created if resource is not first)
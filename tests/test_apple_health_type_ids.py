@@ -0,0 +1,57 @@
+"""Tests for how the Apple Health type ids are cached around the caller's transaction."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from fitness_tracker.database.models import AppleHealthDataType, AppleHealthWorkoutType
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.apple_health import AppleHealthService
+
+COLUMN = "Heart Rate (count/min)"
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[AppleHealthService]:
+    """A service on a fresh file-backed database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    Base.metadata.create_all(engine)
+    yield AppleHealthService(engine, archive_root=tmp_path / "archive")
+    engine.dispose()
+
+
+def test_rolled_back_types_are_not_cached(service: AppleHealthService) -> None:
+    """Resolving types commits nothing, and a rollback leaves the cache as it was."""
+    with service.get_session() as session:
+        data_type_ids = service.resolve_data_type_ids(session, [COLUMN])
+        workout_type_ids = service.resolve_workout_type_ids(session, ["Outdoor Run"])
+        assert list(data_type_ids) == [COLUMN]
+        assert list(workout_type_ids) == ["Outdoor Run"]
+        # Resolving again in the same transaction reuses the pending ids
+        assert service.resolve_data_type_ids(session, [COLUMN]) == data_type_ids
+        session.rollback()
+
+    with service.get_session() as session:
+        assert session.scalar(select(func.count()).select_from(AppleHealthDataType)) == 0
+        assert session.scalar(select(func.count()).select_from(AppleHealthWorkoutType)) == 0
+        assert service.get_data_type_ids(session) == {}
+        assert service.get_workout_type_ids(session) == {}
+
+
+def test_committed_types_are_cached(service: AppleHealthService) -> None:
+    """The ids of new types are cached once the caller commits."""
+    with service.get_session() as session:
+        # Load the caches first, so the commit has to publish into them
+        assert service.get_data_type_ids(session) == {}
+        assert service.get_workout_type_ids(session) == {}
+        data_type_ids = service.resolve_data_type_ids(session, [COLUMN])
+        workout_type_ids = service.resolve_workout_type_ids(session, ["Outdoor Run"])
+        assert service.get_data_type_ids(session) == {}
+        session.commit()
+
+        assert service.get_data_type_ids(session) == {
+            ("Heart Rate", "count/min"): data_type_ids[COLUMN]
+        }
+        assert service.get_workout_type_ids(session) == workout_type_ids
@@ -0,0 +1,48 @@
+"""Tests for the incremental ingest of rewritten Apple Health metrics exports."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from fitness_tracker.database.models import AppleHealthDataRecord
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.apple_health import AppleHealthService
+from fitness_tracker.sync.apple_health_tracker.sync import AppleHealthToFitnessTrackerSyncronizer
+from tests.fake_dropbox import FakeDropbox
+
+PATH = "/apps/health auto export/metrics.csv"
+HEADER = "Date,Heart Rate (count/min),Step Count (count)\n"
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[AppleHealthService]:
+    """A service on a fresh file-backed database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    Base.metadata.create_all(engine)
+    yield AppleHealthService(engine, archive_root=tmp_path / "archive")
+    engine.dispose()
+
+
+def test_rewrite_fills_in_a_partially_written_final_minute(service: AppleHealthService) -> None:
+    """Values added to the last minute ingested are written when the file is rewritten."""
+    syncronizer = AppleHealthToFitnessTrackerSyncronizer(
+        database=SimpleNamespace(apple_health=service), source=None  # type: ignore[arg-type]
+    )
+    versions = [
+        # The export was written before the steps of the last minute were counted
+        HEADER + "2025-01-01 00:00,60,10\n2025-01-01 00:01,61,\n",
+        HEADER + "2025-01-01 00:00,60,10\n2025-01-01 00:01,61,12\n2025-01-01 00:02,62,11\n",
+    ]
+    for i, content in enumerate(versions):
+        dropbox = FakeDropbox({PATH: content.encode()})
+        metadata = dropbox.metadata(PATH)
+        metadata.content_hash = str(i) * 64
+        _, response = dropbox.files_download(PATH)
+        syncronizer.ingest_metrics_file(metadata, response.raw)
+
+    with service.get_session() as session:
+        records = session.scalar(select(func.count()).select_from(AppleHealthDataRecord))
+    assert records == 6
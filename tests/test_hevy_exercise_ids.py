@@ -0,0 +1,118 @@
+"""Tests for the cache of stored Hevy exercise template ids."""
+
+from collections.abc import Iterator
+from typing import Optional
+
+import pytest
+from sqlalchemy import create_engine
+
+from fitness_tracker.apis.hevy_app.exceptions import HevyAppExerciseNotFoundError
+from fitness_tracker.apis.hevy_app.types import ExerciseTemplate
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.hevy_app import HevyAppService
+
+
+def template(template_id: str) -> ExerciseTemplate:
+    """Build a barbell exercise template."""
+    return ExerciseTemplate(
+        id=template_id,
+        title=f"Exercise {template_id}",
+        type="weight_reps",
+        primary_muscle_group="chest",
+        secondary_muscle_groups=["triceps"],
+        equipment="barbell",
+        is_custom=False,
+    )
+
+
+class FakeExercises:
+    """Stands in for ``HevyAppExercises`` with an empty catalog, counting the lookups."""
+
+    endpoint = "/exercise_templates"
+
+    def __init__(self, templates: dict[str, ExerciseTemplate]) -> None:
+        """Serve the given templates by id."""
+        self.templates = templates
+        self.lookups: list[str] = []
+
+    def get_all(self, per_page: int, max_workers: int) -> list[ExerciseTemplate]:
+        """Return no templates, so every missing id is looked up one by one."""
+        return []
+
+    def get_template(self, template_id: str) -> Optional[ExerciseTemplate]:
+        """Count the lookup and return the template, if there is one."""
+        self.lookups.append(template_id)
+        return self.templates.get(template_id)
+
+
+class FakeApi:
+    """Stands in for ``HevyAppClient``."""
+
+    def __init__(self, exercises: FakeExercises) -> None:
+        """Serve the given exercise templates endpoint."""
+        self.exercises = exercises
+
+
+@pytest.fixture
+def exercises() -> FakeExercises:
+    """A fake exercise templates endpoint knowing templates ``A`` and ``B``."""
+    return FakeExercises({"A": template("A"), "B": template("B")})
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch, exercises: FakeExercises) -> Iterator[HevyAppService]:
+    """A Hevy service on a fresh in-memory database, talking to the fake API."""
+    monkeypatch.setenv("HEVY_API_KEY", "key")
+    monkeypatch.setenv("HEVY_WEB_API_KEY", "key")
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    service = HevyAppService(engine)
+    service.api = FakeApi(exercises)  # type: ignore[assignment]
+    yield service
+    engine.dispose()
+
+
+def test_committed_exercise_ids_are_not_looked_up_again(
+    service: HevyAppService, exercises: FakeExercises
+) -> None:
+    """Ids resolved in a committed transaction are known to later sessions."""
+    with service.get_session() as session:
+        service.resolve_exercises(session, ["A"])
+        service.resolve_exercises(session, ["A"])
+        session.commit()
+
+    with service.get_session() as session:
+        service.resolve_exercises(session, ["A"])
+
+    assert exercises.lookups == ["A"]
+
+
+def test_rolled_back_exercise_ids_are_stored_again(
+    service: HevyAppService, exercises: FakeExercises
+) -> None:
+    """A rollback forgets the ids resolved in it, so they are stored again when next resolved."""
+    with service.get_session() as session:
+        service.resolve_exercises(session, ["A"])
+        session.rollback()
+        service.resolve_exercises(session, ["A", "B"])
+        session.commit()
+    # A was already fetched, so it is stored again from the catalog
+    assert exercises.lookups == ["A", "B"]
+
+    # A service with nothing cached finds both in the database
+    fresh = HevyAppService(service.engine)
+    fresh.api = service.api
+    with fresh.get_session() as session:
+        fresh.resolve_exercises(session, ["A", "B"])
+
+    assert exercises.lookups == ["A", "B"]
+
+
+def test_unknown_exercise_id_raises(service: HevyAppService, exercises: FakeExercises) -> None:
+    """An id the API has no template for raises the Hevy not found error."""
+    with service.get_session() as session, pytest.raises(HevyAppExerciseNotFoundError) as error:
+        service.resolve_exercises(session, ["A", "Z"])
+
+    assert error.value.exercise_template_id == "Z"
+    assert error.value.url == "/exercise_templates/Z"
+    assert sorted(exercises.lookups) == ["A", "Z"]
@@ -0,0 +1,49 @@
+"""Tests for fetching every page of a paginated Hevy App endpoint."""
+
+import threading
+import time
+from typing import Any, Optional
+
+from fitness_tracker.apis.hevy_app.pagination import fetch_all_pages
+
+PAGES = 8
+EMPTY = {4, 7}
+
+
+class FakePages:
+    """Serves numbered pages, the later ones faster, so they finish out of order."""
+
+    def __init__(self) -> None:
+        """Start with no pages fetched."""
+        self.finished: list[int] = []
+        self._lock = threading.Lock()
+
+    def fetch(self, page: int) -> Optional[dict[str, Any]]:
+        """Return page ``page``, or None for the empty ones."""
+        time.sleep(0.005 * (PAGES - page))
+        with self._lock:
+            self.finished.append(page)
+        if page in EMPTY:
+            return None
+        return {"page": page, "page_count": PAGES}
+
+
+def test_fetch_all_pages_keeps_page_order_and_skips_empty_pages() -> None:
+    """Pages that finish out of order come back in page order, without the empty ones."""
+    pages = FakePages()
+
+    results = fetch_all_pages(pages.fetch, max_workers=4)
+
+    assert [result["page"] for result in results] == [
+        page for page in range(1, PAGES + 1) if page not in EMPTY
+    ]
+    assert pages.finished[0] == 1
+    assert pages.finished[1:] != sorted(pages.finished[1:])
+
+
+def test_fetch_all_pages_of_a_single_page() -> None:
+    """A single page is returned without starting the pool, and no first page gives none."""
+    assert fetch_all_pages(lambda page: {"page": page, "page_count": 1}) == [
+        {"page": 1, "page_count": 1}
+    ]
+    assert fetch_all_pages(lambda page: None) == []
@@ -0,0 +1,158 @@
+"""Tests for how the Hevy writes nest in the caller's transaction and in sync batches."""
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+
+from fitness_tracker.apis.hevy_app.types import Exercise, ExerciseTemplate, UpdatedWorkout, Workout
+from fitness_tracker.database import Database
+from fitness_tracker.database.models import HevyAppSets, HevyAppWorkout, HevyAppWorkoutItem
+from fitness_tracker.sync.hevy_tracker.sync import HevyToFitnessTrackerSyncronizer
+
+
+@pytest.fixture
+def database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Database]:
+    """A Database on a fresh file-backed SQLite engine."""
+    monkeypatch.setenv("HEVY_API_KEY", "key")
+    monkeypatch.setenv("HEVY_WEB_API_KEY", "key")
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    database = Database(engine)
+    database.init_db()
+    yield database
+    engine.dispose()
+
+
+def exercise(index: int) -> Exercise:
+    """Build an exercise of two sets."""
+    return Exercise(
+        index=index,
+        title="Bench Press",
+        notes="",
+        exercise_template_id="T1",
+        sets=[{"index": i, "type": "normal", "weight_kg": 60, "reps": 5} for i in range(2)],
+    )
+
+
+TEMPLATE = ExerciseTemplate(
+    id="T1",
+    title="Bench Press",
+    type="weight_reps",
+    primary_muscle_group="chest",
+    secondary_muscle_groups=[],
+    equipment="barbell",
+    is_custom=False,
+)
+
+
+class Crash(BaseException):
+    """Stands in for the process dying, which no ``except Exception`` sees."""
+
+
+def updated_workout(workout_id: str) -> UpdatedWorkout:
+    """Build an update event for a workout of two exercises."""
+    return UpdatedWorkout(
+        type="updated",
+        workout=Workout(
+            id=workout_id,
+            title="Push",
+            description="",
+            start_time="2025-01-01T10:00:00Z",
+            end_time="2025-01-01T11:00:00Z",
+            updated_at="2025-01-01T11:00:00Z",
+            created_at="2025-01-01T11:00:00Z",
+            exercises=[exercise(0).model_dump(), exercise(1).model_dump()],
+        ),
+    )
+
+
+def syncronizer(
+    database: Database, monkeypatch: pytest.MonkeyPatch, failing: dict[str, BaseException]
+) -> HevyToFitnessTrackerSyncronizer:
+    """Build a syncronizer whose events raise ``failing[workout_id]`` after storing the workout.
+
+    The workouts are not linked to TrueCoach, so neither the API nor the LLM is called.
+    """
+    with database.hevy_app.get_session() as session:
+        database.hevy_app.upsert_exercises(session, [TEMPLATE])
+        session.commit()
+    syncronizer = HevyToFitnessTrackerSyncronizer(
+        database=database, source=None, llm=None  # type: ignore[arg-type]
+    )
+    link_workout = syncronizer.link_workout
+
+    def link_or_fail(session: Session, workout_id: str, workout: Workout) -> Optional[int]:
+        if workout_id in failing:
+            raise failing[workout_id]
+        return link_workout(session, workout_id, workout)
+
+    monkeypatch.setattr(syncronizer, "link_workout", link_or_fail)
+    return syncronizer
+
+
+def stored(database: Database) -> tuple[set[str], int, int]:
+    """Return the stored workout ids and the number of items and sets."""
+    with database.hevy_app.get_session() as session:
+        return (
+            set(session.scalars(select(HevyAppWorkout.id))),
+            session.scalar(select(func.count()).select_from(HevyAppWorkoutItem)),
+            session.scalar(select(func.count()).select_from(HevyAppSets)),
+        )
+
+
+def test_add_workout_item_is_rolled_back_with_its_savepoint(database: Database) -> None:
+    """A rolled back savepoint takes its items and sets with it, and earlier ones stay."""
+    service = database.hevy_app
+    with service.get_session() as session:
+        service.upsert_exercises(session, [TEMPLATE])
+        session.add(
+            HevyAppWorkout(
+                id="w1",
+                title="Push",
+                description="",
+                start_time=datetime(2025, 1, 1, 10),
+                end_time=datetime(2025, 1, 1, 11),
+                updated_at=datetime(2025, 1, 1, 11),
+            )
+        )
+        service.add_workout_item(session=session, workout_id="w1", exercise=exercise(0))
+
+        savepoint = session.begin_nested()
+        service.add_workout_item(session=session, workout_id="w1", exercise=exercise(1))
+        savepoint.rollback()
+        session.commit()
+
+        assert session.scalar(select(func.count()).select_from(HevyAppWorkoutItem)) == 1
+        assert session.scalar(select(func.count()).select_from(HevyAppSets)) == 2
+
+
+def test_failing_event_is_rolled_back_and_earlier_events_are_committed(
+    database: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """An event that raises midway leaves nothing behind, and the events before it stay."""
+    events = [updated_workout(workout_id) for workout_id in ("w1", "w2", "w3", "w4")]
+    sync = syncronizer(database, monkeypatch, failing={"w3": ValueError("no link")})
+
+    with pytest.raises(ValueError, match="no link"):
+        sync.sync_events(events, batch_size=50)
+
+    # The failing event had stored its workout, items and sets before raising
+    assert stored(database) == ({"w1", "w2"}, 4, 8)
+
+
+def test_crash_between_batches_keeps_only_committed_batches(
+    database: Database, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A crash loses the events applied since the last batch commit, each of them whole."""
+    events = [updated_workout(f"w{i}") for i in range(1, 6)]
+    sync = syncronizer(database, monkeypatch, failing={"w4": Crash()})
+
+    with pytest.raises(Crash):
+        sync.sync_events(events, batch_size=2)
+
+    # The first batch was committed, w3 was applied but not yet committed
+    assert stored(database) == ({"w1", "w2"}, 4, 8)
@@ -0,0 +1,37 @@
+"""Tests for ``BaseRepository.insert_ignore``."""
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from fitness_tracker.database.models import AppleHealthIngestLedger
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.services.apple_health import AppleHealthService
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[AppleHealthService]:
+    """An Apple Health service on a fresh in-memory database."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield AppleHealthService(engine, archive_root=tmp_path / "archive")
+    engine.dispose()
+
+
+def test_record_ingest_puts_sql_expressions_in_the_statement(service: AppleHealthService) -> None:
+    """``ingested_at=func.now()`` is rendered into the insert rather than bound."""
+    service.record_ingest("/export/heart.csv", "abc", 3, datetime(2025, 1, 1, 12))
+    # The same version again is ignored
+    service.record_ingest("/export/heart.csv", "abc", 3, datetime(2025, 1, 1, 12))
+
+    with service.get_session() as session:
+        entries = session.execute(select(AppleHealthIngestLedger)).scalars().all()
+    assert len(entries) == 1
+    assert isinstance(entries[0].ingested_at, datetime)
+    assert service.get_ingested_files([("/export/heart.csv", "abc")]) == {
+        ("/export/heart.csv", "abc")
+    }
+    assert service.get_ingest_watermark("/export/heart.csv") == datetime(2025, 1, 1, 12)
@@ -0,0 +1,139 @@
+"""Tests that the SQL registry is answered without unexpected full table scans."""
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.query_plan import (
+    DEFAULT_MIN_ROWS,
+    capture_statements,
+    check_query_plans,
+)
+from fitness_tracker.database.services.hevy_app import HevyAppService
+from fitness_tracker.database.services.tracker import FitnessTrackerService
+from fitness_tracker.database.services.true_coach import TrueCoachService
+
+WORKOUTS = 400
+ITEMS = 5
+SETS = 5
+# In the format SQLAlchemy stores DateTime columns in, so the services can load them
+DAY = "2025-01-01 00:00:00.000000"
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Engine]:
+    """A database with every joined table above the scan threshold.
+
+    Each workout has ``ITEMS`` items of ``SETS`` sets, linked across TrueCoach, Hevy and
+    the tracker the way the syncs link them.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('query_plan') / 'tracker.db'}")
+    Base.metadata.create_all(engine)
+    workouts = range(1, WORKOUTS + 1)
+    items = range(1, WORKOUTS * ITEMS + 1)
+    sets = range(1, WORKOUTS * ITEMS * SETS + 1)
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO TrueCoachWorkout (id, title, due, state, rest_day, created_at, "
+                "updated_at) VALUES (:id, 'Push', :day, 'completed', 0, :day, :day)"
+            ),
+            [{"id": workout, "day": DAY} for workout in workouts],
+        )
+        connection.execute(
+            text(
+                "INSERT INTO TrueCoachWorkoutItem (id, workout_id, name, state, position) "
+                "VALUES (:id, :workout_id, 'Bench Press', 'completed', 1)"
+            ),
+            [{"id": item, "workout_id": (item - 1) // ITEMS + 1} for item in items],
+        )
+        connection.execute(
+            text("INSERT INTO Workout (id, true_coach_id) VALUES (:id, :id)"),
+            [{"id": workout} for workout in workouts],
+        )
+        connection.execute(
+            text(
+                "INSERT INTO HevyAppWorkout (id, title, description, start_time, end_time, "
+                "created_at) VALUES (:id, 'Push', '', :day, :day, :day)"
+            ),
+            [{"id": f"h{workout}", "day": DAY} for workout in workouts],
+        )
+        connection.execute(
+            text(
+                'INSERT INTO HevyAppWorkoutItem (id, workout_id, "index", name, notes) '
+                "VALUES (:id, :workout_id, :id, 'Bench Press', '')"
+            ),
+            [{"id": item, "workout_id": f"h{(item - 1) // ITEMS + 1}"} for item in items],
+        )
+        connection.execute(
+            text(
+                "INSERT INTO WorkoutItem (id, workout_id, position, exercise_id, hevy_app_id, "
+                "true_coach_id, rest) VALUES (:id, :workout_id, 1, 1, :id, :id, 90)"
+            ),
+            [{"id": item, "workout_id": (item - 1) // ITEMS + 1} for item in items],
+        )
+        for table in ("HevyAppSets", "Sets"):
+            connection.execute(
+                text(
+                    f'INSERT INTO {table} (id, workout_item_id, "index", type) '
+                    "VALUES (:id, :item, :index, 'normal')"
+                ),
+                [
+                    {"id": set_id, "item": (set_id - 1) // SETS + 1, "index": set_id % SETS}
+                    for set_id in sets
+                ],
+            )
+        connection.execute(
+            text(
+                "INSERT INTO MetricItem (id, metric_id, value, date) "
+                "VALUES (:id, 1, 1, '2025-01-01')"
+            ),
+            [{"id": item_id} for item_id in range(1, DEFAULT_MIN_ROWS + 1)],
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_registry_has_no_unexpected_full_scans(engine: Engine) -> None:
+    """Every statement in the SQL registry is planned with index lookups."""
+    assert check_query_plans(engine) == []
+
+
+def test_service_queries_have_no_unexpected_full_scans(
+    engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The queries the services run to load workout graphs are planned with index lookups."""
+    monkeypatch.setenv("HEVY_API_KEY", "key")
+    monkeypatch.setenv("HEVY_WEB_API_KEY", "key")
+    workout = WORKOUTS // 2
+    with capture_statements(engine) as statements, Session(engine) as session:
+        TrueCoachService(engine).get_workout_graph(session, workout)
+        FitnessTrackerService(engine).get_workout_graph(session, workout)
+        HevyAppService(engine).get_workout_graph(session, f"h{workout}")
+
+    assert statements
+    assert check_query_plans(engine, statements=statements) == []
+
+
+def test_missing_indexes_are_reported(engine: Engine) -> None:
+    """Dropping the indexes the registry relies on turns up as full scans."""
+    indexes = {
+        "ix_WorkoutItem_workout_id": "WorkoutItem (workout_id)",
+        "ix_WorkoutItem_hevy_app_id": "WorkoutItem (hevy_app_id)",
+        "ix_WorkoutItem_true_coach_id": "WorkoutItem (true_coach_id)",
+    }
+    with engine.begin() as connection:
+        for name in indexes:
+            connection.execute(text(f'DROP INDEX "{name}"'))
+    try:
+        scans = check_query_plans(engine)
+    finally:
+        with engine.begin() as connection:
+            for name, columns in indexes.items():
+                connection.execute(text(f'CREATE INDEX "{name}" ON {columns}'))
+
+    assert "WorkoutItem" in {scan.table for scan in scans}
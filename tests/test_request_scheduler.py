@@ -0,0 +1,184 @@
+"""Tests for the per-host pacing and retries of the API request scheduler."""
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+from typing import Any, Optional
+
+import httpx
+import pytest
+import requests
+
+from fitness_tracker.apis import base
+from fitness_tracker.apis.base import HostScheduler, RateLimit, RequestScheduler
+
+URL = "https://api.example.com/v1/workouts"
+NOW = 1_700_000_000.0
+
+
+class FakeClock:
+    """Stands in for the ``time`` module of the scheduler, sleeping by moving the clock."""
+
+    def __init__(self) -> None:
+        """Start the clock at ``NOW``."""
+        self.now = NOW
+        self.sleeps: list[float] = []
+
+    def monotonic(self) -> float:
+        """Return the current time."""
+        return self.now
+
+    def time(self) -> float:
+        """Return the current time, as the wall clock."""
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        """Record the sleep and move the clock on."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    """Replace the scheduler's clock and sleep with a fake."""
+    clock = FakeClock()
+    monkeypatch.setattr(base, "time", clock)
+    return clock
+
+
+def response(status_code: int, retry_after: Optional[str] = None) -> Any:
+    """Build a response with an optional ``Retry-After`` header."""
+    headers = {"Retry-After": retry_after} if retry_after else {}
+    return SimpleNamespace(status_code=status_code, headers=headers)
+
+
+def replay(*outcomes: Any) -> tuple[Callable[[], Any], list[Any]]:
+    """Build a request that returns, or raises, ``outcomes`` in turn, and the calls made."""
+    calls: list[Any] = []
+
+    def request() -> Any:
+        outcome = outcomes[len(calls)]
+        calls.append(outcome)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    return request, calls
+
+
+def scheduler() -> RequestScheduler:
+    """A scheduler without backoff jitter, so only ``Retry-After`` makes it sleep."""
+    return RequestScheduler(default=RateLimit(rate=1_000, burst=100), backoff=0.0)
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_concurrency_halves_once_per_window(clock: FakeClock, status: int) -> None:
+    """Failures from requests already in flight count as one decrease."""
+    host = HostScheduler("api.example.com", RateLimit(max_concurrency=8))
+    for _ in range(3):
+        host.acquire()
+    for _ in range(3):
+        host.release(status, latency=0.1)
+    assert host.stats().concurrency == 4
+
+    clock.now += 1.0
+    host.acquire()
+    host.release(status, latency=0.1)
+    assert host.stats().concurrency == 2
+
+
+def test_concurrency_grows_by_one_per_window_of_successes(clock: FakeClock) -> None:
+    """Each success adds ``1 / concurrency``, so a window of successes adds one slot."""
+    host = HostScheduler("api.example.com", RateLimit(max_concurrency=8))
+    host.acquire()
+    host.release(503, latency=0.1)
+    assert host.stats().concurrency == 4
+
+    for _ in range(4):
+        host.acquire()
+        host.release(200, latency=0.1)
+    assert host.stats().concurrency == 4
+    host.acquire()
+    host.release(200, latency=0.1)
+    assert host.stats().concurrency == 5
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "delay"),
+    [
+        ("7", 7.0),
+        (format_datetime(datetime.fromtimestamp(NOW + 30, timezone.utc), usegmt=True), 30.0),
+    ],
+)
+def test_retry_waits_for_retry_after(clock: FakeClock, retry_after: str, delay: float) -> None:
+    """A throttled GET is retried after the ``Retry-After`` delay, in either form."""
+    request, calls = replay(response(429, retry_after), response(200))
+
+    result = scheduler().send("GET", URL, request)
+
+    assert result.status_code == 200
+    assert len(calls) == 2
+    assert clock.sleeps == [delay]
+
+
+def test_retry_after_pauses_the_host(clock: FakeClock) -> None:
+    """Other requests to the host wait out the ``Retry-After`` delay too."""
+    host = HostScheduler("api.example.com", RateLimit())
+    host.acquire()
+    host.release(429, latency=0.1, pause=5.0)
+
+    host.acquire()
+
+    assert sum(clock.sleeps) == pytest.approx(5.0)
+
+
+@pytest.mark.parametrize(
+    "outcome", [response(503), requests.ConnectionError(), httpx.ConnectError("refused")]
+)
+def test_non_idempotent_requests_are_not_retried(clock: FakeClock, outcome: Any) -> None:
+    """A POST may have been applied, so its failure goes straight back to the caller."""
+    request, calls = replay(outcome, response(200))
+
+    if isinstance(outcome, BaseException):
+        with pytest.raises(type(outcome)):
+            scheduler().send("POST", URL, request)
+    else:
+        assert scheduler().send("POST", URL, request).status_code == 503
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize(
+    "error", [requests.ConnectionError(), requests.Timeout(), httpx.ReadTimeout("slow")]
+)
+def test_transport_errors_are_retried(clock: FakeClock, error: Exception) -> None:
+    """A GET that got no response is sent again."""
+    request, calls = replay(error, response(200))
+
+    assert scheduler().send("GET", URL, request).status_code == 200
+    assert len(calls) == 2
+
+
+def test_other_errors_are_not_retried(clock: FakeClock) -> None:
+    """An error that is not a transport failure is raised at once and frees the slot."""
+    request, calls = replay(ValueError("bad body"), response(200))
+    request_scheduler = scheduler()
+
+    with pytest.raises(ValueError, match="bad body"):
+        request_scheduler.send("GET", URL, request)
+    assert len(calls) == 1
+    assert request_scheduler.host(URL).stats().in_flight == 0
+
+
+def test_async_transport_errors_are_retried(clock: FakeClock) -> None:
+    """``send_async`` retries a GET that got no response."""
+    outcomes, calls = replay(httpx.ConnectError("refused"), response(200))
+
+    async def request() -> Any:
+        return outcomes()
+
+    result = asyncio.run(scheduler().send_async("GET", URL, request))
+
+    assert result.status_code == 200
+    assert len(calls) == 2
@@ -0,0 +1,191 @@
+"""Tests that the Hevy sets upsert matches the update and insert statements it replaced."""
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection
+
+from fitness_tracker.database.models.base import Base
+from fitness_tracker.database.statements import compile_statement, get_statement
+
+# hevy/tracker/sets/update.sql and insert.sql, as they were before upsert.sql replaced them
+OLD_UPDATE = compile_statement(
+    """
+UPDATE Sets
+SET
+    weight_kg = (SELECT has.weight_kg
+                 FROM Workout w
+                 JOIN WorkoutItem wi ON w.id = wi.workout_id
+                 JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+                 JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+                 WHERE w.true_coach_id = :true_coach_id
+                   AND has."index" = Sets."index"
+                   AND wi.id= Sets.workout_item_id),
+    reps = (SELECT has.reps
+            FROM Workout w
+            JOIN WorkoutItem wi ON w.id = wi.workout_id
+            JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+            JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+            WHERE w.true_coach_id = :true_coach_id
+              AND has."index" = Sets."index"
+              AND wi.id= Sets.workout_item_id),
+    distance_meters = (SELECT has.distance_meters
+                        FROM Workout w
+                        JOIN WorkoutItem wi ON w.id = wi.workout_id
+                        JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+                        JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+                        WHERE w.true_coach_id = :true_coach_id
+                          AND has."index" = Sets."index"
+                          AND wi.id= Sets.workout_item_id),
+    duration_seconds = (SELECT has.duration_seconds
+                         FROM Workout w
+                         JOIN WorkoutItem wi ON w.id = wi.workout_id
+                         JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+                         JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+                         WHERE w.true_coach_id = :true_coach_id
+                           AND has."index" = Sets."index"
+                           AND wi.id= Sets.workout_item_id),
+    rpe = (SELECT has.rpe
+           FROM Workout w
+           JOIN WorkoutItem wi ON w.id = wi.workout_id
+           JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+           JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+           WHERE w.true_coach_id = :true_coach_id
+             AND has."index" = Sets."index"
+             AND wi.id= Sets.workout_item_id),
+    type = (SELECT has.type
+            FROM Workout w
+            JOIN WorkoutItem wi ON w.id = wi.workout_id
+            JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+            JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+            WHERE w.true_coach_id = :true_coach_id
+              AND has."index" = Sets."index"
+              AND wi.id= Sets.workout_item_id),
+    hevy_app_id = (SELECT has.id
+                   FROM Workout w
+                   JOIN WorkoutItem wi ON w.id = wi.workout_id
+                   JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+                   JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+                   WHERE w.true_coach_id = :true_coach_id
+                     AND has."index" = Sets."index"
+                     AND wi.id= Sets.workout_item_id)
+WHERE EXISTS (
+    SELECT 1
+    FROM Workout w
+    JOIN WorkoutItem wi ON w.id = wi.workout_id
+    JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+    JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+    WHERE w.true_coach_id = :true_coach_id
+      AND has."index" = Sets."index"
+      AND wi.id= Sets.workout_item_id
+);
+"""
+)
+OLD_INSERT = compile_statement(
+    """
+INSERT INTO Sets (workout_item_id, "index", weight_kg, type, reps, distance_meters,
+                  duration_seconds, rpe, hevy_app_id)
+SELECT wi.id as workout_item_id, has."index", has.weight_kg, has.type, has.reps,
+       has.distance_meters, has.duration_seconds, has.rpe, has.id as hevy_app_id
+FROM Workout w
+JOIN WorkoutItem wi ON w.id = wi.workout_id
+JOIN HevyAppWorkoutItem hawi ON hawi.id = wi.hevy_app_id
+JOIN HevyAppSets has ON has.workout_item_id = hawi.id
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM Sets s
+    WHERE s.workout_item_id = wi.id
+    AND s."index" = has."index"
+)
+AND w.true_coach_id = :true_coach_id;
+"""
+)
+
+SETS = (
+    'SELECT workout_item_id, "index", type, weight_kg, reps, distance_meters, '
+    'duration_seconds, rpe, hevy_app_id FROM Sets ORDER BY workout_item_id, "index"'
+)
+
+
+@pytest.fixture
+def connection() -> Iterator[Connection]:
+    """A connection to an in-memory database holding two linked workouts.
+
+    Workout 1 has one item with three Hevy sets: set 0 is already copied unchanged, set 1
+    was copied before its weight changed and set 2 was never copied. Workout 2 is linked
+    the same way and must be left alone.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        for workout in (1, 2):
+            connection.execute(
+                text(
+                    "INSERT INTO HevyAppWorkout "
+                    "(id, title, description, start_time, end_time, created_at) "
+                    "VALUES (:id, 'Push', '', '2025-01-01', '2025-01-01', '2025-01-01')"
+                ),
+                {"id": f"h{workout}"},
+            )
+            connection.execute(
+                text("INSERT INTO Workout (id, true_coach_id) VALUES (:id, :id)"), {"id": workout}
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO HevyAppWorkoutItem (id, workout_id, "index", name, notes) '
+                    "VALUES (:id, :workout_id, 0, 'Bench Press', '')"
+                ),
+                {"id": workout, "workout_id": f"h{workout}"},
+            )
+            connection.execute(
+                text(
+                    "INSERT INTO WorkoutItem (id, workout_id, position, exercise_id, hevy_app_id, "
+                    "rest) VALUES (:id, :id, 0, 1, :id, 90)"
+                ),
+                {"id": workout},
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO HevyAppSets (id, workout_item_id, "index", type, weight_kg, reps) '
+                    "VALUES (:id, :item, :index, 'normal', :weight, 5)"
+                ),
+                [
+                    {"id": workout * 10 + index, "item": workout, "index": index, "weight": weight}
+                    for index, weight in enumerate([60.0, 70.0, 80.0])
+                ],
+            )
+            connection.execute(
+                text(
+                    'INSERT INTO Sets (workout_item_id, "index", type, weight_kg, reps, '
+                    "hevy_app_id) VALUES (:item, :index, 'normal', :weight, 5, :hevy_app_id)"
+                ),
+                [
+                    {"item": workout, "index": 0, "weight": 60.0, "hevy_app_id": workout * 10},
+                    {"item": workout, "index": 1, "weight": 65.0, "hevy_app_id": workout * 10 + 1},
+                ],
+            )
+        yield connection
+
+
+def test_upsert_matches_update_and_insert(connection: Connection) -> None:
+    """The upsert leaves the same Sets rows as the old update followed by the insert."""
+    before = connection.execute(text(SETS)).all()
+    savepoint = connection.begin_nested()
+    connection.execute(OLD_UPDATE, {"true_coach_id": 1})
+    connection.execute(OLD_INSERT, {"true_coach_id": 1})
+    expected = connection.execute(text(SETS)).all()
+    savepoint.rollback()
+    assert connection.execute(text(SETS)).all() == before
+
+    connection.execute(get_statement("hevy/tracker/sets/upsert"), {"true_coach_id": 1})
+    rows = connection.execute(text(SETS)).all()
+
+    assert rows == expected
+    assert [(row.workout_item_id, row.index, row.weight_kg) for row in rows] == [
+        (1, 0, 60.0),
+        (1, 1, 70.0),
+        (1, 2, 80.0),
+        (2, 0, 60.0),
+        (2, 1, 65.0),
+    ]
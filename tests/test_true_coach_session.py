@@ -0,0 +1,100 @@
+"""Tests for the async TrueCoach session and its blocking wrapper."""
+
+import asyncio
+import threading
+from http import HTTPStatus
+
+import httpx
+import pytest
+
+from fitness_tracker.apis.base import RequestScheduler
+from fitness_tracker.apis.event_loop import shared_loop
+from fitness_tracker.apis.true_coach.async_session import AsyncTrueCoachSession
+from fitness_tracker.apis.true_coach.auth import TrueCoachOAuthToken
+from fitness_tracker.apis.true_coach.exceptions import TrueCoachAPIError
+from fitness_tracker.apis.true_coach.session import TrueCoachSession
+
+TOKEN = TrueCoachOAuthToken({"access_token": "token", "user_id": 1})
+
+
+class Server:
+    """Answers the session's requests, recording them and the thread they ran on."""
+
+    def __init__(self) -> None:
+        """Start with no requests seen."""
+        self.requests: list[httpx.Request] = []
+        self.threads: set[str] = set()
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Return the workouts, a 404 for anything else."""
+        self.requests.append(request)
+        self.threads.add(threading.current_thread().name)
+        if request.url.path.endswith("/workouts"):
+            return httpx.Response(200, json=[{"id": 1}, {"id": 2}])
+        return httpx.Response(404, json={"error": "not found"})
+
+    def session(self) -> AsyncTrueCoachSession:
+        """Build an authorized session that sends its requests here."""
+        return AsyncTrueCoachSession(
+            token=TOKEN,
+            scheduler=RequestScheduler(),
+            transport=httpx.MockTransport(self.handle),
+        )
+
+
+def test_async_session_sends_authorized_requests() -> None:
+    """Requests carry the bearer token, and list bodies are wrapped in ``results``."""
+    server = Server()
+
+    async def fetch() -> dict:
+        session = server.session()
+        try:
+            return await session.make_request("GET", "workouts", params={"page": 1})
+        finally:
+            await session.aclose()
+
+    data = asyncio.run(fetch())
+
+    assert data["results"] == [{"id": 1}, {"id": 2}]
+    assert data["request_url"].endswith("/workouts?page=1")
+    assert server.requests[0].headers["Authorization"] == "Bearer token"
+
+
+def test_async_session_raises_on_errors() -> None:
+    """An error status is raised as a ``TrueCoachAPIError`` with the status code."""
+    server = Server()
+
+    async def fetch() -> None:
+        session = server.session()
+        try:
+            await session.make_request("GET", "missing")
+        finally:
+            await session.aclose()
+
+    with pytest.raises(TrueCoachAPIError) as error:
+        asyncio.run(fetch())
+    assert error.value.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_sync_session_runs_on_the_shared_loop() -> None:
+    """The blocking wrapper sends every request from the shared loop's thread."""
+    server = Server()
+    session = TrueCoachSession(async_session=server.session())
+
+    results = [session.make_request("GET", "workouts")["results"] for _ in range(3)]
+    session.close()
+
+    assert results == [[{"id": 1}, {"id": 2}]] * 3
+    assert server.threads == {"fitness-tracker-event-loop"}
+
+
+def test_sync_session_cannot_block_the_shared_loop() -> None:
+    """Calling the wrapper from a coroutine on the shared loop raises instead of hanging."""
+    session = TrueCoachSession(async_session=Server().session())
+
+    async def call() -> None:
+        session.make_request("GET", "workouts")
+
+    with pytest.raises(RuntimeError, match="shared event loop"):
+        asyncio.run_coroutine_threadsafe(call(), shared_loop()).result(timeout=5)
+    session.close()
@@ -0,0 +1,182 @@
+"""Tests that the workout graphs load in a fixed number of queries."""
+
+from collections.abc import Callable, Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from fitness_tracker.database import Database
+from fitness_tracker.database.loaders import MAX_GRAPH_QUERIES
+from fitness_tracker.database.models import (
+    Exercise,
+    HevyAppExercise,
+    HevyAppSets,
+    HevyAppWorkout,
+    HevyAppWorkoutItem,
+    Sets,
+    TrueCoachExercise,
+    TrueCoachWorkout,
+    TrueCoachWorkoutItem,
+    Workout,
+    WorkoutItem,
+)
+
+EXERCISES = 12
+SETS = 3
+
+
+@pytest.fixture
+def database(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Database]:
+    """A database holding one workout of ``EXERCISES`` exercises, linked across all three apps."""
+    monkeypatch.setenv("HEVY_API_KEY", "key")
+    monkeypatch.setenv("HEVY_WEB_API_KEY", "key")
+    engine = create_engine(f"sqlite:///{tmp_path / 'tracker.db'}")
+    database = Database(engine)
+    database.init_db()
+
+    day = datetime(2025, 1, 1)
+    with Session(engine) as session:
+        session.add_all(
+            [
+                TrueCoachWorkout(
+                    id=1,
+                    title="Push",
+                    due=day,
+                    short_description="",
+                    state="completed",
+                    rest_day=False,
+                    created_at=day,
+                    updated_at=day,
+                ),
+                HevyAppWorkout(
+                    id="h1",
+                    title="Push",
+                    description="",
+                    start_time=day,
+                    end_time=day,
+                    created_at=day,
+                ),
+                Workout(
+                    id=1,
+                    title="Push",
+                    description="",
+                    true_coach_id=1,
+                    hevy_app_id="h1",
+                    start_date=day,
+                    end_date=day,
+                ),
+            ]
+        )
+        for i in range(EXERCISES):
+            session.add_all(
+                [
+                    TrueCoachExercise(
+                        id=i, name=f"Exercise {i}", description="", url="", default=False
+                    ),
+                    HevyAppExercise(
+                        id=f"x{i}",
+                        name=f"Exercise {i}",
+                        type="weight_reps",
+                        equipment="barbell",
+                        default=True,
+                    ),
+                    Exercise(id=i + 1, name=f"Exercise {i}", true_coach_id=i, hevy_app_id=f"x{i}"),
+                    TrueCoachWorkoutItem(
+                        id=i + 1,
+                        workout_id=1,
+                        name=f"Exercise {i}",
+                        info="",
+                        state="completed",
+                        position=i,
+                        is_circuit=False,
+                        exercise_id=i,
+                    ),
+                    HevyAppWorkoutItem(
+                        id=i + 1,
+                        workout_id="h1",
+                        index=i,
+                        name=f"Exercise {i}",
+                        notes="",
+                        exercise_id=f"x{i}",
+                    ),
+                    WorkoutItem(
+                        id=i + 1,
+                        workout_id=1,
+                        position=i,
+                        exercise_id=i + 1,
+                        true_coach_id=i + 1,
+                        hevy_app_id=i + 1,
+                    ),
+                ]
+            )
+            for index in range(SETS):
+                session.add(Sets(workout_item_id=i + 1, index=index, type="normal"))
+                session.add(HevyAppSets(workout_item_id=i + 1, index=index, type="normal"))
+        session.commit()
+
+    yield database
+    engine.dispose()
+
+
+def walk_true_coach(workout: TrueCoachWorkout) -> list[Any]:
+    """Touch everything the TrueCoach to Hevy sync reads."""
+    return [(item.info, item.exercise.hevy_app.name) for item in workout.workout_items]
+
+
+def walk_tracker(workout: Workout) -> list[Any]:
+    """Touch everything the tracker to Hevy sync reads."""
+    return [
+        (
+            workout.true_coach.short_description,
+            item.exercise.hevy_app.type,
+            item.true_coach.info,
+            [row.reps for row in item.sets],
+        )
+        for item in workout.workout_items
+    ]
+
+
+def walk_hevy_app(workout: HevyAppWorkout) -> list[Any]:
+    """Touch everything the Hevy to TrueCoach sync reads."""
+    return [
+        (
+            workout.true_coach.id,
+            item.exercise.type,
+            item.true_coach.id,
+            [row.reps for row in item.sets],
+        )
+        for item in workout.workout_items
+    ]
+
+
+@pytest.mark.parametrize(
+    ("service", "root_id", "walk"),
+    [
+        ("true_coach", 1, walk_true_coach),
+        ("tracker", 1, walk_tracker),
+        ("hevy_app", "h1", walk_hevy_app),
+    ],
+)
+def test_workout_graph_query_count(
+    database: Database, service: str, root_id: Any, walk: Callable[[Any], list[Any]]
+) -> None:
+    """Loading a graph and walking it takes at most ``MAX_GRAPH_QUERIES`` queries."""
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with Session(database.engine) as session:
+        event.listen(database.engine, "before_cursor_execute", count)
+        try:
+            workout = getattr(database, service).get_workout_graph(session, root_id)
+            rows = walk(workout)
+        finally:
+            event.remove(database.engine, "before_cursor_execute", count)
+
+    assert len(rows) == EXERCISES
+    assert len(statements) <= MAX_GRAPH_QUERIES, statements